@@ -0,0 +1,129 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya animation functions
+Benchmarks must be executed inside Maya or mayapy:
+    mayapy tests/benchmarks/benchmark_animation.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+
+import maya.cmds
+
+from tpDcc.dccs.maya.core import animation
+
+
+def create_driven_plugs(count=1000, frames=1000):
+    """
+    Creates transforms whose translation is connected to an animated locator
+    :param count: int, number of plugs to create
+    :param frames: int, number of animated frames
+    :return: list(str), plugs to bake
+    """
+
+    driver = maya.cmds.spaceLocator(name='bake_driver')[0]
+    maya.cmds.setKeyframe(driver, attribute='translateX', time=1, value=0)
+    maya.cmds.setKeyframe(driver, attribute='translateX', time=frames, value=100)
+
+    plugs = list()
+    for i in range((count + 2) // 3):
+        node = maya.cmds.createNode('transform', name='bake_driven_{}'.format(i))
+        maya.cmds.connectAttr('{}.translate'.format(driver), '{}.translate'.format(node))
+        plugs.extend(['{}.translate{}'.format(node, axis) for axis in 'XYZ'])
+
+    return plugs[:count]
+
+
+def benchmark_bake(plugs, start_frame, end_frame):
+    """
+    Samples and bakes given plugs and prints timing information normalized to 1k plugs x 1k frames
+    :param plugs: list(str)
+    :param start_frame: int
+    :param end_frame: int
+    """
+
+    current_time = maya.cmds.currentTime(query=True)
+    baker = animation.PlugBaker(plugs, start_frame=start_frame, end_frame=end_frame)
+    samples = baker.bake(dry_run=True)
+    stats = baker.stats
+    print('PlugBaker dry run: {} plugs x {} frames sampled in {:.3f}s ({:.3f}s per 1k x 1k)'.format(
+        stats['plugs'], stats['frames'], stats['sample_time'], stats['sample_time_per_million']))
+
+    anim_curves = baker.bake()
+    stats = baker.stats
+    valid = len(anim_curves) == len(plugs) and len(samples) == len(plugs)
+    valid = valid and maya.cmds.currentTime(query=True) == current_time
+    print('PlugBaker bake: {} keys written in {:.3f}s (valid: {})'.format(stats['keys'], stats['write_time'], valid))
+
+
+def create_fraction_keys_curves(count=200, keys=1000):
+    """
+    Creates animation curves with keys on fraction of frames, half of them keeping holds
+    :param count: int, number of animation curves to create
+    :param keys: int, number of keys of each curve
+    :return: list(str), created animation curves
+    """
+
+    anim_curves = list()
+    for i in range(count):
+        anim_curve = maya.cmds.createNode('animCurveTU', name='fraction_keys_{}'.format(i))
+        for key in range(keys):
+            value = float(key // 2 if key % 4 < 2 else key)
+            maya.cmds.setKeyframe(anim_curve, time=key * 2 + (0.4 if key % 3 else 0.0), value=value)
+        anim_curves.append(anim_curve)
+
+    return anim_curves
+
+
+def benchmark_fraction_keys(anim_curves):
+    """
+    Puts the fraction keys of the given curves on whole frames and prints timing information
+    :param anim_curves: list(str)
+    """
+
+    start = time.time()
+    has_fraction_keys = animation.check_anim_curves_has_fraction_keys(anim_curves)
+    failed = animation.convert_fraction_keys_to_whole_keys(anim_curves)
+    elapsed = time.time() - start
+    keyframes = maya.cmds.keyframe(anim_curves, query=True, timeChange=True) or list()
+    valid = has_fraction_keys and not failed and all(keyframe.is_integer() for keyframe in keyframes)
+    valid = valid and not animation.check_anim_curves_has_fraction_keys(anim_curves)
+    print('convert_fraction_keys_to_whole_keys: {} curves, {} keys in {:.3f}s (valid: {})'.format(
+        len(anim_curves), len(keyframes), elapsed, valid))
+
+
+def benchmark_key_frames(anim_curves, frames):
+    """
+    Inserts step keys on the given frames of the given curves and prints timing information
+    :param anim_curves: list(str)
+    :param frames: list(int)
+    """
+
+    selected_keys = maya.cmds.keyframe(query=True, selected=True)
+    start = time.time()
+    keyed = animation.key_all_anim_curves_in_frames(frames, anim_curves=anim_curves)
+    elapsed = time.time() - start
+    out_tangents = maya.cmds.keyTangent(anim_curves[0], time=(frames[-1], frames[-1]), query=True, outTangentType=True)
+    valid = len(keyed) == len(anim_curves) and out_tangents == ['step']
+    valid = valid and maya.cmds.keyframe(query=True, selected=True) == selected_keys
+    print('key_all_anim_curves_in_frames: {} curves x {} frames in {:.3f}s (valid: {})'.format(
+        len(anim_curves), len(frames), elapsed, valid))
+    maya.cmds.undo()
+
+
+def run():
+    maya.cmds.file(new=True, force=True)
+    benchmark_bake(create_driven_plugs(), 1, 1000)
+    maya.cmds.file(new=True, force=True)
+    anim_curves = create_fraction_keys_curves()
+    benchmark_key_frames(anim_curves, [1001, 1101, 1251, 1501])
+    benchmark_fraction_keys(anim_curves)
+
+
+if __name__ == '__main__':
+    import maya.standalone
+    maya.standalone.initialize()
+    run()
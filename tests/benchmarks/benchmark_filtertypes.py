@@ -0,0 +1,90 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya filter types functions
+Benchmarks must be executed inside Maya or mayapy:
+    mayapy tests/benchmarks/benchmark_filtertypes.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+
+import maya.cmds
+
+from tpDcc.dccs.maya.core import filtertypes
+
+
+def create_mixed_scene(count=5000):
+    """
+    Creates the given number of curves, locators and empty groups
+    :param count: int
+    :return: list(str), curve transforms
+    """
+
+    curves = list()
+    for i in range(count):
+        curves.append(maya.cmds.curve(degree=1, point=[(0, 0, 0), (1, 0, 0)], name='filter_ctrl_{}'.format(i)))
+        maya.cmds.spaceLocator(name='filter_loc_{}'.format(i))
+        maya.cmds.createNode('transform', name='filter_grp_{}'.format(i))
+
+    return curves
+
+
+def benchmark_filters(curves, repeats=20):
+    """
+    Filters the scene by type the given number of times, as UI tools do on each button press, and prints timing
+    information
+    :param curves: list(str)
+    :param repeats: int
+    """
+
+    start = time.time()
+    filtertypes.clear_node_type_index()
+    filtertypes.get_node_type_index()
+    build_elapsed = time.time() - start
+
+    start = time.time()
+    for _ in range(repeats):
+        curve_transforms = filtertypes.filter_by_type(filtertypes.CURVE_FILTER_TYPE, selection_only=False)
+        all_nodes = filtertypes.filter_by_type(
+            filtertypes.ALL_FILTER_TYPE, selection_only=False, transforms_only=False)
+        curve_shapes = filtertypes.filter_nodes_with_shapes(curves, shape_type='nurbsCurve')
+    query_elapsed = time.time() - start
+
+    valid = len(curve_transforms) == len(curves) and len(curve_shapes) == len(curves)
+    valid = valid and set(all_nodes) == set(
+        maya.cmds.ls(long=True)) - set(maya.cmds.ls(defaultNodes=True, long=True)) - set(
+        maya.cmds.ls(['persp', 'top', 'front', 'side', 'perspShape', 'topShape', 'frontShape', 'sideShape'],
+                     long=True)) - set(filtertypes.PROTECTED_NODES)
+    print('NodeTypeIndex: build in {:.3f}s | {} filter queries in {:.3f}s (valid: {})'.format(
+        build_elapsed, repeats * 3, query_elapsed, valid))
+
+    start = time.time()
+    new_curve = maya.cmds.curve(degree=1, point=[(0, 0, 0), (1, 0, 0)], name='filter_ctrl_new')
+    maya.cmds.delete(curves[0])
+    curve_transforms = filtertypes.filter_by_type(filtertypes.CURVE_FILTER_TYPE, selection_only=False)
+    update_elapsed = time.time() - start
+    valid = len(curve_transforms) == len(curves) and maya.cmds.ls(new_curve, long=True)[0] in curve_transforms
+    print('NodeTypeIndex: incremental update in {:.3f}s (valid: {})'.format(update_elapsed, valid))
+
+    maya.cmds.select(curves[1:4])
+    start = time.time()
+    for _ in range(repeats):
+        selected_curves = filtertypes.filter_by_type(filtertypes.CURVE_FILTER_TYPE, selection_only=True)
+    selection_elapsed = time.time() - start
+    valid = sorted(selected_curves) == sorted(maya.cmds.ls(curves[1:4], long=True))
+    print('NodeTypeIndex: {} selection filter queries in {:.3f}s (valid: {})'.format(
+        repeats, selection_elapsed, valid))
+
+
+def run():
+    maya.cmds.file(new=True, force=True)
+    benchmark_filters(create_mixed_scene())
+
+
+if __name__ == '__main__':
+    import maya.standalone
+    maya.standalone.initialize()
+    run()
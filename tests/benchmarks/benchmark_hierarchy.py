@@ -0,0 +1,85 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya DAG hierarchy snapshot
+Benchmarks must be executed inside Maya or mayapy:
+    mayapy tests/benchmarks/benchmark_hierarchy.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+
+import maya.cmds
+
+from tpDcc.dccs.maya.core import scene, hierarchy
+
+
+def create_deep_hierarchy(roots=20, depth=50, children=20):
+    """
+    Creates the given number of chains of transforms with the given depth, each transform with the given number of
+    locators
+    :param roots: int
+    :param depth: int
+    :param children: int
+    :return: list(str), full path of the last transform of each chain
+    """
+
+    leaves = list()
+    for i in range(roots):
+        parent = None
+        for j in range(depth):
+            parent = maya.cmds.createNode('transform', name='chain_{}_{}'.format(i, j), parent=parent)
+            for k in range(children):
+                maya.cmds.createNode('transform', name='chain_{}_{}_child_{}'.format(i, j, k), parent=parent)
+        leaves.append(maya.cmds.ls(parent, long=True)[0])
+
+    return leaves
+
+
+def benchmark_queries(leaves):
+    """
+    Queries parents, children, roots and top level nodes of the given nodes and prints timing information
+    :param leaves: list(str)
+    """
+
+    start = time.time()
+    hierarchy.clear_dag_snapshot()
+    dag_snapshot = hierarchy.get_dag_snapshot()
+    build_elapsed = time.time() - start
+
+    start = time.time()
+    parents = [scene.get_all_parent_nodes(leaf) for leaf in leaves]
+    roots = [scene.get_node_transform_root(leaf) for leaf in leaves]
+    children = [scene.get_all_children_nodes(root) for root in roots]
+    top_nodes = scene.get_top_dag_nodes()
+    query_elapsed = time.time() - start
+
+    valid = all(len(leaf_parents) == 49 for leaf_parents in parents)
+    valid = valid and all(len(root_children) == 49 + 50 * 20 for root_children in children)
+    valid = valid and all(root in ['|{}'.format(top_node) for top_node in top_nodes] for root in roots)
+    print('DagSnapshot: build in {:.3f}s | {} hierarchy queries in {:.3f}s (valid: {})'.format(
+        build_elapsed, len(leaves) * 3 + 1, query_elapsed, valid))
+
+    start = time.time()
+    new_root = maya.cmds.createNode('transform', name='snapshot_root')
+    maya.cmds.parent(roots[0], new_root)
+    maya.cmds.rename(new_root, 'renamed_snapshot_root')
+    dag_snapshot.refresh()
+    refresh_elapsed = time.time() - start
+    valid = dag_snapshot.root(leaves[0].replace('|chain_0_0', '|renamed_snapshot_root|chain_0_0', 1)) == \
+        '|renamed_snapshot_root'
+    valid = valid and dag_snapshot.top_level() == maya.cmds.ls(assemblies=True, long=True)
+    print('DagSnapshot: incremental refresh in {:.3f}s (valid: {})'.format(refresh_elapsed, valid))
+
+
+def run():
+    maya.cmds.file(new=True, force=True)
+    benchmark_queries(create_deep_hierarchy())
+
+
+if __name__ == '__main__':
+    import maya.standalone
+    maya.standalone.initialize()
+    run()
@@ -0,0 +1,100 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya namespace functions
+Benchmarks must be executed inside Maya or mayapy:
+    mayapy tests/benchmarks/benchmark_namespace.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+
+import maya.cmds
+
+from tpDcc.dccs.maya.core import namespace
+
+
+def create_wide_hierarchy(groups=50, children=200):
+    """
+    Creates a hierarchy with the given number of groups under a root, each one of them with the given number of
+    locators
+    :param groups: int
+    :param children: int
+    :return: str, root of the hierarchy
+    """
+
+    root = maya.cmds.createNode('transform', name='namespace_root')
+    for i in range(groups):
+        group = maya.cmds.createNode('transform', name='namespace_grp_{}'.format(i), parent=root)
+        for j in range(children):
+            locator = maya.cmds.spaceLocator(name='namespace_loc_{}_{}'.format(i, j))[0]
+            maya.cmds.parent(locator, group)
+
+    return root
+
+
+def benchmark_add_hierarchy(root):
+    """
+    Moves the given hierarchy into a namespace, undoes it and prints timing information
+    :param root: str
+    """
+
+    start = time.time()
+    new_names = namespace.add_hierarchy_to_namespace(root, 'asset:geo')
+    elapsed = time.time() - start
+    contents = namespace.get_all_in_namespace(':asset:geo') or list()
+    valid = all(new_name.rpartition('|')[-1].startswith('asset:geo:') for new_name in new_names)
+    valid = valid and len(contents) == len(new_names) * 2 - 1 - 50
+    print('add_hierarchy_to_namespace: {} transforms in {:.3f}s (valid: {})'.format(len(new_names), elapsed, valid))
+
+    maya.cmds.undo()
+    print('add_hierarchy_to_namespace undo (valid: {})'.format(maya.cmds.objExists(root)))
+
+
+def benchmark_remove_namespace(root):
+    """
+    Moves the given hierarchy into a namespace and removes it from all of its nodes printing timing information
+    :param root: str
+    """
+
+    nodes = namespace.add_hierarchy_to_namespace(root, 'asset')
+    start = time.time()
+    new_names = namespace.remove_namespace_from_object(nodes, 'asset')
+    elapsed = time.time() - start
+    valid = not any(':' in new_name for new_name in new_names) and not namespace.namespace_exists('asset')
+    print('remove_namespace_from_object: {} transforms in {:.3f}s (valid: {})'.format(len(new_names), elapsed, valid))
+
+
+def benchmark_unique_namespace(count=2000):
+    """
+    Creates the given number of namespaces sharing the same base name, finds the next unique one and prints timing
+    information
+    :param count: int
+    """
+
+    maya.cmds.namespace(add='shot')
+    for i in range(1, count):
+        maya.cmds.namespace(add='shot{:02d}'.format(i))
+    start = time.time()
+    unique_namespace = namespace.find_unique_namespace('shot')
+    removed = namespace.remove_empty_namespaces()
+    elapsed = time.time() - start
+    valid = unique_namespace == 'shot{:02d}'.format(count) and len(removed) >= count
+    print('find_unique_namespace + remove_empty_namespaces: {} namespaces in {:.3f}s (valid: {})'.format(
+        count, elapsed, valid))
+
+
+def run():
+    maya.cmds.file(new=True, force=True)
+    root = create_wide_hierarchy()
+    benchmark_add_hierarchy(root)
+    benchmark_remove_namespace(root)
+    benchmark_unique_namespace()
+
+
+if __name__ == '__main__':
+    import maya.standalone
+    maya.standalone.initialize()
+    run()
@@ -0,0 +1,58 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya node functions
+Benchmarks must be executed inside Maya or mayapy:
+    mayapy tests/benchmarks/benchmark_node.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+
+import maya.cmds
+
+from tpDcc.dccs.maya.core import node
+
+
+def create_controls(count=20000):
+    """
+    Creates the given number of curve controls
+    :param count: int
+    :return: list(str), control transforms
+    """
+
+    return [maya.cmds.curve(
+        degree=1, point=[(0, 0, 0), (1, 0, 0)], name='color_ctrl_{}'.format(i)) for i in range(count)]
+
+
+def benchmark_colors(controls, rgb_color=(1.0, 0.0, 0.0)):
+    """
+    Recolors half of the given controls, finds them back by color and prints timing information
+    :param controls: list(str)
+    :param rgb_color: tuple(float, float, float)
+    """
+
+    start = time.time()
+    colored = node.set_nodes_override_color(controls[::2], rgb_color=rgb_color, color_shapes=True)
+    set_elapsed = time.time() - start
+
+    start = time.time()
+    found = node.filter_nodes_by_rgb_color(controls, rgb_color, query_shapes=True)
+    filter_elapsed = time.time() - start
+
+    valid = len(colored) == len(controls[::2]) and found == controls[::2]
+    print('set_nodes_override_color: {} shapes in {:.3f}s | filter_nodes_by_rgb_color: {} nodes in {:.3f}s '
+          '(valid: {})'.format(len(colored), set_elapsed, len(controls), filter_elapsed, valid))
+
+
+def run():
+    maya.cmds.file(new=True, force=True)
+    benchmark_colors(create_controls())
+
+
+if __name__ == '__main__':
+    import maya.standalone
+    maya.standalone.initialize()
+    run()
@@ -0,0 +1,85 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya Maya ASCII dependency extraction
+This benchmark does not need Maya:
+    python tests/benchmarks/benchmark_parser.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import time
+import shutil
+import tempfile
+
+from tpDcc.dccs.maya.core import parser
+
+
+def create_ascii_files(directory, count=500, nodes=2000, textures=50):
+    """
+    Creates the given number of Maya ASCII files, each one of them with a reference, the given number of meshes
+    with their attributes and connections and the given number of file textures
+    :param directory: str, directory where files are created
+    :param count: int
+    :param nodes: int
+    :param textures: int
+    :return: list(str), paths of the files
+    """
+
+    lines = [
+        '//Maya ASCII 2020 scene\n', 'requires maya "2020";\n',
+        'file -rdi 1 -ns "rig" -rfn "rigRN" -op "v=0;" -typ "mayaAscii" "/assets/rig.ma";\n',
+        'file -r -ns "rig" -dr 1 -rfn "rigRN" -op "v=0;" -typ "mayaAscii" "/assets/rig.ma";\n',
+        'requires -nodeType "aiStandardSurface" "mtoa" "4.0.0";\n']
+    for i in range(nodes):
+        lines.append('createNode transform -n "mesh_{}";\n'.format(i))
+        lines.append('\tsetAttr ".t" -type "double3" 0 {} 0 ;\n'.format(i))
+        lines.append('createNode mesh -n "meshShape_{0}" -p "mesh_{0}";\n'.format(i))
+        lines.append('\tsetAttr -k off ".v";\n\tsetAttr ".vir" yes;\n')
+        lines.append('\tsetAttr ".uvst[0].uvsn" -type "string" "map1";\n')
+        lines.append('connectAttr "meshShape_{}.iog" ":initialShadingGroup.dsm" -na;\n'.format(i))
+    for i in range(textures):
+        lines.append('createNode file -n "file_{}";\n'.format(i))
+        lines.append('\tsetAttr ".ftn" -type "string" "/textures/color_{}.1001.png";\n'.format(i))
+        lines.append('\tsetAttr ".uvt" 3;\n')
+    data = ''.join(lines)
+
+    file_paths = list()
+    for i in range(count):
+        file_path = os.path.join(directory, 'scene_{}.ma'.format(i))
+        with open(file_path, 'w') as fh:
+            fh.write(data)
+        file_paths.append(file_path)
+
+    return file_paths
+
+
+def benchmark_extract(file_paths, textures=50):
+    """
+    Extracts the dependencies of the given Maya ASCII files and prints throughput information
+    :param file_paths: list(str)
+    :param textures: int
+    """
+
+    start = time.time()
+    manifests = parser.extract_ascii_dependencies_batch(file_paths)
+    elapsed = time.time() - start
+
+    total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+    valid = all(len(manifest.get('dependencies', list())) == textures + 1 for manifest in manifests)
+    print('extract_ascii_dependencies_batch: {} files ({:.1f} MB) in {:.3f}s, {:.0f} files/minute (valid: {})'.format(
+        len(file_paths), total_size / (1024.0 * 1024.0), elapsed, len(file_paths) / elapsed * 60.0, valid))
+
+
+def run():
+    directory = tempfile.mkdtemp()
+    try:
+        benchmark_extract(create_ascii_files(directory))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,109 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya scene functions
+Benchmarks must be executed inside Maya or mayapy:
+    mayapy tests/benchmarks/benchmark_scene.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+
+import maya.cmds
+
+from tpDcc.dccs.maya.core import scene
+
+
+def create_garbage_scene(count=2000):
+    """
+    Creates a scene with the given number of empty sets and sets with members
+    :param count: int
+    :return: tuple(list(str), list(str)), empty sets and sets with members
+    """
+
+    empty_sets = [maya.cmds.sets(empty=True, name='garbage_set_{}'.format(i)) for i in range(count)]
+    used_sets = list()
+    for i in range(count):
+        node = maya.cmds.createNode('transform', name='garbage_member_{}'.format(i))
+        used_sets.append(maya.cmds.sets(node, name='used_set_{}'.format(i)))
+
+    return empty_sets, used_sets
+
+
+def benchmark_clean_scene(empty_sets, used_sets):
+    """
+    Cleans current scene and prints timing information of each phase
+    :param empty_sets: list(str)
+    :param used_sets: list(str)
+    """
+
+    report = scene.clean_scene()
+    timings = report['timings']
+    valid = not any(maya.cmds.objExists(obj_set) for obj_set in empty_sets)
+    valid = valid and all(maya.cmds.objExists(obj_set) for obj_set in used_sets)
+    valid = valid and len(report['empty']) == len(empty_sets)
+    removed = sum([len(report[category]) for category in ('unknown', 'turtle', 'layout', 'empty')])
+    print('clean_scene: {} nodes removed (scan {:.3f}s, evaluate {:.3f}s, delete {:.3f}s, plugins {:.3f}s) '
+          '(valid: {})'.format(
+              removed, timings['scan_time'], timings['evaluate_time'], timings['delete_time'],
+              timings['plugins_time'], valid))
+
+
+def create_texture_scene(directory, count=2000, tiles=4):
+    """
+    Creates the given number of file nodes using UDIM textures with the given number of tiles
+    :param directory: str, directory where texture files are created
+    :param count: int
+    :param tiles: int
+    :return: list(str), file nodes
+    """
+
+    file_nodes = list()
+    for i in range(count):
+        for tile in range(tiles):
+            with open(os.path.join(directory, 'texture_{}.{}.png'.format(i, 1001 + tile)), 'wb') as fh:
+                fh.write(b'x')
+        file_node = maya.cmds.shadingNode('file', asTexture=True, name='texture_file_{}'.format(i))
+        maya.cmds.setAttr('{}.fileTextureName'.format(file_node), os.path.join(
+            directory, 'texture_{}.1001.png'.format(i)), type='string')
+        maya.cmds.setAttr('{}.uvTilingMode'.format(file_node), 3)
+        file_nodes.append(file_node)
+
+    return file_nodes
+
+
+def benchmark_scan_dependencies(file_nodes, tiles=4):
+    """
+    Scans the texture dependencies of current scene and prints timing information
+    :param file_nodes: list(str)
+    :param tiles: int
+    """
+
+    manifest = scene.scan_scene_dependencies(references=False)
+    timings = manifest['timings']
+    valid = len(manifest['dependencies']) == len(file_nodes) and not manifest['missing']
+    valid = valid and len(manifest['files']) == len(file_nodes) * tiles
+    print('scan_scene_dependencies: {} textures, {} files (collect {:.3f}s, resolve {:.3f}s) (valid: {})'.format(
+        len(manifest['dependencies']), len(manifest['files']), timings['collect_time'], timings['resolve_time'],
+        valid))
+
+
+def run():
+    maya.cmds.file(new=True, force=True)
+    benchmark_clean_scene(*create_garbage_scene())
+    maya.cmds.file(new=True, force=True)
+    directory = tempfile.mkdtemp()
+    try:
+        benchmark_scan_dependencies(create_texture_scene(directory))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    import maya.standalone
+    maya.standalone.initialize()
+    run()
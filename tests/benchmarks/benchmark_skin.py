@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya skin functions
+Benchmarks must be executed inside Maya or mayapy:
+    mayapy tests/benchmarks/benchmark_skin.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+
+import maya.cmds
+
+from tpDcc.dccs.maya.core import skin
+
+
+def create_skinned_plane(subdivisions=100, joints_count=20):
+    """
+    Creates a plane skinned to a joint chain
+    :param subdivisions: int, subdivisions of the plane in each direction
+    :param joints_count: int, number of joints of the chain
+    :return: str, name of the plane
+    """
+
+    plane = maya.cmds.polyPlane(
+        name='skin_plane', width=10, height=10, subdivisionsX=subdivisions, subdivisionsY=subdivisions)[0]
+    maya.cmds.select(clear=True)
+    joints = [maya.cmds.joint(name='skin_{}_jnt'.format(i), position=(
+        -5 + 10.0 * i / (joints_count - 1), 0, 0)) for i in range(joints_count)]
+    maya.cmds.skinCluster(joints, plane, toSelectedBones=True, maximumInfluences=4)
+
+    return plane
+
+
+def benchmark_average(plane, count=3000):
+    """
+    Averages the weights of the given number of vertices into the next one and prints timing information
+    :param plane: str
+    :param count: int
+    """
+
+    vertices = ['{}.vtx[{}]'.format(plane, i) for i in range(count + 1)]
+    start = time.time()
+    succeeded = skin.average_vertices_weights(vertices, use_distance=True)
+    elapsed = time.time() - start
+    weights = maya.cmds.skinPercent(skin.find_related_skin_cluster(plane), vertices[-1], query=True, value=True)
+    valid = succeeded and abs(sum(weights) - 1.0) < 1e-5
+    print('average_vertices_weights: {} vertices in {:.3f}s (valid: {})'.format(count, elapsed, valid))
+
+
+def benchmark_smooth(plane, count=3000):
+    """
+    Smooths the weights of the given number of vertices and prints timing information
+    :param plane: str
+    :param count: int
+    """
+
+    vertices = ['{}.vtx[{}]'.format(plane, i) for i in range(count)]
+    start = time.time()
+    skin.smooth_vertices_weights(vertices, use_distance=True)
+    elapsed = time.time() - start
+    maya.cmds.undo()
+    print('smooth_vertices_weights: {} vertices in {:.3f}s'.format(count, elapsed))
+
+
+def run():
+    maya.cmds.file(new=True, force=True)
+    plane = create_skinned_plane()
+    benchmark_average(plane)
+    benchmark_smooth(plane)
+
+
+if __name__ == '__main__':
+    import maya.standalone
+    maya.standalone.initialize()
+    run()
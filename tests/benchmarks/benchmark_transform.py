@@ -0,0 +1,101 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for tpDcc.dccs.maya transform functions
+Benchmarks must be executed inside Maya or mayapy:
+    mayapy tests/benchmarks/benchmark_transform.py
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+
+import maya.cmds
+
+from tpDcc.dccs.maya.core import transform
+
+
+def create_deep_hierarchy(depth=2000):
+    """
+    Creates a single joint chain with the given number of joints
+    :param depth: int
+    :return: str, root joint of the chain
+    """
+
+    maya.cmds.select(clear=True)
+    joints = [maya.cmds.joint(name='deep_{}_jnt'.format(i), position=(0, i, 0)) for i in range(depth)]
+
+    return joints[0]
+
+
+def create_wide_hierarchy(width=50, depth=40):
+    """
+    Creates a root joint with the given number of chains below it
+    :param width: int, number of chains
+    :param depth: int, number of joints of each chain
+    :return: str, root joint of the hierarchy
+    """
+
+    maya.cmds.select(clear=True)
+    root = maya.cmds.joint(name='wide_root_jnt')
+    for i in range(width):
+        maya.cmds.select(root)
+        for j in range(depth):
+            maya.cmds.joint(name='wide_{}_{}_jnt'.format(i, j), position=(i, j, 0))
+
+    return root
+
+
+def validate_duplicate(source, duplicate):
+    """
+    Checks that given duplicate matches the source hierarchy
+    :param source: str
+    :param duplicate: str
+    :return: bool
+    """
+
+    source_nodes = [source] + (maya.cmds.listRelatives(source, allDescendents=True, fullPath=True) or list())
+    duplicate_nodes = [duplicate] + (maya.cmds.listRelatives(duplicate, allDescendents=True, fullPath=True) or list())
+    if len(source_nodes) != len(duplicate_nodes):
+        return False
+
+    for source_node, duplicate_node in zip(source_nodes, duplicate_nodes):
+        source_matrix = maya.cmds.xform(source_node, query=True, worldSpace=True, matrix=True)
+        duplicate_matrix = maya.cmds.xform(duplicate_node, query=True, worldSpace=True, matrix=True)
+        if any(abs(a - b) > 1e-5 for a, b in zip(source_matrix, duplicate_matrix)):
+            return False
+        parent = maya.cmds.listRelatives(duplicate_node, parent=True, fullPath=True)
+        if maya.cmds.nodeType(duplicate_node) == 'joint' and parent and maya.cmds.nodeType(parent[0]) == 'joint':
+            if not maya.cmds.isConnected('{}.scale'.format(parent[0]), '{}.inverseScale'.format(duplicate_node)):
+                return False
+
+    return True
+
+
+def benchmark_duplicate_hierarchy(root):
+    """
+    Duplicates the given hierarchy and prints timing information
+    :param root: str
+    """
+
+    count = len(maya.cmds.listRelatives(root, allDescendents=True) or list()) + 1
+    start = time.time()
+    duplicates = transform.DuplicateHierarchy(root).create()
+    elapsed = time.time() - start
+    print('DuplicateHierarchy: {} transforms in {:.3f}s (valid: {})'.format(
+        count, elapsed, validate_duplicate(root, duplicates[0])))
+
+
+def run():
+    maya.cmds.file(new=True, force=True)
+    benchmark_duplicate_hierarchy(create_deep_hierarchy())
+    maya.cmds.file(new=True, force=True)
+    benchmark_duplicate_hierarchy(create_wide_hierarchy())
+    benchmark_duplicate_hierarchy('wide_0_0_jnt')
+
+
+if __name__ == '__main__':
+    import maya.standalone
+    maya.standalone.initialize()
+    run()
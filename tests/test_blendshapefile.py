@@ -0,0 +1,45 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc.dccs.maya blendshape targets file format
+"""
+
+import pytest
+
+from tpDcc.dccs.maya.core import blendshapefile
+
+ITEMS = [
+    {'item': 6000, 'indices': [1, 5, 9], 'deltas': [(0.5, 0.0, -1.0), (0.25, 1.0, 0.0), (0.0, 0.0, 2.0)]},
+    {'item': 5500, 'indices': [5], 'deltas': [(0.125, 0.5, 0.0)]}
+]
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    return str(tmp_path / 'targets.bsd')
+
+
+def test_blendshape_file_round_trip(file_path):
+    targets_data = [
+        {'name': 'smile', 'index': 0, 'weights': [0.5] * 10, 'items': ITEMS},
+        {'name': 'blink', 'index': 3, 'weights': None, 'items': ITEMS}]
+    blendshapefile.write_blendshape_file(file_path, targets_data, vertex_count=10)
+
+    header = blendshapefile.read_blendshape_header(file_path)
+    assert header['vertex_count'] == 10
+    assert [entry['name'] for entry in header['targets']] == ['smile', 'blink']
+    assert blendshapefile.read_blendshape_file(file_path) == targets_data
+
+
+def test_blendshape_file_default_weights(file_path):
+    blendshapefile.write_blendshape_file(file_path, [
+        {'name': 'smile', 'index': 0, 'weights': [1.0] * 10, 'items': ITEMS},
+        {'name': 'blink', 'index': 1, 'weights': None, 'items': ITEMS}], vertex_count=10)
+
+    smile_data, blink_data = blendshapefile.read_blendshape_file(file_path)
+    assert smile_data['weights'] is None and smile_data['default_weights'] is True
+    assert 'default_weights' not in blink_data
+
+    assert blendshapefile.get_target_weights(smile_data, vertex_count=10) == [1.0] * 10
+    assert blendshapefile.get_target_weights(blink_data, vertex_count=10) is None
@@ -0,0 +1,72 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc.dccs.maya dependency manifests
+"""
+
+import os
+
+from tpDcc.dccs.maya.core import dependencies
+
+
+def test_expand_file_pattern(tmp_path):
+    directory = str(tmp_path)
+    for file_name in (
+            'color.1001.png', 'color.1002.png', 'color.1011.png', 'color.png', 'color_u0_v1.exr',
+            'anim.0001.exr', 'anim.0002.exr', 'anim.01.exr'):
+        (tmp_path / file_name).write_bytes(b'x' * 10)
+
+    def _names(file_path):
+        return [os.path.basename(path) for path in dependencies.expand_file_pattern(os.path.join(directory, file_path))]
+
+    assert _names('color.<UDIM>.png') == ['color.1001.png', 'color.1002.png', 'color.1011.png']
+    assert _names('color_<UVTILE>.exr') == ['color_u0_v1.exr']
+    assert _names('color_u<u>_v<v>.exr') == ['color_u0_v1.exr']
+    assert _names('anim.####.exr') == ['anim.0001.exr', 'anim.0002.exr']
+    assert _names('anim.%04d.exr') == ['anim.0001.exr', 'anim.0002.exr']
+    assert _names('anim.<f>.exr') == ['anim.0001.exr', 'anim.0002.exr', 'anim.01.exr']
+    assert _names('color.png') == ['color.png']
+    assert _names('missing.<UDIM>.png') == list()
+
+
+def test_build_dependency_manifest(tmp_path):
+    directory = str(tmp_path)
+    for file_name in ('color.1001.png', 'color.1002.png', 'rig.ma'):
+        (tmp_path / file_name).write_bytes(b'x' * 10)
+    scene_dependencies = [
+        {'type': 'texture', 'node': 'file1', 'path': 'color.<UDIM>.png'},
+        {'type': 'texture', 'node': 'file2', 'path': os.path.join(directory, 'normal.<UDIM>.png')},
+        {'type': 'reference', 'node': 'rigRN', 'path': os.path.join(directory, 'rig.ma')},
+        {'type': 'reference', 'node': 'propRN', 'path': os.path.join(directory, 'prop.ma')}
+    ]
+    stat_cache = dependencies.FileStatCache()
+    manifest = dependencies.build_dependency_manifest(
+        scene_dependencies, root_directory=directory, stat_cache=stat_cache, threads=4)
+
+    entries = manifest['dependencies']
+    assert [entry['node'] for entry in entries] == ['file1', 'file2', 'rigRN', 'propRN']
+    assert [len(entry['files']) for entry in entries] == [2, 0, 1, 1]
+    assert [entry['missing'] for entry in entries] == [False, True, False, True]
+    assert manifest['missing'] == sorted(
+        [os.path.join(directory, 'normal.<UDIM>.png'), os.path.join(directory, 'prop.ma')])
+    assert manifest['total_size'] == 30
+    assert manifest['files'][os.path.join(directory, 'rig.ma')]['size'] == 10
+
+    (tmp_path / 'color.1003.png').write_bytes(b'x' * 10)
+    cached_manifest = dependencies.build_dependency_manifest(
+        scene_dependencies, root_directory=directory, stat_cache=stat_cache)
+    assert len(cached_manifest['dependencies'][0]['files']) == 2
+    stat_cache.clear()
+    manifest = dependencies.build_dependency_manifest(scene_dependencies, root_directory=directory)
+    assert len(manifest['dependencies'][0]['files']) == 3
+
+
+def test_build_dependency_manifest_without_checks():
+    manifest = dependencies.build_dependency_manifest(
+        [{'type': 'texture', 'path': 'textures/color.<UDIM>.png'}], root_directory='/project', check_files=False)
+    entry = manifest['dependencies'][0]
+    assert entry['resolved_path'] == os.path.normpath('/project/textures/color.<UDIM>.png')
+    assert entry['files'] == [entry['resolved_path']]
+    assert entry['missing'] is None
+    assert manifest['files'] == dict()
@@ -0,0 +1,87 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc.dccs.maya Maya ASCII dependency extraction
+"""
+
+import pytest
+
+from tpDcc.dccs.maya.core import parser
+
+MAYA_ASCII = '''//Maya ASCII 2020 scene
+//Name: shot.ma
+requires maya "2020";
+file -rdi 1 -ns "rig" -rfn "rigRN" -op "v=0;" -typ "mayaAscii" "/assets/rig.ma";
+file -rdi 2 -ns "geo" -rfn "rig:geoRN" -typ "mayaAscii" "/assets/geo.ma";
+file -r -ns "rig" -dr 1 -rfn "rigRN" -op "v=0;" -typ "mayaAscii" "/assets/rig.ma";
+requires -nodeType "aiStandardSurface" -dataType "aiOptions" "mtoa" "4.0.0";
+requires "AbcImport" "1.0";
+fileInfo "application" "maya";
+createNode transform -s -n "persp";
+\trename -uid "E7E1";
+\tsetAttr ".v" no;
+createNode file -n "color_file";
+\trename -uid "A1B2";
+\tsetAttr ".ftn" -type "string" "textures/color.1001.png";
+\tsetAttr ".uvt" 3;
+createNode file -n "seq_file";
+\tsetAttr ".ftn" -type "string" "C:\\\\textures\\\\anim.0001.exr";
+\tsetAttr ".ufe" yes;
+createNode file -n "empty_file";
+createNode AlembicNode -n "cache_abc";
+\tsetAttr ".fn" -type "string" "/caches/shot.abc";
+createNode mesh -n "meshShape" -p "mesh";
+\tsetAttr -k off ".v";
+\tsetAttr ".fn" -type "string" "/not/a/dependency.png";
+select -ne :time1;
+\tsetAttr ".o" 1;
+connectAttr "color_file.oc" "lambert1.c";
+// End of shot.ma
+'''
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    (tmp_path / 'shot.ma').write_text(MAYA_ASCII)
+    return str(tmp_path / 'shot.ma')
+
+
+def test_extract_ascii_dependencies(file_path):
+    manifest = parser.extract_ascii_dependencies(file_path)
+
+    assert manifest['maya_version'] == '2020'
+    assert manifest['plugins'] == [
+        {'name': 'mtoa', 'version': '4.0.0', 'node_types': ['aiStandardSurface', 'aiOptions']},
+        {'name': 'AbcImport', 'version': '1.0', 'node_types': list()}]
+
+    entries = manifest['dependencies']
+    assert [(entry['type'], entry['node']) for entry in entries] == [
+        ('reference', 'rigRN'), ('texture', 'color_file'), ('texture', 'seq_file'), ('alembic', 'cache_abc')]
+    assert entries[0]['path'] == '/assets/rig.ma'
+    assert entries[0]['namespace'] == 'rig' and entries[0]['deferred'] is True
+    assert entries[1]['path'] == 'textures/color.<UDIM>.png'
+    assert entries[1]['value'] == 'textures/color.1001.png'
+    assert entries[2]['value'] == 'C:\\textures\\anim.0001.exr'
+    assert entries[2]['path'].endswith('anim.<f>.exr')
+    assert entries[3]['path'] == '/caches/shot.abc'
+
+
+def test_extract_ascii_dependencies_check_files(tmp_path, file_path):
+    (tmp_path / 'textures').mkdir()
+    for tile in (1001, 1002):
+        (tmp_path / 'textures' / 'color.{}.png'.format(tile)).write_text(u'x')
+
+    manifest = parser.extract_ascii_dependencies(file_path, root_directory=str(tmp_path), check_files=True)
+    assert len(manifest['dependencies'][1]['files']) == 2
+    assert manifest['dependencies'][1]['missing'] is False
+    assert manifest['dependencies'][3]['missing'] is True
+
+
+def test_extract_ascii_dependencies_batch(tmp_path, file_path):
+    file_paths = [file_path] * 4 + [str(tmp_path / 'missing.ma')]
+
+    manifests = parser.extract_ascii_dependencies_batch(file_paths, processes=2)
+    assert [manifest['file'] for manifest in manifests] == file_paths
+    assert all(len(manifest['dependencies']) == 4 for manifest in manifests[:4])
+    assert 'error' in manifests[4]
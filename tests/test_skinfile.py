@@ -0,0 +1,56 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc.dccs.maya skin weights file format
+"""
+
+import pytest
+
+from tpDcc.dccs.maya.core import skinfile
+
+WEIGHTS = [[(0, 0.5), (2, 0.5)], [(1, 1.0)], [(0, 0.25), (1, 0.25), (2, 0.5)], [(2, 0.125), (0, 0.875)]]
+
+
+def _mesh_data(name):
+    return {
+        'name': name,
+        'skin_cluster': '{}_skinCluster'.format(name),
+        'influences': ['joint0', 'joint1', 'joint2'],
+        'bind_matrices': [[1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, i, 0.0, 0.0, 1.0]
+                          for i in range(3)],
+        'weights': [list(vertex_weights) for vertex_weights in WEIGHTS],
+        'blend_weights': [0.0, 0.25, 0.5, 1.0]
+    }
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    return str(tmp_path / 'weights.skw')
+
+
+def test_skin_weights_file_round_trip(file_path):
+    meshes_data = [_mesh_data('mesh{}'.format(i)) for i in range(4)]
+    skinfile.write_skin_weights_file(file_path, meshes_data, precision=4, threads=2)
+
+    header = skinfile.read_skin_weights_header(file_path)
+    assert [entry['name'] for entry in header['meshes']] == ['mesh0', 'mesh1', 'mesh2', 'mesh3']
+
+    for source, result in zip(meshes_data, skinfile.read_skin_weights_file(file_path, threads=2)):
+        assert result['skin_cluster'] == source['skin_cluster']
+        assert result['influences'] == source['influences']
+        assert result['bind_matrices'] == source['bind_matrices']
+        assert result['weights'] == source['weights']
+        assert result['blend_weights'] == source['blend_weights']
+
+
+def test_skin_weights_file_sparse_filter(file_path):
+    mesh_data = _mesh_data('mesh')
+    mesh_data['weights'][0] = [(0, 0.99999), (1, 0.00001)]
+    mesh_data['blend_weights'] = None
+    skinfile.write_skin_weights_file(file_path, [mesh_data, _mesh_data('other')], precision=3)
+
+    result = skinfile.read_skin_weights_file(file_path, meshes=['mesh'])
+    assert len(result) == 1
+    assert result[0]['weights'][0] == [(0, 1.0)]
+    assert result[0]['blend_weights'] is None
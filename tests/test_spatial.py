@@ -0,0 +1,56 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc.dccs.maya spatial data structures
+"""
+
+import math
+import random
+
+from tpDcc.dccs.maya.core import spatial
+
+
+def _get_points(count=500):
+    rand = random.Random(0)
+    return [(rand.uniform(-10, 10), rand.uniform(-10, 10), rand.uniform(-10, 10)) for _ in range(count)]
+
+
+def _brute_force(points, point):
+    return sorted([(math.sqrt(sum((a - b) ** 2 for a, b in zip(pnt, point))), i) for i, pnt in enumerate(points)])
+
+
+def test_kdtree_nearest():
+    points = _get_points()
+    tree = spatial.KDTree(points)
+    for point in _get_points(20):
+        expected = _brute_force(points, point)[:4]
+        assert [i for _, i in tree.nearest(point, count=4)] == [i for _, i in expected]
+
+
+def test_kdtree_within_radius():
+    points = _get_points()
+    tree = spatial.KDTree(points)
+    for point in _get_points(20):
+        expected = [i for dst, i in _brute_force(points, point) if dst <= 3.0]
+        assert [i for _, i in tree.within_radius(point, 3.0)] == expected
+
+
+def test_kdtree_empty():
+    tree = spatial.KDTree(list())
+    assert tree.nearest((0, 0, 0)) == list()
+    assert tree.within_radius((0, 0, 0), 1.0) == list()
+
+
+def test_closest_point_on_triangle():
+    a, b, c = (0.0, 0.0, 0.0), (2.0, 0.0, 0.0), (0.0, 2.0, 0.0)
+    point, weights = spatial.closest_point_on_triangle((0.5, 0.5, 3.0), a, b, c)
+    assert all(abs(x - y) < 1e-9 for x, y in zip(point, (0.5, 0.5, 0.0)))
+    assert all(abs(x - y) < 1e-9 for x, y in zip(weights, (0.5, 0.25, 0.25)))
+
+    point, weights = spatial.closest_point_on_triangle((3.0, -1.0, 0.0), a, b, c)
+    assert point == b and weights == (0.0, 1.0, 0.0)
+
+    point, weights = spatial.closest_point_on_triangle((2.0, 2.0, 0.0), a, b, c)
+    assert all(abs(x - y) < 1e-9 for x, y in zip(point, (1.0, 1.0, 0.0)))
+    assert all(abs(x - y) < 1e-9 for x, y in zip(weights, (0.0, 0.5, 0.5)))
@@ -0,0 +1,32 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains command to apply Maya API modifiers in an undoable way
+"""
+
+from tpDcc.core import command
+
+
+class ApplyModifier(command.DccCommand, object):
+    """
+    Executes a MDGModifier/MDagModifier as a single undoable operation
+    """
+
+    id = 'tpDcc-dccs-maya-commands-applyModifier'
+    creator = 'Tomas Poveda'
+    is_undoable = True
+
+    _modifier = None
+
+    def run(self, modifier=None):
+
+        self._modifier = modifier
+        if not self._modifier:
+            return
+
+        self._modifier.doIt()
+
+    def undo(self):
+        if self._modifier:
+            self._modifier.undoIt()
@@ -0,0 +1,94 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains command to write baked values into animation curves
+"""
+
+import maya.api.OpenMaya
+import maya.api.OpenMayaAnim
+
+from tpDcc.core import command
+
+ANIM_CURVE_NODE_TYPES = {
+    maya.api.OpenMayaAnim.MFnAnimCurve.kAnimCurveTA: 'animCurveTA',
+    maya.api.OpenMayaAnim.MFnAnimCurve.kAnimCurveTL: 'animCurveTL',
+    maya.api.OpenMayaAnim.MFnAnimCurve.kAnimCurveTT: 'animCurveTT',
+    maya.api.OpenMayaAnim.MFnAnimCurve.kAnimCurveTU: 'animCurveTU'
+}
+
+
+class BakeAnimCurves(command.DccCommand, object):
+    """
+    Writes the given keys into the animation curves of the given plugs. Keys inside the baked range of already
+    existing time based animation curves are replaced; keys outside that range are kept
+    """
+
+    id = 'tpDcc-dccs-maya-commands-bakeAnimCurves'
+    creator = 'Tomas Poveda'
+    is_undoable = True
+
+    _modifier = None
+    _anim_change = None
+
+    def run(self, plugs=None, times=None, values=None, tangent_type=None):
+
+        self._modifier = maya.api.OpenMaya.MDGModifier()
+        self._anim_change = maya.api.OpenMayaAnim.MAnimCurveChange()
+        tangent_type = tangent_type or maya.api.OpenMayaAnim.MFnAnimCurve.kTangentGlobal
+
+        anim_curves = list()
+        replace_ranges = list()
+        disconnected = set()
+        plug_names = set(plug.partialName(includeNodeName=True, useFullAttributePath=True) for plug in plugs)
+        for plug, plug_times in zip(plugs, times):
+            # children of compound plugs connected at parent level (translate, rotate, ...) must be freed first.
+            # Children that are not baked are connected again to their source child
+            if plug.isChild:
+                parent = plug.parent()
+                parent_source = parent.source()
+                parent_name = parent.partialName(includeNodeName=True, useFullAttributePath=True)
+                if not parent_source.isNull and parent_name not in disconnected:
+                    self._modifier.disconnect(parent_source, parent)
+                    disconnected.add(parent_name)
+                    for i in range(parent.numChildren()):
+                        child = parent.child(i)
+                        if child.partialName(includeNodeName=True, useFullAttributePath=True) in plug_names:
+                            continue
+                        if parent_source.isCompound and i < parent_source.numChildren():
+                            self._modifier.connect(parent_source.child(i), child)
+            source = plug.source()
+            if not source.isNull and source.node().apiType() in (
+                    maya.api.OpenMaya.MFn.kAnimCurveTimeToAngular, maya.api.OpenMaya.MFn.kAnimCurveTimeToDistance,
+                    maya.api.OpenMaya.MFn.kAnimCurveTimeToTime, maya.api.OpenMaya.MFn.kAnimCurveTimeToUnitless):
+                anim_curves.append(source.node())
+                replace_ranges.append(True)
+                continue
+            if not source.isNull:
+                self._modifier.disconnect(source, plug)
+            curve_type = maya.api.OpenMayaAnim.MFnAnimCurve().timedAnimCurveTypeForPlug(plug)
+            anim_curve = self._modifier.createNode(ANIM_CURVE_NODE_TYPES.get(curve_type, 'animCurveTU'))
+            self._modifier.connect(maya.api.OpenMaya.MFnDependencyNode(anim_curve).findPlug('output', False), plug)
+            anim_curves.append(anim_curve)
+            replace_ranges.append(False)
+        self._modifier.doIt()
+
+        for anim_curve, replace_range, plug_times, plug_values in zip(anim_curves, replace_ranges, times, values):
+            if not len(plug_times):
+                continue
+            anim_curve_fn = maya.api.OpenMayaAnim.MFnAnimCurve(anim_curve)
+            if replace_range:
+                start_time, end_time = plug_times[0], plug_times[-1]
+                for i in reversed(range(anim_curve_fn.numKeys)):
+                    if start_time <= anim_curve_fn.input(i) <= end_time:
+                        anim_curve_fn.remove(i, self._anim_change)
+            anim_curve_fn.addKeys(
+                plug_times, plug_values, tangent_type, tangent_type, replace_range, self._anim_change)
+
+        return [maya.api.OpenMaya.MFnDependencyNode(anim_curve).name() for anim_curve in anim_curves]
+
+    def undo(self):
+        if self._anim_change:
+            self._anim_change.undoIt()
+        if self._modifier:
+            self._modifier.undoIt()
@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains command to edit the keys of animation curves in bulk
+"""
+
+import maya.api.OpenMayaAnim
+
+from tpDcc.core import command
+
+
+class EditAnimCurveKeys(command.DccCommand, object):
+    """
+    Applies a list of key edits to animation curves as a single undoable operation. Edits of each curve are applied
+    in the following order: shape preserving key inserts, key moves, key removals and tangent changes. Keys are
+    always looked up by time so edits do not depend on key indices
+    """
+
+    id = 'tpDcc-dccs-maya-commands-editAnimCurveKeys'
+    creator = 'Tomas Poveda'
+    is_undoable = True
+
+    _anim_change = None
+
+    def run(self, anim_curves=None, edits=None):
+        """
+        :param anim_curves: list(MObject), animation curves to edit
+        :param edits: list(dict), edits of each animation curve with the following optional keys:
+            insert (list(MTime), times where a key preserving the curve shape is inserted),
+            move (list(tuple(MTime, MTime)), current and new time of keys to move),
+            remove (list(MTime), times of keys to remove) and
+            tangents (list(tuple(MTime, int or None, int or None)), time of the key and its in/out tangent types)
+        :return: list(list(MTime)), per animation curve, times of the edits that could not be applied
+        """
+
+        self._anim_change = maya.api.OpenMayaAnim.MAnimCurveChange()
+
+        failed = list()
+        for anim_curve, edit in zip(anim_curves or list(), edits or list()):
+            anim_curve_fn = maya.api.OpenMayaAnim.MFnAnimCurve(anim_curve)
+            curve_failed = list()
+            for key_time in edit.get('insert', list()):
+                if anim_curve_fn.find(key_time) is not None:
+                    continue
+                try:
+                    anim_curve_fn.insertKey(key_time, self._anim_change)
+                except RuntimeError:
+                    curve_failed.append(key_time)
+            for source_time, target_time in edit.get('move', list()):
+                index = anim_curve_fn.find(source_time)
+                if index is None or anim_curve_fn.find(target_time) is not None:
+                    curve_failed.append(source_time)
+                    continue
+                try:
+                    anim_curve_fn.setInput(index, target_time, self._anim_change)
+                except RuntimeError:
+                    curve_failed.append(source_time)
+            for key_time in edit.get('remove', list()):
+                index = anim_curve_fn.find(key_time)
+                if index is not None:
+                    anim_curve_fn.remove(index, self._anim_change)
+            for key_time, in_tangent_type, out_tangent_type in edit.get('tangents', list()):
+                index = anim_curve_fn.find(key_time)
+                if index is None:
+                    curve_failed.append(key_time)
+                    continue
+                if in_tangent_type is not None:
+                    anim_curve_fn.setInTangentType(index, in_tangent_type, self._anim_change)
+                if out_tangent_type is not None:
+                    anim_curve_fn.setOutTangentType(index, out_tangent_type, self._anim_change)
+            failed.append(curve_failed)
+
+        return failed
+
+    def undo(self):
+        if self._anim_change:
+            self._anim_change.undoIt()
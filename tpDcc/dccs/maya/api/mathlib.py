@@ -218,3 +218,126 @@ def direction_vector_between_nodes(source_node=None, target_node=None):
     target_pos = maya.api.OpenMaya.MPoint(*maya.cmds.xform(target_node, query=True, worldSpace=True, translation=True))
 
     return target_pos - source_pos
+
+
+def as_matrix_array(matrices):
+    """
+    Returns given matrices as an MMatrixArray
+    :param matrices: MMatrixArray or list(MMatrix or list(float)), matrices to convert
+    :return: MMatrixArray
+    """
+
+    if isinstance(matrices, maya.api.OpenMaya.MMatrixArray):
+        return matrices
+
+    matrix_array = maya.api.OpenMaya.MMatrixArray()
+    for matrix in matrices:
+        matrix_array.append(
+            matrix if isinstance(matrix, maya.api.OpenMaya.MMatrix) else maya.api.OpenMaya.MMatrix(matrix))
+
+    return matrix_array
+
+
+def multiply_matrices(matrices1, matrices2):
+    """
+    Multiplies two lists of matrices element by element (matrices1[i] * matrices2[i])
+    If any of the inputs is a single matrix, it is multiplied with all the matrices of the other input
+    :param matrices1: MMatrixArray or list(MMatrix) or MMatrix
+    :param matrices2: MMatrixArray or list(MMatrix) or MMatrix
+    :return: MMatrixArray
+    """
+
+    result = maya.api.OpenMaya.MMatrixArray()
+    if isinstance(matrices1, maya.api.OpenMaya.MMatrix):
+        for matrix in as_matrix_array(matrices2):
+            result.append(matrices1 * matrix)
+    elif isinstance(matrices2, maya.api.OpenMaya.MMatrix):
+        for matrix in as_matrix_array(matrices1):
+            result.append(matrix * matrices2)
+    else:
+        matrices1 = as_matrix_array(matrices1)
+        matrices2 = as_matrix_array(matrices2)
+        if len(matrices1) != len(matrices2):
+            raise ValueError('Cannot multiply {} matrices by {} matrices'.format(len(matrices1), len(matrices2)))
+        for i in range(len(matrices1)):
+            result.append(matrices1[i] * matrices2[i])
+
+    return result
+
+
+def inverse_matrices(matrices):
+    """
+    Returns the inverse of all the given matrices
+    :param matrices: MMatrixArray or list(MMatrix)
+    :return: MMatrixArray
+    """
+
+    result = maya.api.OpenMaya.MMatrixArray()
+    for matrix in as_matrix_array(matrices):
+        result.append(matrix.inverse())
+
+    return result
+
+
+def decompose_matrices(matrices, rotation_orders=None, space=None):
+    """
+    Returns decomposed translation, rotation and scale of all the given matrices
+    Batch version of api.node.decompose_transform_matrix
+    :param matrices: MMatrixArray or list(MMatrix)
+    :param rotation_orders: int or list(int) or None, MEulerRotation rotation order to decompose each matrix with.
+        If None, XYZ is used
+    :param space: MSpace, coordinate space to decompose matrices of
+    :return: tuple(list(tuple), list(tuple), list(tuple)), translations, euler rotations (radians) and scales
+    """
+
+    space = space or maya.api.OpenMaya.MSpace.kTransform
+    matrices = as_matrix_array(matrices)
+    if rotation_orders is None:
+        rotation_orders = maya.api.OpenMaya.MEulerRotation.kXYZ
+    if isinstance(rotation_orders, int):
+        rotation_orders = [rotation_orders] * len(matrices)
+
+    translations = list()
+    rotations = list()
+    scales = list()
+    for matrix, rotation_order in zip(matrices, rotation_orders):
+        transform_matrix = maya.api.OpenMaya.MTransformationMatrix(matrix)
+        translation = transform_matrix.translation(space)
+        rotation = transform_matrix.rotation(asQuaternion=False)
+        if rotation.order != rotation_order:
+            rotation.reorderIt(rotation_order)
+        translations.append((translation.x, translation.y, translation.z))
+        rotations.append((rotation.x, rotation.y, rotation.z))
+        scales.append(tuple(transform_matrix.scale(space)))
+
+    return translations, rotations, scales
+
+
+def compose_matrices(translations, rotations, scales, rotation_orders=None):
+    """
+    Builds matrices from the given translation, euler rotation (radians) and scale values
+    :param translations: list(tuple(float, float, float))
+    :param rotations: list(tuple(float, float, float))
+    :param scales: list(tuple(float, float, float))
+    :param rotation_orders: int or list(int) or None, MEulerRotation rotation order of each rotation.
+        If None, XYZ is used
+    :return: MMatrixArray
+    """
+
+    if rotation_orders is None:
+        rotation_orders = maya.api.OpenMaya.MEulerRotation.kXYZ
+    if isinstance(rotation_orders, int):
+        rotation_orders = [rotation_orders] * len(translations)
+
+    result = maya.api.OpenMaya.MMatrixArray()
+    for translation, rotation, scale, rotation_order in zip(translations, rotations, scales, rotation_orders):
+        transform_matrix = maya.api.OpenMaya.MTransformationMatrix()
+        transform_matrix.setTranslation(
+            maya.api.OpenMaya.MVector(translation[0], translation[1], translation[2]),
+            maya.api.OpenMaya.MSpace.kTransform)
+        transform_matrix.setRotation(
+            maya.api.OpenMaya.MEulerRotation(rotation[0], rotation[1], rotation[2], rotation_order))
+        transform_matrix.setScale(scale, maya.api.OpenMaya.MSpace.kTransform)
+        result.append(transform_matrix.asMatrix())
+
+    return result
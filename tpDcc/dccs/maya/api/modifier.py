@@ -0,0 +1,28 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions related with Maya API modifiers
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.core import command
+
+
+def apply_modifier(mod, undoable=True):
+    """
+    Executes the given modifier
+    :param mod: MDGModifier or MDagModifier, modifier to execute
+    :param undoable: bool, Whether or not modifier should be executed as a single undo chunk
+    :return: MDGModifier or MDagModifier
+    """
+
+    if not undoable:
+        mod.doIt()
+        return mod
+
+    runner = command.CommandRunner()
+    runner.run('tpDcc-dccs-maya-commands-applyModifier', modifier=mod)
+
+    return mod
@@ -202,15 +202,19 @@ def set_plug_value(plug, value, mod=None, apply=True):
         if count != len(value):
             return
         for i in range(count):
-            set_plug_value(plug.elementByPhysicalIndex(i), value[i], mod=mod)
-        return
+            set_plug_value(plug.elementByPhysicalIndex(i), value[i], mod=mod, apply=False)
+        if apply:
+            mod.doIt()
+        return mod
     elif is_compound:
         count = plug.numChildren()
         if count != len(value):
             return
         for i in range(count):
-            set_plug_value(plug.child(i), value[i], mod=mod)
-        return
+            set_plug_value(plug.child(i), value[i], mod=mod, apply=False)
+        if apply:
+            mod.doIt()
+        return mod
 
     obj = plug.attribute()
     if obj.hasFn(maya.api.OpenMaya.MFn.kUnitAttribute):
@@ -231,95 +235,94 @@ def set_plug_value(plug, value, mod=None, apply=True):
                 mod.newPlugValueMAngle(plug, maya.api.OpenMaya.MAngle(value))
             else:
                 plug.setMAngle(maya.api.OpenMaya.MAngle(value))
-        elif obj.hasFn(maya.api.OpenMaya.MFn.kNumericAttribute):
-            numeric_attr = maya.api.OpenMaya.MFnNumericAttribute(obj)
-            numeric_type = numeric_attr.numericType()
-            if numeric_type in (
-                    maya.api.OpenMaya.MFnNumericData.k2Double, maya.api.OpenMaya.MFnNumericData.k2Float,
-                    maya.api.OpenMaya.MFnNumericData.k2Int, maya.api.OpenMaya.MFnNumericData.k2Long,
-                    maya.api.OpenMaya.MFnNumericData.k2Short, maya.api.OpenMaya.MFnNumericData.k3Double,
-                    maya.api.OpenMaya.MFnNumericData.k3Float, maya.api.OpenMaya.MFnNumericData.k3Int,
-                    maya.api.OpenMaya.MFnNumericData.k3Long, maya.api.OpenMaya.MFnNumericData.k3Short,
-                    maya.api.OpenMaya.MFnNumericData.k4Double):
-                data = maya.api.OpenMaya.MFnNumericData().create(value)
-                if mod:
-                    mod.newPlugValue(plug, data.object())
-                else:
-                    plug.setMObject(data.object())
-            elif numeric_type == maya.api.OpenMaya.MFnNumericData.kDouble:
-                if mod:
-                    mod.newPlugValueDouble(plug, value)
-                else:
-                    plug.setDouble(value)
-            elif numeric_type == maya.api.OpenMaya.MFnNumericData.kFloat:
-                if mod:
-                    mod.newPlugValueFloat(plug, value)
-                else:
-                    plug.setFloat(value)
-            elif numeric_type == maya.api.OpenMaya.MFnNumericData.kBoolean:
-                if mod:
-                    mod.newPlugValueBool(plug, value)
-                else:
-                    plug.setBool(value)
-            elif numeric_type == maya.api.OpenMaya.MFnNumericData.kChar:
-                if mod:
-                    mod.newPlugValueChar(plug, value)
-                else:
-                    plug.setChar(value)
-            elif numeric_type in (
-                    maya.api.OpenMaya.MFnNumericData.kInt, maya.api.OpenMaya.MFnNumericData.kInt64,
-                    maya.api.OpenMaya.MFnNumericData.kLong, maya.api.OpenMaya.MFnNumericData.kLast):
-                if mod:
-                    mod.newPlugValueInt(plug, value)
-                else:
-                    plug.setInt(value)
-            elif numeric_type == maya.api.OpenMaya.MFnNumericData.kShort:
-                if mod:
-                    mod.newPlugValueInt(plug, value)
-                else:
-                    plug.setInt(value)
-        elif obj.hasFn(maya.api.OpenMaya.MFn.kEnumAttribute):
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kNumericAttribute):
+        numeric_attr = maya.api.OpenMaya.MFnNumericAttribute(obj)
+        numeric_type = numeric_attr.numericType()
+        if numeric_type in (
+                maya.api.OpenMaya.MFnNumericData.k2Double, maya.api.OpenMaya.MFnNumericData.k2Float,
+                maya.api.OpenMaya.MFnNumericData.k2Int, maya.api.OpenMaya.MFnNumericData.k2Long,
+                maya.api.OpenMaya.MFnNumericData.k2Short, maya.api.OpenMaya.MFnNumericData.k3Double,
+                maya.api.OpenMaya.MFnNumericData.k3Float, maya.api.OpenMaya.MFnNumericData.k3Int,
+                maya.api.OpenMaya.MFnNumericData.k3Long, maya.api.OpenMaya.MFnNumericData.k3Short,
+                maya.api.OpenMaya.MFnNumericData.k4Double):
+            data = maya.api.OpenMaya.MFnNumericData().create(value)
+            if mod:
+                mod.newPlugValue(plug, data.object())
+            else:
+                plug.setMObject(data.object())
+        elif numeric_type == maya.api.OpenMaya.MFnNumericData.kDouble:
+            if mod:
+                mod.newPlugValueDouble(plug, value)
+            else:
+                plug.setDouble(value)
+        elif numeric_type == maya.api.OpenMaya.MFnNumericData.kFloat:
+            if mod:
+                mod.newPlugValueFloat(plug, value)
+            else:
+                plug.setFloat(value)
+        elif numeric_type == maya.api.OpenMaya.MFnNumericData.kBoolean:
+            if mod:
+                mod.newPlugValueBool(plug, value)
+            else:
+                plug.setBool(value)
+        elif numeric_type == maya.api.OpenMaya.MFnNumericData.kChar:
+            if mod:
+                mod.newPlugValueChar(plug, value)
+            else:
+                plug.setChar(value)
+        elif numeric_type in (
+                maya.api.OpenMaya.MFnNumericData.kInt, maya.api.OpenMaya.MFnNumericData.kInt64,
+                maya.api.OpenMaya.MFnNumericData.kLong, maya.api.OpenMaya.MFnNumericData.kLast):
+            if mod:
+                mod.newPlugValueInt(plug, value)
+            else:
+                plug.setInt(value)
+        elif numeric_type == maya.api.OpenMaya.MFnNumericData.kShort:
             if mod:
                 mod.newPlugValueInt(plug, value)
             else:
                 plug.setInt(value)
-        elif obj.hasFn(maya.api.OpenMaya.MFn.kTypedAttribute):
-            typed_attr = maya.api.OpenMaya.MFnTypedAttribute(obj)
-            typed_type = typed_attr.attrType()
-            if typed_type == maya.api.OpenMaya.MFnData.kMatrix:
-                mat = maya.api.OpenMaya.MFnMatrixData().create(maya.api.OpenMaya.MMatrix(value))
-                if mod:
-                    mod.newPlugValue(plug, mat)
-                else:
-                    plug.setMObject(mat)
-            elif typed_type == maya.api.OpenMaya.MFnData.kString:
-                if mod:
-                    mod.newPlugValueString(plug, value)
-                else:
-                    plug.setString(value)
-        elif obj.hasFn(maya.api.OpenMaya.MFn.kMatrixAttribute):
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kEnumAttribute):
+        if mod:
+            mod.newPlugValueInt(plug, value)
+        else:
+            plug.setInt(value)
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kTypedAttribute):
+        typed_attr = maya.api.OpenMaya.MFnTypedAttribute(obj)
+        typed_type = typed_attr.attrType()
+        if typed_type == maya.api.OpenMaya.MFnData.kMatrix:
             mat = maya.api.OpenMaya.MFnMatrixData().create(maya.api.OpenMaya.MMatrix(value))
             if mod:
                 mod.newPlugValue(plug, mat)
             else:
                 plug.setMObject(mat)
-        elif obj.hasFn(maya.api.OpenMaya.MFn.kMessageAttribute) and not value:
-            # Message attributes doesn't have any values
-            pass
-        elif obj.hasFn(maya.api.OpenMaya.MFn.kMessageAttribute) and isinstance(value, maya.api.OpenMaya.MPlug):
-            # connect the message attribute
-            connect_plugs(plug, value, mod=mod, apply=False)
-        elif obj.hasFn(maya.api.OpenMaya.MFn.kMessageAttribute):
-            # Message attributes doesn't have any values
-            pass
-            connect_plugs(plug, value, mod=mod, apply=False)
+        elif typed_type == maya.api.OpenMaya.MFnData.kString:
+            if mod:
+                mod.newPlugValueString(plug, value)
+            else:
+                plug.setString(value)
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kMatrixAttribute):
+        mat = maya.api.OpenMaya.MFnMatrixData().create(maya.api.OpenMaya.MMatrix(value))
+        if mod:
+            mod.newPlugValue(plug, mat)
         else:
-            raise ValueError('Currently data type "{}" is not supported'.format(obj.apiTypeStr))
+            plug.setMObject(mat)
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kMessageAttribute) and not value:
+        # Message attributes doesn't have any values
+        pass
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kMessageAttribute) and isinstance(value, maya.api.OpenMaya.MPlug):
+        # connect the message attribute
+        connect_plugs(plug, value, mod=mod, apply=False)
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kMessageAttribute):
+        # Message attributes doesn't have any values
+        pass
+    else:
+        raise ValueError('Currently data type "{}" is not supported'.format(obj.apiTypeStr))
 
-        if apply and mod:
-            mod.doIt()
+    if apply and mod:
+        mod.doIt()
 
-        return mod
+    return mod
 
 
 def connect_plugs(source, target, mod=None, force=True, apply=True):
@@ -330,20 +333,60 @@ def connect_plugs(source, target, mod=None, force=True, apply=True):
     :param mod: MDGModifier
     :param force: bool
     :param apply: bool, Whether to apply the modifier instantly or leave it to the caller
-    :return:
+    :return: MDGModifier
     """
 
     mod = mod or maya.api.OpenMaya.MDGModifier()
 
-    source_is_destination = source.isDestination
-    if source_is_destination:
+    if target.isDestination:
         target_source = target.source()
         if force:
             mod.disconnect(target_source, target)
         else:
             raise ValueError('Plug {} has incoming connection {}'.format(target.name(), target_source.name()))
     mod.connect(source, target)
-    if mod is None and apply:
+    if apply:
+        mod.doIt()
+
+    return mod
+
+
+def copy_plug_value(source, target, mod=None, apply=True):
+    """
+    Copies the value of the given source MPlug into the target MPlug
+    Only works with leaf plugs (non array and non compound ones)
+    :param source: MPlug, plug to copy value from
+    :param target: MPlug, plug to copy value into
+    :param mod: MDGModifier
+    :param apply: bool, Whether to apply the modifier instantly or leave it to the caller
+    :return: MDGModifier
+    """
+
+    mod = mod or maya.api.OpenMaya.MDGModifier()
+
+    obj = source.attribute()
+    if obj.hasFn(maya.api.OpenMaya.MFn.kNumericAttribute):
+        numeric_type = maya.api.OpenMaya.MFnNumericAttribute(obj).numericType()
+        if numeric_type == maya.api.OpenMaya.MFnNumericData.kBoolean:
+            mod.newPlugValueBool(target, source.asBool())
+        elif numeric_type in (maya.api.OpenMaya.MFnNumericData.kFloat, maya.api.OpenMaya.MFnNumericData.kDouble):
+            mod.newPlugValueDouble(target, source.asDouble())
+        else:
+            mod.newPlugValueInt(target, source.asInt())
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kUnitAttribute):
+        # unit values are copied in internal units, so no conversion is needed
+        mod.newPlugValueDouble(target, source.asDouble())
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kEnumAttribute):
+        mod.newPlugValueInt(target, source.asInt())
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kTypedAttribute) and maya.api.OpenMaya.MFnTypedAttribute(
+            obj).attrType() == maya.api.OpenMaya.MFnData.kString:
+        mod.newPlugValueString(target, source.asString())
+    elif obj.hasFn(maya.api.OpenMaya.MFn.kTypedAttribute) or obj.hasFn(maya.api.OpenMaya.MFn.kMatrixAttribute):
+        mod.newPlugValue(target, source.asMObject())
+    else:
+        raise ValueError('Currently data type "{}" is not supported'.format(obj.apiTypeStr))
+
+    if apply:
         mod.doIt()
 
     return mod
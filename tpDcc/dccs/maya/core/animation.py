@@ -8,6 +8,7 @@ This module include functions related with animation
 from __future__ import print_function, division, absolute_import
 
 import math
+import time
 import logging
 import traceback
 
@@ -15,12 +16,29 @@ from tpDcc.libs.python import python
 
 import maya.cmds
 import maya.mel
+import maya.api.OpenMaya
+import maya.api.OpenMayaAnim
 
+from tpDcc.core import command
 from tpDcc.dccs.maya import api
-from tpDcc.dccs.maya.core import attribute, scene
+from tpDcc.dccs.maya.api import plugs as api_plugs
+from tpDcc.dccs.maya.core import attribute, scene, contexts
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
+TANGENT_TYPES = {
+    'global': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentGlobal,
+    'fixed': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentFixed,
+    'linear': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentLinear,
+    'flat': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentFlat,
+    'smooth': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentSmooth,
+    'step': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentStep,
+    'stepnext': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentStepNext,
+    'clamped': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentClamped,
+    'plateau': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentPlateau,
+    'auto': maya.api.OpenMayaAnim.MFnAnimCurve.kTangentAuto
+}
+
 
 class InsertRemoveAnimCurveKeys(object):
     def __init__(self, anim_curves=None, start_frame=0, end_frame=0, sequence_least_key=None, sequence_great_key=None):
@@ -40,19 +58,47 @@ class InsertRemoveAnimCurveKeys(object):
         :return:
         """
 
+        return self.key_all_animation_curves_in_frames([frame], tangent_type=tangent_type)
+
+    def key_all_animation_curves_in_frames(self, frames, tangent_type='step'):
+        """
+        Inserts keyframes on all animation curves on given frames
+        Keys are inserted preserving the shape of the curves and their out tangent type is set directly on each key,
+        as a single undoable operation and without modifying current keys selection
+        :param frames: list(int)
+        :param tangent_type: str or None, out tangent type of the inserted keys. If None, default tangent type is used
+        :return: list(str), keyed animation curves
+        """
+
+        out_tangent_type = None
+        if tangent_type:
+            out_tangent_type = TANGENT_TYPES.get(tangent_type)
+            if out_tangent_type is None:
+                LOGGER.warning('Tangent type "{}" is not supported! Default one will be used.'.format(tangent_type))
+
+        ui_unit = maya.api.OpenMaya.MTime.uiUnit()
+        key_times = [maya.api.OpenMaya.MTime(frame, ui_unit) for frame in python.force_list(frames)]
+        edit = {'insert': key_times}
+        if out_tangent_type is not None:
+            edit['tangents'] = [(key_time, None, out_tangent_type) for key_time in key_times]
+
+        anim_curve_fns = _get_anim_curve_fns(self._anim_curves)
+        if not anim_curve_fns or not key_times:
+            return list()
+
+        runner = command.CommandRunner()
+        failed = runner.run(
+            'tpDcc-dccs-maya-commands-editAnimCurveKeys',
+            anim_curves=[anim_curve_fn.object() for _, anim_curve_fn in anim_curve_fns],
+            edits=[edit] * len(anim_curve_fns)) or [list()] * len(anim_curve_fns)
+
         editable = list()
-        for anim_curve in self._anim_curves:
-            try:
-                keyable = maya.cmds.setKeyframe(anim_curve, insert=True, t=frame)
-                if keyable:
-                    editable.append(anim_curve)
-                    if tangent_type == 'step':
-                        maya.cmds.selectKey(anim_curve, add=True, keyframe=True, time=(frame, frame))
-                        maya.mel.eval('keyTangent -ott "step";')
-            except Exception as exc:
-                LOGGER.error(
-                    'Error while keying animation curve "{}" on frame "{}" | {} | {}'.format(
-                        anim_curve, frame, exc, traceback.format_exc()))
+        for (anim_curve, _), curve_failed in zip(anim_curve_fns, failed):
+            if curve_failed:
+                LOGGER.error('Error while keying animation curve "{}" on frames "{}"'.format(
+                    anim_curve, [key_time.asUnits(ui_unit) for key_time in curve_failed]))
+                continue
+            editable.append(anim_curve)
 
         return editable
 
@@ -198,6 +244,155 @@ class InsertRemoveAnimCurveKeys(object):
         return delete_keys_dict
 
 
+class PlugBaker(object):
+    """
+    Bakes the values of a list of plugs over a frame range without changing the scene current time
+    Plugs are sampled frame by frame through a DG context (so the scene current time and the viewport are not
+    updated) and keys are written in bulk per curve
+    """
+
+    def __init__(self, plugs, start_frame=None, end_frame=None, step=1, sparse=True, filter_rotations=True):
+        """
+        Constructor
+        :param plugs: list(str or MPlug), plugs to bake. Compound plugs (translate, rotate, ...) are expanded
+        :param start_frame: float or None, first frame to bake. If None, active frame range start is used
+        :param end_frame: float or None, last frame to bake. If None, active frame range end is used
+        :param step: float, frame increment between samples
+        :param sparse: bool, Whether or not to remove keys that do not change the curve value
+        :param filter_rotations: bool, Whether or not to apply an euler filter on baked rotation curves
+        """
+
+        if start_frame is None or end_frame is None:
+            start_frame, end_frame = get_active_frame_range()
+
+        self._plugs = self._get_plugs(plugs)
+        self._step = step
+        self._sparse = sparse
+        self._filter_rotations = filter_rotations
+        self._frames = list()
+        frame = start_frame
+        while frame <= end_frame:
+            self._frames.append(frame)
+            frame += step
+        self._stats = dict()
+
+    @property
+    def plugs(self):
+        return self._plugs
+
+    @property
+    def frames(self):
+        return self._frames
+
+    @property
+    def stats(self):
+        """
+        Returns timing information of the last bake
+        :return: dict
+        """
+
+        return dict(self._stats)
+
+    def sample(self):
+        """
+        Samples all plugs in all frames
+        :return: list(MDoubleArray), values (in internal units) of each plug, one per frame
+        """
+
+        start = time.time()
+        values = [maya.api.OpenMaya.MDoubleArray() for _ in self._plugs]
+        for frame in self._frames:
+            with contexts.dg_context(frame):
+                for plug, plug_values in zip(self._plugs, values):
+                    plug_values.append(plug.asDouble())
+        elapsed = time.time() - start
+        self._stats['plugs'] = len(self._plugs)
+        self._stats['frames'] = len(self._frames)
+        self._stats['sample_time'] = elapsed
+        samples = len(self._plugs) * len(self._frames)
+        self._stats['sample_time_per_million'] = (elapsed * 1000000.0 / samples) if samples else 0.0
+
+        return values
+
+    def bake(self, dry_run=False):
+        """
+        Bakes the plugs
+        :param dry_run: bool, If True, plugs are sampled but no animation curve is written
+        :return: list(str) or list(MDoubleArray), baked animation curves or sampled values if dry_run is True
+        """
+
+        values = self.sample()
+        if dry_run:
+            return values
+
+        start = time.time()
+        ui_unit = maya.api.OpenMaya.MTime.uiUnit()
+        all_times = list()
+        all_values = list()
+        for plug_values in values:
+            indices = self._get_sparse_indices(plug_values) if self._sparse else range(len(plug_values))
+            times = maya.api.OpenMaya.MTimeArray()
+            curve_values = maya.api.OpenMaya.MDoubleArray()
+            for i in indices:
+                times.append(maya.api.OpenMaya.MTime(self._frames[i], ui_unit))
+                curve_values.append(plug_values[i])
+            all_times.append(times)
+            all_values.append(curve_values)
+
+        runner = command.CommandRunner()
+        anim_curves = runner.run(
+            'tpDcc-dccs-maya-commands-bakeAnimCurves', plugs=self._plugs, times=all_times, values=all_values) or list()
+
+        if self._filter_rotations:
+            rotation_curves = [
+                anim_curve for anim_curve in anim_curves if maya.cmds.nodeType(anim_curve) == 'animCurveTA']
+            if rotation_curves:
+                maya.cmds.filterCurve(rotation_curves)
+
+        self._stats['write_time'] = time.time() - start
+        self._stats['keys'] = sum([len(times) for times in all_times])
+
+        return anim_curves
+
+    def _get_plugs(self, plugs):
+        """
+        Internal function that returns the numeric leaf MPlugs of the given plugs
+        :param plugs: list(str or MPlug)
+        :return: list(MPlug)
+        """
+
+        found = list()
+        for plug in python.force_list(plugs):
+            if python.is_string(plug):
+                plug = api_plugs.as_mplug(plug)
+            if plug.isCompound:
+                found.extend([plug.child(i) for i in range(plug.numChildren())])
+            else:
+                found.append(plug)
+
+        return found
+
+    def _get_sparse_indices(self, values, tolerance=1e-6):
+        """
+        Internal function that returns the indices of the samples that modify the resulting curve
+        :param values: MDoubleArray
+        :param tolerance: float
+        :return: list(int)
+        """
+
+        count = len(values)
+        if count < 3:
+            return list(range(count))
+
+        indices = [0]
+        for i in range(1, count - 1):
+            if abs(values[i] - values[i - 1]) > tolerance or abs(values[i + 1] - values[i]) > tolerance:
+                indices.append(i)
+        indices.append(count - 1)
+
+        return indices
+
+
 def get_animation_curve_types():
     """
     Returns a list with all animation curve types available in Maya
@@ -398,19 +593,19 @@ def convert_start_end_frame_anim_curve_tangents_to_fixed(anim_curves, frames):
                     maya.mel.eval('keyTangent -time {} -inTangentType "fixed" {} ;'.format(frame, anim_curve))
 
 
-def key_all_anim_curves_in_frames(frames, anim_curves=None):
+def key_all_anim_curves_in_frames(frames, anim_curves=None, tangent_type='step'):
     """
-    Inserts keyframes on all animation curves on given frame
+    Inserts keyframes on all animation curves on given frames
     :param frames: list(int)
     :param anim_curves: list(str)
+    :param tangent_type: str or None, out tangent type of the inserted keys
+    :return: list(str), keyed animation curves
     """
 
-    frames = python.force_list(frames)
-
     anim_curves = anim_curves or get_all_anim_curves()
     insert_anim_keys = InsertRemoveAnimCurveKeys(anim_curves=anim_curves)
-    for frame in frames:
-        return insert_anim_keys.key_all_animation_curves_in_given_frame(frame)
+
+    return insert_anim_keys.key_all_animation_curves_in_frames(frames, tangent_type=tangent_type)
 
 
 def delete_keys_from_animation_curves_in_range(range_to_delete, anim_curves=None):
@@ -434,38 +629,37 @@ def check_anim_curves_has_fraction_keys(anim_curves, selected_range=None):
     :return: bool
     """
 
-    fraction_keys = list()
-    selected_keys = maya.cmds.keyframe(query=True, selected=True)
+    if selected_range is False:
+        selected_keys = maya.cmds.keyframe(query=True, selected=True)
+        if selected_keys is not None:
+            return any(not keyframe.is_integer() for keyframe in selected_keys)
+
+    selected_start = selected_end = None
     if selected_range is not None and type(selected_range) in [list, tuple]:
         selected_start = selected_range[0]
         selected_end = selected_range[-1] - 1
-        for anim_curve in anim_curves:
-            all_keyframes = maya.cmds.keyframe(anim_curve, query=True)
-            if all_keyframes is not None:
-                for keyframe in all_keyframes:
-                    if not keyframe.is_integer() and selected_start <= keyframe \
-                            <= selected_end and keyframe not in fraction_keys:
-                        fraction_keys.append(keyframe)
-    elif selected_range is False and selected_keys is not None:
-        fraction_keys = [k for k in list(set(selected_keys)) if not k.is_integer()]
-    else:
-        for anim_curve in anim_curves:
-            all_keyframes = maya.cmds.keyframe(anim_curve, query=True)
-            if all_keyframes is not None:
-                for keyframe in all_keyframes:
-                    if not keyframe.is_integer() and keyframe not in fraction_keys:
-                        fraction_keys.append(keyframe)
 
-    return len(fraction_keys) > 0
+    ui_unit = maya.api.OpenMaya.MTime.uiUnit()
+    for _, anim_curve_fn in _get_anim_curve_fns(anim_curves):
+        for i in range(anim_curve_fn.numKeys):
+            keyframe = anim_curve_fn.input(i).asUnits(ui_unit)
+            if keyframe.is_integer():
+                continue
+            if selected_start is None or selected_start <= keyframe <= selected_end:
+                return True
+
+    return False
 
 
 def convert_fraction_keys_to_whole_keys(animation_curves, consider_selected_range=False):
     """
     Find keys on fraction of a frame and insert a key on the nearest whole number frame
     Useful to make sure that no keys are located on fraction of frames
+    Keys of each curve are read once through the API, the fix is planned in memory and then applied in bulk as a
+    single undoable operation
     :param animation_curves: list(str)
     :param consider_selected_range: bool
-    :return:
+    :return: dict(str, list(float)), fraction frames that could not be put on a whole frame of each animation curve
     """
 
     from tpDcc.dccs.maya.core import gui
@@ -473,7 +667,7 @@ def convert_fraction_keys_to_whole_keys(animation_curves, consider_selected_rang
     if not animation_curves:
         animation_curves = get_all_anim_curves()
     if not animation_curves:
-        return
+        return dict()
 
     selected_keys = False
     selected_range = None
@@ -487,92 +681,63 @@ def convert_fraction_keys_to_whole_keys(animation_curves, consider_selected_rang
         elif slider_range[1] - slider_range[0] > 1:
             selected_range = slider_range
 
-    if not check_anim_curves_has_fraction_keys(animation_curves, selected_range=selected_range):
-        return
+    ui_unit = maya.api.OpenMaya.MTime.uiUnit()
+    curve_names = list()
+    curve_objects = list()
+    curve_fixes = list()
+    edits = list()
+    for anim_curve, anim_curve_fn in _get_anim_curve_fns(animation_curves):
+        times = [anim_curve_fn.input(i).asUnits(ui_unit) for i in range(anim_curve_fn.numKeys)]
+        candidates = None
+        if selected_keys:
+            candidates = set(maya.cmds.keyframe(anim_curve, query=True, selected=True) or list())
+        elif selected_range is not None and type(selected_range) in [list, tuple]:
+            selected_start = selected_range[0]
+            selected_end = selected_range[-1] - 1
+            candidates = set([frame for frame in times if selected_start <= frame <= selected_end])
+        if not any(not frame.is_integer() and (candidates is None or frame in candidates) for frame in times):
+            continue
 
-    anim_curve_count = len(animation_curves)
-    LOGGER.info('Cleaning {} animation curve'.format(anim_curve_count))
+        values = [anim_curve_fn.value(i) for i in range(anim_curve_fn.numKeys)]
+        fixes, frames_to_delete = _get_fraction_keys_fixes(times, values, candidates=candidates)
+        curve_names.append(anim_curve)
+        curve_objects.append(anim_curve_fn.object())
+        curve_fixes.append(fixes)
+        edits.append({
+            'insert': [maya.api.OpenMaya.MTime(fix[1], ui_unit) for fix in fixes if not fix[3]],
+            'move': [(maya.api.OpenMaya.MTime(fix[0], ui_unit), maya.api.OpenMaya.MTime(
+                fix[1], ui_unit)) for fix in fixes if fix[3]],
+            'remove': [maya.api.OpenMaya.MTime(frame, ui_unit) for frame in frames_to_delete]
+        })
 
-    all_frames_fixed = list()
-    failed_fixes = dict()
+    if not edits:
+        return dict()
 
-    for anim_curve in animation_curves:
-        keyframes = maya.cmds.keyframe(anim_curve, query=True)
-        if consider_selected_range:
-            if selected_keys:
-                keyframes = maya.cmds.keyframe(anim_curve, query=True, selected=True)
-            elif selected_range is not None and type(selected_range) in [list, tuple] and keyframes is not None:
-                selected_start = selected_range[0]
-                selected_end = selected_range[-1] - 1
-                keyframes = [frame for frame in keyframes if selected_start <= frame <= selected_end]
-        if keyframes is None:
-            continue
+    LOGGER.info('Cleaning {} animation curve'.format(len(edits)))
+
+    runner = command.CommandRunner()
+    failed = runner.run(
+        'tpDcc-dccs-maya-commands-editAnimCurveKeys', anim_curves=curve_objects, edits=edits) or [list()] * len(edits)
+
+    frames_fixed = set()
+    failed_fixes = dict()
+    for anim_curve, fixes, curve_failed in zip(curve_names, curve_fixes, failed):
+        failed_frames = set([key_time.asUnits(ui_unit) for key_time in curve_failed])
+        for frame, round_frame, current_value, is_hold in fixes:
+            if frame not in failed_frames and round_frame not in failed_frames:
+                frames_fixed.add(round_frame)
+                continue
+            error_msg = 'AnimCurve: {}\n'.format(anim_curve)
+            if is_hold:
+                error_msg += 'Tried to move a key from frame {} to frame {} to maintain a hold with ' \
+                             'a value of {}. Usually failed due to keyframe already existing on frame trying ' \
+                             'to move to'.format(frame, round_frame, current_value)
+            else:
+                error_msg += 'Tried to insert a key on frame {} to preserve animation curve shape to replace' \
+                             ' key on frame {}'.format(round_frame, frame)
+            LOGGER.error(error_msg)
+            failed_fixes.setdefault(anim_curve, list()).append(frame)
 
-        keys_inserted = list()
-        keys_fraction_to_delete = list()
-        for frame in keyframes:
-            if not frame.is_integer():
-                round_frame = round(frame)
-                if round_frame in keyframes or round_frame in keys_inserted:
-                    try_again = True
-                    if round_frame > frame:
-                        round_frame = math.floor(frame)
-                        if round_frame not in keyframes and round_frame not in keys_inserted:
-                            try_again = False
-                    if round_frame < frame and try_again:
-                        round_frame = math.ceil(frame)
-                        if round_frame not in keyframes and round_frame not in keys_inserted:
-                            try_again = False
-                        if try_again:
-                            keys_fraction_to_delete.append(frame)
-                            continue
-
-                is_hold = False
-                current_value = maya.cmds.keyframe(anim_curve, time=(frame, frame), query=True, valueChange=True)[0]
-                frame_index = keyframes.index(frame)
-                if frame_index != 0:
-                    pre_frame = keyframes[frame_index - 1]
-                    pre_value = maya.cmds.keyframe(
-                        anim_curve, time=(pre_frame, pre_frame), query=True, valueChange=True)
-                    if pre_value is not None and current_value == pre_value[0]:
-                        is_hold = True
-                if frame_index != keyframes.index(keyframes[-1]):
-                    post_frame = keyframes[frame_index + 1]
-                    post_value = maya.cmds.keyframe(
-                        anim_curve, time=(post_frame, post_frame), query=True, valueChange=True)
-                    if post_value is not None and current_value == post_value[0]:
-                        is_hold = True
-                try:
-                    if is_hold:
-                        maya.cmds.keyframe(
-                            anim_curve, edit=True, absolute=True, timeChange=round_frame, time=(frame, frame))
-                    else:
-                        maya.cmds.setKeyframe(anim_curve, insert=True, t=round_frame)
-                    keys_inserted.append(round_frame)
-                except Exception:
-                    error_msg = 'AnimCurve: {}\n'.format(anim_curve)
-                    if is_hold:
-                        error_msg += 'Tried to move a key from frame {} to frame {} to maintain a hold with ' \
-                                     'a value of {}. Usually failed due to keyframe already existing on frame trying ' \
-                                     'to move to'.format(frame, round_frame, current_value)
-                    else:
-                        error_msg += 'Tried to insert a key on frame {} to preserve animation curve shape to replace' \
-                                     ' key on frame {}'.format(round_frame, frame)
-                    LOGGER.error(error_msg)
-                    if anim_curve not in failed_fixes:
-                        failed_fixes[anim_curve] = [frame]
-                    else:
-                        failed_fixes[anim_curve].append(frame)
-
-                keys_fraction_to_delete.append(frame)
-
-        for frame_to_delete in keys_fraction_to_delete:
-            maya.cmds.cutKey(anim_curve, time=(frame_to_delete, frame_to_delete), clear=True)
-
-        all_frames_fixed += keys_inserted
-
-    frames_fixed = list()
-    [frames_fixed.append(ff) for ff in all_frames_fixed if ff not in frames_fixed]
     if len(frames_fixed) > 0:
         LOGGER.info('Fixed keys on {} frames to be on a whole number frame.\n'.format(len(frames_fixed)))
     else:
@@ -582,6 +747,63 @@ def convert_fraction_keys_to_whole_keys(animation_curves, consider_selected_rang
         for i, crv in enumerate(failed_fixes, 1):
             LOGGER.warning('\t{}. "{}" : {}'.format(i, crv, failed_fixes[crv]))
 
+    return failed_fixes
+
+
+def _get_anim_curve_fns(anim_curves):
+    """
+    Internal function that returns the API function sets of the given animation curves
+    Animation curves that do not exist are skipped
+    :param anim_curves: list(str)
+    :return: list(tuple(str, MFnAnimCurve))
+    """
+
+    anim_curve_fns = list()
+    for anim_curve in anim_curves or list():
+        selection_list = maya.api.OpenMaya.MSelectionList()
+        try:
+            selection_list.add(anim_curve)
+            anim_curve_fn = maya.api.OpenMayaAnim.MFnAnimCurve(selection_list.getDependNode(0))
+        except RuntimeError:
+            continue
+        anim_curve_fns.append((anim_curve, anim_curve_fn))
+
+    return anim_curve_fns
+
+
+def _get_fraction_keys_fixes(times, values, candidates=None):
+    """
+    Internal function that plans how the fraction keys of an animation curve are put on whole frames
+    Each fraction key is replaced by a key on its nearest free whole frame: keys that are part of a hold (same value
+    as their previous or next key) are moved to keep the hold, the rest are replaced by a key inserted preserving the
+    curve shape. Fraction keys without a free whole frame next to them are just deleted
+    :param times: list(float), sorted times of all keys of the curve
+    :param values: list(float), values of all keys of the curve
+    :param candidates: set(float) or None, times of the keys that can be fixed. If None, all keys can be fixed
+    :return: tuple(list(tuple(float, float, float, bool)), list(float)), fixes (fraction frame, whole frame, key
+        value and whether or not the key is moved to keep a hold) and fraction frames to delete
+    """
+
+    occupied = set([frame for frame in times if frame.is_integer()])
+    last_index = len(times) - 1
+    fixes = list()
+    frames_to_delete = list()
+    for i, frame in enumerate(times):
+        if frame.is_integer() or (candidates is not None and frame not in candidates):
+            continue
+        frames_to_delete.append(frame)
+        round_frame = float(round(frame))
+        if round_frame in occupied:
+            round_frame = float(math.floor(frame) if round_frame > frame else math.ceil(frame))
+            if round_frame in occupied:
+                continue
+        occupied.add(round_frame)
+        current_value = values[i]
+        is_hold = (i != 0 and values[i - 1] == current_value) or (i != last_index and values[i + 1] == current_value)
+        fixes.append((frame, round_frame, current_value, is_hold))
+
+    return fixes, frames_to_delete
+
 
 def get_active_frame_range():
     """
@@ -603,18 +825,34 @@ def set_active_frame_range(start_frame, end_frame):
         animationStartTime=start_frame, minTime=start_frame, animationEndTime=end_frame, maxTime=end_frame)
 
 
-def bake_animation(nodes, min_time=None, max_time=None):
+def bake_animation(nodes, min_time=None, max_time=None, attributes=None, use_bake_results=True, dry_run=False):
     """
     Bakes animation on given nodes.
     This function ensures that no flipping happens during animation baking
     :param nodes: list(str)
     :param min_time: float
     :param max_time: float
+    :param attributes: list(str) or None, attributes to bake. If None, all keyable attributes are baked. Only used if
+        use_bake_results is False
+    :param use_bake_results: bool, Whether to bake using Maya bakeResults command or PlugBaker engine (which samples
+        given attributes without updating the scene)
+    :param dry_run: bool, If True, PlugBaker samples are returned and no animation curve is written
+    :return: list(str) or list(MDoubleArray) or None, animation curves or samples created by PlugBaker
     """
 
     if not min_time or not max_time:
         min_time, max_time = get_active_frame_range()
 
+    if not use_bake_results:
+        plugs = list()
+        for node in python.force_list(nodes):
+            node_attributes = attributes or maya.cmds.listAttr(node, keyable=True, scalar=True) or list()
+            plugs.extend(['{}.{}'.format(node, attr) for attr in node_attributes])
+        baker = PlugBaker(plugs, start_frame=min_time, end_frame=max_time)
+        result = baker.bake(dry_run=dry_run)
+        LOGGER.debug('Bake stats: {}'.format(baker.stats))
+        return result
+
     maya.cmds.bakeResults(
         nodes, simulation=True, t=(min_time, max_time), sampleBy=1, oversamplingRate=1, disableImplicitControl=True,
         preserveOutsideKeys=True, sparseAnimCurveBake=True, removeBakedAttributeFromLayer=False, shape=False,
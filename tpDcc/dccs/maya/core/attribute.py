@@ -21,7 +21,8 @@ import maya.api.OpenMaya
 
 from tpDcc import dcc
 from tpDcc.libs.python import python, decorators, mathlib, name as name_utils
-from tpDcc.dccs.maya.core import exceptions, node as node_utils, shape as shape_utils
+from tpDcc.dccs.maya.api import plugs as api_plugs, modifier as api_modifier
+from tpDcc.dccs.maya.core import exceptions, callback, node as node_utils, shape as shape_utils
 from tpDcc.dccs.maya.core import name as maya_name_utils
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
@@ -2046,39 +2047,332 @@ class TransferConnections(object):
             new_attr.connect_in(out_attr)
 
 
+class GraphBuilder(object):
+    """
+    Context that queues node creations, connections and attribute value changes and commits all of them through
+    a single MDagModifier, so the whole graph is created with one DG update and registered as one undo chunk.
+    Unique names are resolved when the builder is committed and scene caches are suspended while big graphs are
+    committed
+    with GraphBuilder() as builder:
+        mult = builder.create_node('multiplyDivide', name='multiplyDivide_test', unique_name=True)
+        builder.set_value((mult, 'input2X'), 0.5)
+        builder.connect('pCube1.translateX', (mult, 'input1X'))
+        builder.connect_plus((mult, 'outputX'), 'pCube2.translateX')
+    """
+
+    # Number of created nodes from which scene caches are suspended while committing
+    SUSPEND_CACHES_NODES = 100
+
+    def __init__(self, undoable=True):
+        super(GraphBuilder, self).__init__()
+
+        self._undoable = undoable
+        self._mod = maya.api.OpenMaya.MDagModifier()
+        self._created = list()
+        self._dag_types = dict()
+        self._unique_names = list()
+        self._inputs = dict()
+        self._plus_inputs = dict()
+        self._pending = 0
+        self._pending_nodes = 0
+        self._stats = {'nodes': 0, 'renames': 0, 'connections': 0, 'disconnections': 0, 'values': 0, 'commits': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+
+    @property
+    def stats(self):
+        """
+        Returns the number of operations batched by this builder, grouped by operation type
+        :return: dict
+        """
+
+        return dict(self._stats)
+
+    @property
+    def created_nodes(self):
+        """
+        Returns all the nodes created by this builder
+        :return: list(MObject)
+        """
+
+        return list(self._created)
+
+    def create_node(self, node_type, name=None, parent=None, unique_name=False):
+        """
+        Queues the creation of a new node
+        :param node_type: str, Maya node type to create
+        :param name: str or None, name of the new node
+        :param parent: str or MObject or None, parent of the new node (only used by DAG nodes)
+        :param unique_name: bool, Whether to make the name unique when the builder is committed. Names of other
+            nodes queued in the same builder are taken into account
+        :return: MObject, queued node. Its plugs can be used with connect and set_value before committing
+        """
+
+        if self._is_dag_type(node_type):
+            if parent is not None and python.is_string(parent):
+                parent = node_utils.get_mobject(parent)
+            mobj = self._mod.createNode(node_type, parent or maya.api.OpenMaya.MObject.kNullObj)
+        else:
+            mobj = maya.api.OpenMaya.MDGModifier.createNode(self._mod, node_type)
+        self._stats['nodes'] += 1
+        self._pending += 1
+        self._pending_nodes += 1
+        self._created.append(mobj)
+        if name and unique_name:
+            self._unique_names.append((mobj, name))
+        elif name:
+            self.rename_node(mobj, name)
+
+        return mobj
+
+    def rename_node(self, node, new_name):
+        """
+        Queues the rename of the given node
+        :param node: str or MObject
+        :param new_name: str
+        """
+
+        if python.is_string(node):
+            node = node_utils.get_mobject(node)
+        self._mod.renameNode(node, new_name)
+        self._stats['renames'] += 1
+        self._pending += 1
+
+    def connect(self, source, target, force=True):
+        """
+        Queues a connection between the given attributes
+        :param source: str or MPlug or tuple(str or MObject, str), source attribute
+        :param target: str or MPlug or tuple(str or MObject, str), target attribute
+        :param force: bool, Whether or not to break current target incoming connection
+        """
+
+        api_plugs.connect_plugs(self.get_plug(source), self.get_plug(target), mod=self._mod, force=force, apply=False)
+        self._stats['connections'] += 1
+        self._pending += 1
+
+    def connect_plus(self, source, target_attr):
+        """
+        Queues a connection from source into target attribute. If the target attribute already has an input
+        connection, both inputs are added through a plusMinusAverage node, as connect_plus does
+        :param source: str or MPlug or tuple(str or MObject, str), source attribute
+        :param target_attr: str, node.attribute name of the target attribute
+        """
+
+        plus_data = self._plus_inputs.get(target_attr)
+        if plus_data is None:
+            input_attr = self._inputs.get(target_attr) or get_attribute_input(target_attr)
+            if not input_attr:
+                self.connect(source, target_attr)
+                self._inputs[target_attr] = source
+                return
+            plus = input_attr.split('.')[0] if python.is_string(input_attr) else None
+            if plus and maya.cmds.nodeType(plus) == 'plusMinusAverage' and maya.cmds.getAttr(
+                    '{}.operation'.format(plus)) == 1:
+                plus_data = [plus, get_available_slot('{}.input1D'.format(plus))]
+            else:
+                plus = self.create_node(
+                    'plusMinusAverage', name='plusMinusAverage_{}'.format(target_attr.replace('.', '_')),
+                    unique_name=True)
+                self.connect(input_attr, (plus, 'input1D[0]'))
+                self.connect((plus, 'output1D'), target_attr)
+                plus_data = [plus, 1]
+            self._plus_inputs[target_attr] = plus_data
+
+        self.connect(source, (plus_data[0], 'input1D[{}]'.format(plus_data[1])))
+        plus_data[1] += 1
+
+    def disconnect(self, source, target):
+        """
+        Queues the disconnection of the given attributes
+        :param source: str or MPlug or tuple(str or MObject, str), source attribute
+        :param target: str or MPlug or tuple(str or MObject, str), target attribute
+        """
+
+        self._mod.disconnect(self.get_plug(source), self.get_plug(target))
+        self._stats['disconnections'] += 1
+        self._pending += 1
+
+    def set_value(self, attr, value):
+        """
+        Queues a new value for the given attribute
+        :param attr: str or MPlug or tuple(str or MObject, str), attribute to set value of
+        :param value: variant
+        """
+
+        api_plugs.set_plug_value(self.get_plug(attr), value, mod=self._mod, apply=False)
+        self._stats['values'] += 1
+        self._pending += 1
+
+    def commit(self):
+        """
+        Applies all queued operations in one go. Builder can be used again after committing
+        :return: dict, stats of the builder
+        """
+
+        if not self._pending:
+            return self.stats
+
+        self._rename_unique_nodes()
+        if self._pending_nodes >= self.SUSPEND_CACHES_NODES:
+            with callback.suspended_scene_caches():
+                api_modifier.apply_modifier(self._mod, undoable=self._undoable)
+        else:
+            api_modifier.apply_modifier(self._mod, undoable=self._undoable)
+        self._stats['commits'] += 1
+        LOGGER.debug('GraphBuilder committed {} operations: {}'.format(self._pending, self._stats))
+        self._mod = maya.api.OpenMaya.MDagModifier()
+        self._inputs = dict()
+        self._plus_inputs = dict()
+        self._pending = 0
+        self._pending_nodes = 0
+
+        return self.stats
+
+    def get_plug(self, attr):
+        """
+        Returns MPlug of the given attribute
+        :param attr: str or MPlug or tuple(str or MObject, str), node.attribute name, plug or a (node, attribute) pair.
+            Attribute names can contain a logical index (worldMatrix[0])
+        :return: MPlug
+        """
+
+        if isinstance(attr, maya.api.OpenMaya.MPlug):
+            return attr
+        if python.is_string(attr):
+            return api_plugs.as_mplug(attr)
+
+        node, attr_name = attr
+        if python.is_string(node):
+            node = node_utils.get_mobject(node)
+        index = None
+        if attr_name.endswith(']'):
+            attr_name, index = attr_name[:-1].split('[')
+        plug = maya.api.OpenMaya.MFnDependencyNode(node).findPlug(attr_name, False)
+        if index is not None:
+            plug = plug.elementByLogicalIndex(int(index))
+
+        return plug
+
+    def _rename_unique_nodes(self):
+        """
+        Internal function that queues the renames of the nodes created with unique names
+        """
+
+        reserved_names = set()
+        for mobj, name in self._unique_names:
+            if name in reserved_names or maya.cmds.objExists(name):
+                name = maya_name_utils.FindUniqueName(name, reserved_names=reserved_names).get()
+            reserved_names.add(name)
+            self.rename_node(mobj, name)
+        self._unique_names = list()
+
+    def _is_dag_type(self, node_type):
+        """
+        Internal function that returns whether or not given node type is a DAG node type
+        :param node_type: str
+        :return: bool
+        """
+
+        if node_type not in self._dag_types:
+            inherited = maya.cmds.nodeType(node_type, isTypeName=True, inherited=True) or list()
+            self._dag_types[node_type] = 'dagNode' in inherited
+
+        return self._dag_types[node_type]
+
+
 class MayaNode(object):
     """
     Class for managing specific Maya node related attributes
+    If a GraphBuilder is given, node creation, attribute values and input connections are queued into it and
+    applied when the builder is committed
     """
 
-    def __init__(self, name=None):
+    def __init__(self, name=None, builder=None):
         self._node = None
+        self._builder = builder
         self._create_node(name)
 
     @property
     def node(self):
+        if self._node is not None and not python.is_string(self._node):
+            return maya.api.OpenMaya.MFnDependencyNode(self._node).name()
         return self._node
 
     @decorators.abstractmethod
     def _create_node(self, name):
         raise NotImplementedError('_create_node function in MayaNode not implemented!')
 
+    def _create(self, node_type, name):
+        """
+        Internal function that creates a new node of the given type, using the builder if available
+        :param node_type: str
+        :param name: str
+        :return: str or MObject
+        """
+
+        if self._builder:
+            return self._builder.create_node(node_type, name=name, unique_name=True)
+
+        return maya.cmds.createNode(node_type, name=dcc.find_unique_name(name))
+
+    def _set_attribute(self, attribute_name, value):
+        """
+        Internal function that sets the value of the given node attribute, using the builder if available
+        :param attribute_name: str
+        :param value: variant
+        """
+
+        if self._builder:
+            self._builder.set_value((self._node, attribute_name), value)
+        else:
+            maya.cmds.setAttr('{}.{}'.format(self._node, attribute_name), value)
+
+    def _connect_in(self, attribute, attribute_name):
+        """
+        Internal function that connects given attribute into the given node attribute, using the builder if available
+        :param attribute: str, full attribute name (node.attribute) to connect in
+        :param attribute_name: str
+        """
+
+        if self._builder:
+            self._builder.connect(attribute, (self._node, attribute_name))
+        else:
+            maya.cmds.connectAttr(attribute, '{}.{}'.format(self._node, attribute_name))
+
+    def _connect_out(self, attribute_name, attribute):
+        """
+        Internal function that connects out from the given node attribute into given attribute, adding the current
+        input of the attribute if any (see connect_plus), using the builder if available
+        :param attribute_name: str
+        :param attribute: str, full attribute name (node.attribute) to connect out into
+        """
+
+        if self._builder:
+            self._builder.connect_plus((self._node, attribute_name), attribute)
+        else:
+            connect_plus('{}.{}'.format(self._node, attribute_name), attribute)
+
 
 class MultiplyDivideNode(MayaNode, object):
     """
     Class for dealing witg multiply divide nodes
     """
 
-    def __init__(self, name=None):
+    def __init__(self, name=None, builder=None):
         if not name.startswith('multiplyDivide'):
-            name = dcc.find_unique_name('multiplyDivide_{}'.format(name))
-        super(MultiplyDivideNode, self).__init__(name)
+            name = 'multiplyDivide_{}'.format(name)
+        super(MultiplyDivideNode, self).__init__(name, builder=builder)
 
     def _create_node(self, name):
-        self._node = maya.cmds.createNode('multiplyDivide', name=name)
-        maya.cmds.setAttr('{}.input2X'.format(self._node), 1)
-        maya.cmds.setAttr('{}.input2Y'.format(self._node), 1)
-        maya.cmds.setAttr('{}.input2Z'.format(self._node), 1)
+        self._node = self._create('multiplyDivide', name)
+        self._set_attribute('input2X', 1)
+        self._set_attribute('input2Y', 1)
+        self._set_attribute('input2Z', 1)
 
     def set_operation(self, value):
         """
@@ -2090,7 +2384,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param value: int, operation index
         """
 
-        maya.cmds.setAttr('{}.operation'.format(self._node), value)
+        self._set_attribute('operation', value)
 
     def set_input1(self, value_x=None, value_y=None, value_z=None):
         """
@@ -2101,11 +2395,11 @@ class MultiplyDivideNode(MayaNode, object):
         """
 
         if value_x is not None:
-            maya.cmds.setAttr('{}.input1X'.format(self._node), value_x)
+            self._set_attribute('input1X', value_x)
         if value_y is not None:
-            maya.cmds.setAttr('{}.input1Y'.format(self._node), value_y)
+            self._set_attribute('input1Y', value_y)
         if value_z is not None:
-            maya.cmds.setAttr('{}.input1Z'.format(self._node), value_z)
+            self._set_attribute('input1Z', value_z)
 
     def set_input2(self, value_x=None, value_y=None, value_z=None):
         """
@@ -2116,11 +2410,11 @@ class MultiplyDivideNode(MayaNode, object):
         """
 
         if value_x is not None:
-            maya.cmds.setAttr('{}.input2X'.format(self._node), value_x)
+            self._set_attribute('input2X', value_x)
         if value_y is not None:
-            maya.cmds.setAttr('{}.input2Y'.format(self._node), value_y)
+            self._set_attribute('input2Y', value_y)
         if value_z is not None:
-            maya.cmds.setAttr('{}.input2Z'.format(self._node), value_z)
+            self._set_attribute('input2Z', value_z)
 
     def input1X_in(self, attribute):
         """
@@ -2128,7 +2422,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect in
         """
 
-        maya.cmds.connectAttr(attribute, '{}.input1X'.format(self._node))
+        self._connect_in(attribute, 'input1X')
 
     def input1Y_in(self, attribute):
         """
@@ -2136,7 +2430,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect in
         """
 
-        maya.cmds.connectAttr(attribute, '{}.input1Y'.format(self._node))
+        self._connect_in(attribute, 'input1Y')
 
     def input1Z_in(self, attribute):
         """
@@ -2144,7 +2438,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect in
         """
 
-        maya.cmds.connectAttr(attribute, '{}.input1Z'.format(self._node))
+        self._connect_in(attribute, 'input1Z')
 
     def input2X_in(self, attribute):
         """
@@ -2152,7 +2446,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect in
         """
 
-        maya.cmds.connectAttr(attribute, '{}.input2X'.format(self._node))
+        self._connect_in(attribute, 'input2X')
 
     def input2Y_in(self, attribute):
         """
@@ -2160,7 +2454,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect in
         """
 
-        maya.cmds.connectAttr(attribute, '{}.input2Y'.format(self._node))
+        self._connect_in(attribute, 'input2Y')
 
     def input2Z_in(self, attribute):
         """
@@ -2168,7 +2462,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect in
         """
 
-        maya.cmds.connectAttr(attribute, '{}.input2Z'.format(self._node))
+        self._connect_in(attribute, 'input2Z')
 
     def outputX_out(self, attribute):
         """
@@ -2176,7 +2470,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect out into
         """
 
-        connect_plus('{}.outputX'.format(self._node), attribute)
+        self._connect_out('outputX', attribute)
 
     def outputY_out(self, attribute):
         """
@@ -2184,7 +2478,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect out into
         """
 
-        connect_plus('{}.outputY'.format(self._node), attribute)
+        self._connect_out('outputY', attribute)
 
     def outputZ_out(self, attribute):
         """
@@ -2192,7 +2486,7 @@ class MultiplyDivideNode(MayaNode, object):
         :param attribute: str, full attribute name (node.attribute) to connect out into
         """
 
-        connect_plus('{}.outputZ'.format(self._node), attribute)
+        self._connect_out('outputZ', attribute)
 
 
 def check_attribute(attr):
@@ -3946,43 +4240,12 @@ def set_color(nodes, color, color_transform=False, short_range=False):
         LOGGER.warning('Current Maya version "{}" does not support RGB colors'.format(maya_version))
         return
 
-    if color_transform:
-        for node in nodes:
-            if maya.cmds.attributeQuery('overrideEnabled', node=node, exists=True):
-                maya.cmds.setAttr(node + '.overrideEnabled', True)
-                if not use_rgb_color:
-                    if maya.cmds.attributeQuery('overrideRGBColors', node=node, exists=True):
-                        maya.cmds.setAttr(node + '.overrideRGBColors', False)
-                    if maya.cmds.attributeQuery('overrideColor', node=node, exists=True):
-                        maya.cmds.setAttr(node + '.overrideColor', color)
-                else:
-                    if maya.cmds.attributeQuery('overrideRGBColors', node=node, exists=True):
-                        maya.cmds.setAttr(node + '.overrideRGBColors', True)
-                        if maya.cmds.attributeQuery('overrideColorRGB', node=node, exists=True):
-                            maya.cmds.setAttr(node + '.overrideColorRGB',
-                                              color.red() / 255.0, color.green() / 255.0, color.blue() / 255.0)
+    if use_rgb_color:
+        node_utils.set_nodes_override_color(
+            nodes, rgb_color=(color.red() / 255.0, color.green() / 255.0, color.blue() / 255.0),
+            color_shapes=not color_transform)
     else:
-        for node in nodes:
-            shapes = list()
-            if maya.cmds.nodeType(node) == 'transform':
-                shapes = maya.cmds.listRelatives(node, type='shape')
-            elif maya.cmds.objectType(node, isAType='shape'):
-                shapes = [node]
-            if len(shapes) > 0:
-                for shape in shapes:
-                    if maya.cmds.attributeQuery('overrideEnabled', node=shape, exists=True):
-                        maya.cmds.setAttr(shape + '.overrideEnabled', True)
-                        if not use_rgb_color:
-                            if maya.cmds.attributeQuery('overrideRGBColors', node=shape, exists=True):
-                                maya.cmds.setAttr(shape + '.overrideRGBColors', False)
-                            if maya.cmds.attributeQuery('overrideColor', node=shape, exists=True):
-                                maya.cmds.setAttr(shape + '.overrideColor', color)
-                        else:
-                            if maya.cmds.attributeQuery('overrideRGBColors', node=shape, exists=True):
-                                maya.cmds.setAttr(shape + '.overrideRGBColors', True)
-                                if maya.cmds.attributeQuery('overrideColorRGB', node=shape, exists=True):
-                                    maya.cmds.setAttr(shape + '.overrideColorRGB',
-                                                      color.red() / 255.0, color.green() / 255.0, color.blue() / 255.0)
+        node_utils.set_nodes_override_color(nodes, color_index=color, color_shapes=not color_transform)
 
 
 def get_attribute_values(node, keyable_only=True):
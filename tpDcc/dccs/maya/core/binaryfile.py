@@ -0,0 +1,158 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the binary container shared by the skin weights and the blendshape targets file formats
+
+File layout:
+    - magic (8 bytes) and header size (uint32)
+    - JSON header with the format version and one entry per chunk with its offset and size
+    - zlib compressed chunks, each one of them with little endian arrays stored one after another
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import json
+import zlib
+import array
+import struct
+
+_HEADER_SIZE = struct.Struct('<I')
+
+
+def compress_arrays(arrays):
+    """
+    Compresses the given arrays into a single chunk
+    :param arrays: list(array.array)
+    :return: bytes
+    """
+
+    data = list()
+    for values in arrays:
+        if sys.byteorder != 'little':
+            values = array.array(values.typecode, values)
+            values.byteswap()
+        data.append(_to_bytes(values))
+
+    return zlib.compress(b''.join(data))
+
+
+def decompress_arrays(chunk, layout):
+    """
+    Decompresses the arrays stored in the given chunk
+    :param chunk: bytes, compressed chunk
+    :param layout: list(tuple(str, int)), type code and number of items of each array stored in the chunk
+    :return: list(array.array)
+    """
+
+    data = zlib.decompress(chunk)
+    offset = 0
+    arrays = list()
+    for typecode, count in layout:
+        values = array.array(typecode)
+        size = values.itemsize * count
+        _from_bytes(values, data[offset:offset + size])
+        if sys.byteorder != 'little':
+            values.byteswap()
+        arrays.append(values)
+        offset += size
+
+    return arrays
+
+
+def write_file(file_path, magic, header, entries, chunks):
+    """
+    Writes the given header and chunks into a binary file
+    :param file_path: str, path of the file to write
+    :param magic: bytes, magic of the file format
+    :param header: dict, file header. It must contain the given entries
+    :param entries: list(dict), header entry of each chunk. Offset and size of the chunk are stored in it
+    :param chunks: list(bytes), compressed chunks
+    :return: dict, written file header
+    """
+
+    offset = 0
+    for entry, chunk in zip(entries, chunks):
+        entry['offset'] = offset
+        entry['size'] = len(chunk)
+        offset += len(chunk)
+    header_data = json.dumps(header, sort_keys=True).encode('utf-8')
+
+    with open(file_path, 'wb') as fh:
+        fh.write(magic)
+        fh.write(_HEADER_SIZE.pack(len(header_data)))
+        fh.write(header_data)
+        for chunk in chunks:
+            fh.write(chunk)
+
+    return header
+
+
+def read_file_header(file_path, magic, version, file_type):
+    """
+    Returns the header of the given binary file without reading any chunk
+    :param file_path: str
+    :param magic: bytes, magic of the file format
+    :param version: int, latest supported version of the file format
+    :param file_type: str, name of the file format used in error messages
+    :return: dict
+    """
+
+    with open(file_path, 'rb') as fh:
+        return _read_header(fh, magic, version, file_type)[0]
+
+
+def read_file(file_path, magic, version, file_type, entries_key, names=None):
+    """
+    Reads the header and the chunks of the given binary file
+    :param file_path: str
+    :param magic: bytes, magic of the file format
+    :param version: int, latest supported version of the file format
+    :param file_type: str, name of the file format used in error messages
+    :param entries_key: str, header key that contains the chunk entries
+    :param names: list(str) or None, names of the entries to read. If None, all entries are read
+    :return: tuple(dict, list(tuple(dict, bytes))), header and compressed chunk of each read entry
+    """
+
+    entries = list()
+    with open(file_path, 'rb') as fh:
+        header, data_start = _read_header(fh, magic, version, file_type)
+        for entry in header[entries_key]:
+            if names is not None and entry['name'] not in names:
+                continue
+            fh.seek(data_start + entry['offset'])
+            entries.append((entry, fh.read(entry['size'])))
+
+    return header, entries
+
+
+def _read_header(fh, magic, version, file_type):
+    """
+    Internal function that reads the header of an opened binary file
+    :param fh: file
+    :param magic: bytes
+    :param version: int
+    :param file_type: str
+    :return: tuple(dict, int), header and position of the first chunk in the file
+    """
+
+    if fh.read(len(magic)) != magic:
+        raise ValueError('File "{}" is not a valid {} file!'.format(fh.name, file_type))
+    header_size = _HEADER_SIZE.unpack(fh.read(_HEADER_SIZE.size))[0]
+    header = json.loads(fh.read(header_size).decode('utf-8'))
+    if header.get('version', 0) > version:
+        raise ValueError('{} file version {} is not supported!'.format(file_type.capitalize(), header.get('version')))
+
+    return header, len(magic) + _HEADER_SIZE.size + header_size
+
+
+def _to_bytes(values):
+    return values.tobytes() if hasattr(values, 'tobytes') else values.tostring()
+
+
+def _from_bytes(values, data):
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
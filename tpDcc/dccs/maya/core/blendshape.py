@@ -9,15 +9,25 @@ from __future__ import print_function, division, absolute_import
 
 import string
 import logging
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python 2 has no read only mapping type, cached dictionaries are returned directly
+    MappingProxyType = dict
 
 import maya.cmds
+import maya.api.OpenMaya
+import maya.api.OpenMayaAnim
 
 from tpDcc.libs.python import python, name as core_name
+from tpDcc.dccs.maya.api import plugs as api_plugs, modifier as api_modifier
 from tpDcc.dccs.maya.core import exceptions, deformer, shape, component, name as name_utils, attribute as attr_utils
-from tpDcc.dccs.maya.core import geometry as geo_utils
+from tpDcc.dccs.maya.core import geometry as geo_utils, blendshapefile
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
+_ALIAS_CACHE = dict()
+
 
 class BlendShapeOrigin(object):
     Local = 'local'
@@ -437,15 +447,10 @@ def get_target_index(blend_shape, target):
     """
 
     check_blendshape(blend_shape)
-    if not maya.cmds.objExists(blend_shape + '.' + target):
+    target_index = get_alias_maps(blend_shape)[0].get(target)
+    if target_index is None:
         raise Exception('BlendShape "{}" has no target "{}"!'.format(blend_shape, target))
 
-    alias_list = maya.cmds.aliasAttr(blend_shape, query=True)
-    alias_index = alias_list.index(target)
-    alias_attr = alias_list[alias_index + 1]
-
-    target_index = int(alias_attr.split('[')[-1].split(']')[0])
-
     return target_index
 
 
@@ -723,17 +728,14 @@ def get_target_weights(blend_shape, target, geometry=''):
     if geometry and not maya.cmds.objExists(geometry):
         raise Exception('Object "{}" does not exists!'.format(geometry))
 
-    alias_list = maya.cmds.aliasAttr(blend_shape, query=True)
-    alias_target = alias_list[(alias_list.index(target) + 1)]
-    target_index = int(alias_target.split('[')[-1].split(']')[0])
+    target_index = get_target_index(blend_shape, target)
 
     geo_index = 0
     if geometry:
         geo_index = deformer.get_geo_index(geometry, blend_shape)
 
-    wt = maya.cmds.getAttr(blend_shape + '.it[' + str(geo_index) + '].itg[' + str(target_index) + '].tw')[0]
-
-    return list(wt)
+    return _get_target_group_weights(
+        _get_target_group_plug(blend_shape, target_index, geo_index), _get_vertex_count(blend_shape, geo_index))
 
 
 def set_target_weights(blend_shape, target, wt, geometry=''):
@@ -749,23 +751,18 @@ def set_target_weights(blend_shape, target, wt, geometry=''):
     if not maya.cmds.objExists(blend_shape + '.' + target):
         raise Exception('BlendShape "{}" has no "{}" target attribute!'.format(blend_shape, target))
 
-    geometry = geometry or get_base_geo(blend_shape)
     if geometry and not maya.cmds.objExists(geometry):
         raise Exception('Object "{}" does not exists!'.format(geometry))
 
-    alias_list = maya.cmds.aliasAttr(blend_shape, query=True)
-    alias_target = alias_list[(alias_list.index(target) + 1)]
-    target_index = int(alias_target.split('[')[-1].split(']')[0])
+    target_index = get_target_index(blend_shape, target)
 
     geo_index = 0
     if geometry:
         geo_index = deformer.get_geo_index(geometry, blend_shape)
 
-    comp_count = component.get_component_count(geometry)
-
-    maya.cmds.setAttr(
-        blend_shape + '.it[' + str(geo_index) + '].itg[' + str(target_index) + '].tw[0:' + str(comp_count - 1) + ']',
-        *wt)
+    mod = maya.api.OpenMaya.MDGModifier()
+    _set_target_group_weights(_get_target_group_plug(blend_shape, target_index, geo_index), wt, mod)
+    api_modifier.apply_modifier(mod)
 
 
 def connect_to_target(blend_shape, target_geo, target_name, base_geo, weight=1.0, force=False):
@@ -892,45 +889,23 @@ def remove_unconnected_targets(blend_shape, base):
 def map_blend_target_alias_to_index(blendshape_node):
     """
     Returns the aliases for blendshape weight targets and the index of the target
+    Returned mapping is cached and read only
     :param blendshape_node: str, name of the blendshape
     :return: dict(str, index), dict[alias] = target index
     """
 
-    alias_map = dict()
-
-    aliases = maya.cmds.aliasAttr(blendshape_node, query=True)
-    if not aliases:
-        return alias_map
-
-    for i in range(0, len(aliases), 2):
-        alias = aliases[i]
-        weight = aliases[i + 1]
-        target_index = core_name.get_end_number(weight)
-        alias_map[alias] = target_index
-
-    return alias_map
+    return get_alias_maps(blendshape_node)[0]
 
 
 def map_blend_to_target_alias(blendshape_node):
     """
     Returns a map between the target index and its alias name on the given blendshape
+    Returned mapping is cached and read only
     :param blendshape_node: str, name of the blendshape
     :return: dict(int, str), dict[target_index] = weight alias
     """
 
-    alias_map = dict()
-
-    aliases = maya.cmds.aliasAttr(blendshape_node, query=True)
-    if not aliases:
-        return alias_map
-
-    for i in range(0, len(aliases), 2):
-        alias = aliases[i]
-        weight = aliases[i + 1]
-        target_index = core_name.get_end_number(weight)
-        alias_map[target_index] = alias
-
-    return alias_map
+    return get_alias_maps(blendshape_node)[1]
 
 
 def get_index_at_alias(alias, blendshape_node):
@@ -941,11 +916,351 @@ def get_index_at_alias(alias, blendshape_node):
     :return: int, corresponding target index to the alias
     """
 
-    map_dict = map_blend_target_alias_to_index(blendshape_node)
-    if not map_dict:
+    alias_map = get_alias_maps(blendshape_node)[0]
+    if not alias_map:
+        return
+
+    return alias_map.get(alias, None)
+
+
+def get_alias_maps(blendshape_node):
+    """
+    Returns the weight alias to target index map and the target index to weight alias map of the given blendshape
+    Maps are cached per blendshape node and they are rebuilt only after an attribute of the node is renamed, added
+    or removed or after a weight element is added or removed. Returned mappings are read only
+    :param blendshape_node: str, name of the blendshape
+    :return: tuple(dict(str, int), dict(int, str))
+    """
+
+    selection_list = maya.api.OpenMaya.MSelectionList()
+    selection_list.add(blendshape_node)
+    mobj = selection_list.getDependNode(0)
+    handle = maya.api.OpenMaya.MObjectHandle(mobj)
+    key = handle.hashCode()
+
+    entry = _ALIAS_CACHE.get(key)
+    if entry and not (entry['handle'].isValid() and entry['handle'].object() == mobj):
+        _remove_alias_cache_entry(key)
+        entry = None
+    if not entry:
+        entry = {'handle': handle, 'maps': None, 'callbacks': [
+            maya.api.OpenMaya.MNodeMessage.addAttributeChangedCallback(mobj, _on_alias_attribute_changed, key),
+            maya.api.OpenMaya.MNodeMessage.addNodePreRemovalCallback(mobj, _on_alias_node_removed, key)]}
+        _ALIAS_CACHE[key] = entry
+
+    if entry['maps'] is None:
+        alias_to_index = dict()
+        index_to_alias = dict()
+        aliases = maya.cmds.aliasAttr(blendshape_node, query=True) or list()
+        for i in range(0, len(aliases), 2):
+            alias = aliases[i]
+            target_index = core_name.get_end_number(aliases[i + 1])
+            alias_to_index[alias] = target_index
+            index_to_alias[target_index] = alias
+        entry['maps'] = (MappingProxyType(alias_to_index), MappingProxyType(index_to_alias))
+
+    return entry['maps']
+
+
+def clear_alias_cache():
+    """
+    Removes all cached blendshape alias maps and their callbacks
+    """
+
+    for key in list(_ALIAS_CACHE.keys()):
+        _remove_alias_cache_entry(key)
+
+
+def _remove_alias_cache_entry(key):
+    """
+    Internal function that removes the cached alias maps stored with the given key and their callbacks
+    :param key: int
+    """
+
+    entry = _ALIAS_CACHE.pop(key, None)
+    if not entry:
+        return
+    for callback_id in entry['callbacks']:
+        try:
+            maya.api.OpenMaya.MMessage.removeCallback(callback_id)
+        except RuntimeError:
+            pass
+
+
+def _on_alias_attribute_changed(msg, plug, other_plug, key):
+    """
+    Internal callback function called when an attribute of a cached blendshape changes
+    Cached alias maps are invalidated when an attribute is renamed, added or removed or when a weight element is
+    added or removed. Elements added by other array attributes (such as targetWeights when weights are painted or
+    imported) are ignored
+    """
+
+    node_message = maya.api.OpenMaya.MNodeMessage
+    if msg & (node_message.kAttributeArrayAdded | node_message.kAttributeArrayRemoved):
+        if maya.api.OpenMaya.MFnAttribute(plug.attribute()).name != 'weight':
+            return
+    elif not msg & (node_message.kAttributeRenamed | node_message.kAttributeAdded | node_message.kAttributeRemoved):
         return
 
-    return map_dict.get(alias, None)
+    entry = _ALIAS_CACHE.get(key)
+    if entry:
+        entry['maps'] = None
+
+
+def _on_alias_node_removed(node, key):
+    """
+    Internal callback function called when a cached blendshape is deleted
+    """
+
+    _remove_alias_cache_entry(key)
+
+
+def get_targets_data(blend_shape, targets=None, geometry='', weights=True, deltas=True):
+    """
+    Returns the per vertex weights and the sparse deltas of the given blendshape targets
+    Data is read directly from blendshape input target plugs
+    :param blend_shape: str, name of the blendshape to get targets data of
+    :param targets: list(str) or None, targets to get data of. If None, all targets are used
+    :param geometry: str, name of blendshape driven geometry to get data from
+    :param weights: bool, Whether to read targets per vertex weights
+    :param deltas: bool, Whether to read targets deltas
+    :return: list(dict), data of each target (see blendshapefile.encode_target)
+    """
+
+    check_blendshape(blend_shape)
+
+    geo_index = deformer.get_geo_index(geometry, blend_shape) if geometry else 0
+    vertex_count = _get_vertex_count(blend_shape, geo_index)
+    alias_map = get_alias_maps(blend_shape)[0]
+    targets = python.force_list(targets) if targets else get_target_list(blend_shape)
+
+    targets_data = list()
+    for target in targets:
+        if target not in alias_map:
+            raise exceptions.BlendShapeTargetException(blend_shape, target)
+        target_index = alias_map[target]
+        group_plug = _get_target_group_plug(blend_shape, target_index, geo_index)
+        target_data = {'name': target, 'index': target_index, 'weights': None, 'items': list()}
+        if weights:
+            target_data['weights'] = _get_target_group_weights(group_plug, vertex_count)
+        if deltas:
+            items_plug = _get_child_plug(group_plug, 'inputTargetItem')
+            for item_index in items_plug.getExistingArrayAttributeIndices():
+                item_plug = items_plug.elementByLogicalIndex(item_index)
+                indices, item_deltas = _get_target_item_deltas(item_plug)
+                target_data['items'].append({'item': item_index, 'indices': indices, 'deltas': item_deltas})
+        targets_data.append(target_data)
+
+    return targets_data
+
+
+def set_targets_data(blend_shape, targets_data, geometry='', create_missing=True):
+    """
+    Sets the per vertex weights and the sparse deltas of the given blendshape targets in one modifier pass
+    :param blend_shape: str, name of the blendshape to set targets data of
+    :param targets_data: list(dict), data of each target (see blendshapefile.encode_target)
+    :param geometry: str, name of blendshape driven geometry to set data on
+    :param create_missing: bool, Whether to create empty targets for targets that do not exist in the blendshape
+    :return: list(str), targets whose data was set
+    """
+
+    check_blendshape(blend_shape)
+
+    geo_index = deformer.get_geo_index(geometry, blend_shape) if geometry else 0
+    alias_map = get_alias_maps(blend_shape)[0]
+    for target_data in targets_data:
+        if target_data['name'] in alias_map:
+            continue
+        if not create_missing:
+            LOGGER.warning('BlendShape "{}" has no target "{}"!'.format(blend_shape, target_data['name']))
+            continue
+        add_empty_target(blend_shape, target_alias=target_data['name'])
+        alias_map = get_alias_maps(blend_shape)[0]
+
+    vertex_count = None
+    updated_targets = list()
+    mod = maya.api.OpenMaya.MDGModifier()
+    for target_data in targets_data:
+        target_index = alias_map.get(target_data['name'])
+        if target_index is None:
+            continue
+        group_plug = _get_target_group_plug(blend_shape, target_index, geo_index)
+        if target_data.get('default_weights') and vertex_count is None:
+            vertex_count = _get_vertex_count(blend_shape, geo_index)
+        weights = blendshapefile.get_target_weights(target_data, vertex_count)
+        if weights:
+            _set_target_group_weights(group_plug, weights, mod)
+        items_plug = _get_child_plug(group_plug, 'inputTargetItem')
+        for item_data in target_data.get('items', list()):
+            _set_target_item_deltas(
+                items_plug.elementByLogicalIndex(item_data['item']), item_data['indices'], item_data['deltas'], mod)
+        updated_targets.append(target_data['name'])
+    api_modifier.apply_modifier(mod)
+
+    return updated_targets
+
+
+def export_targets_data(blend_shape, file_path, targets=None, geometry=''):
+    """
+    Exports the per vertex weights and the sparse deltas of the given blendshape targets into a file
+    :param blend_shape: str, name of the blendshape to export targets data of
+    :param file_path: str, path of the blendshape targets file
+    :param targets: list(str) or None, targets to export. If None, all targets are exported
+    :param geometry: str, name of blendshape driven geometry to export data of
+    :return: list(str), exported targets
+    """
+
+    targets_data = get_targets_data(blend_shape, targets=targets, geometry=geometry)
+    geo_index = deformer.get_geo_index(geometry, blend_shape) if geometry else 0
+    blendshapefile.write_blendshape_file(
+        file_path, targets_data, vertex_count=_get_vertex_count(blend_shape, geo_index))
+
+    return [target_data['name'] for target_data in targets_data]
+
+
+def import_targets_data(blend_shape, file_path, targets=None, geometry='', create_missing=True):
+    """
+    Imports the per vertex weights and the sparse deltas stored in the given blendshape targets file
+    :param blend_shape: str, name of the blendshape to import targets data into
+    :param file_path: str, path of the blendshape targets file
+    :param targets: list(str) or None, targets to import. If None, all stored targets are imported
+    :param geometry: str, name of blendshape driven geometry to import data into
+    :param create_missing: bool, Whether to create empty targets for targets that do not exist in the blendshape
+    :return: list(str), imported targets
+    """
+
+    geo_index = deformer.get_geo_index(geometry, blend_shape) if geometry else 0
+    vertex_count = blendshapefile.read_blendshape_header(file_path).get('vertex_count')
+    if vertex_count and vertex_count != _get_vertex_count(blend_shape, geo_index):
+        LOGGER.warning('BlendShape "{}" geometry vertex count does not match stored vertex count ({})!'.format(
+            blend_shape, vertex_count))
+        return list()
+
+    targets_data = blendshapefile.read_blendshape_file(
+        file_path, targets=python.force_list(targets) if targets else None)
+
+    return set_targets_data(blend_shape, targets_data, geometry=geometry, create_missing=create_missing)
+
+
+def _get_child_plug(plug, attribute_name):
+    """
+    Internal function that returns the child plug of the given compound plug with the given attribute name
+    :param plug: MPlug
+    :param attribute_name: str
+    :return: MPlug
+    """
+
+    return plug.child(maya.api.OpenMaya.MFnDependencyNode(plug.node()).attribute(attribute_name))
+
+
+def _get_target_group_plug(blend_shape, target_index, geo_index=0):
+    """
+    Internal function that returns the input target group plug of the given target
+    :param blend_shape: str
+    :param target_index: int
+    :param geo_index: int
+    :return: MPlug
+    """
+
+    input_target_plug = api_plugs.as_mplug('{}.inputTarget'.format(blend_shape)).elementByLogicalIndex(geo_index)
+
+    return _get_child_plug(input_target_plug, 'inputTargetGroup').elementByLogicalIndex(target_index)
+
+
+def _get_vertex_count(blend_shape, geo_index=0):
+    """
+    Internal function that returns the number of components of the blendshape geometry at the given index
+    :param blend_shape: str
+    :param geo_index: int
+    :return: int
+    """
+
+    deformer_fn = maya.api.OpenMayaAnim.MFnGeometryFilter(api_plugs.as_mplug(
+        '{}.envelope'.format(blend_shape)).node())
+    shape_path = maya.api.OpenMaya.MDagPath.getAPathTo(deformer_fn.outputShapeAtIndex(geo_index))
+
+    return maya.api.OpenMaya.MItGeometry(shape_path).exactCount()
+
+
+def _get_target_group_weights(group_plug, vertex_count):
+    """
+    Internal function that returns the per vertex weights stored in the given input target group plug
+    :param group_plug: MPlug
+    :param vertex_count: int
+    :return: list(float)
+    """
+
+    weights_plug = _get_child_plug(group_plug, 'targetWeights')
+    weights = [1.0] * vertex_count
+    for index in weights_plug.getExistingArrayAttributeIndices():
+        if index < vertex_count:
+            weights[index] = weights_plug.elementByLogicalIndex(index).asDouble()
+
+    return weights
+
+
+def _set_target_group_weights(group_plug, weights, mod):
+    """
+    Internal function that queues the per vertex weights of the given input target group plug into given modifier
+    :param group_plug: MPlug
+    :param weights: list(float)
+    :param mod: MDGModifier
+    """
+
+    weights_plug = _get_child_plug(group_plug, 'targetWeights')
+    for index, weight in enumerate(weights):
+        mod.newPlugValueDouble(weights_plug.elementByLogicalIndex(index), weight)
+
+
+def _get_target_item_deltas(item_plug):
+    """
+    Internal function that returns the modified vertices and their deltas stored in the given input target item plug
+    :param item_plug: MPlug
+    :return: tuple(list(int), list(tuple(float, float, float)))
+    """
+
+    indices = list()
+    deltas = list()
+    try:
+        points = maya.api.OpenMaya.MFnPointArrayData(
+            _get_child_plug(item_plug, 'inputPointsTarget').asMObject()).array()
+        components_data = maya.api.OpenMaya.MFnComponentListData(
+            _get_child_plug(item_plug, 'inputComponentsTarget').asMObject())
+    except RuntimeError:
+        # Target item without stored deltas (for example, a target driven by a live geometry)
+        return indices, deltas
+
+    for i in range(components_data.length()):
+        indices.extend(maya.api.OpenMaya.MFnSingleIndexedComponent(components_data.get(i)).getElements())
+    deltas = [(point.x, point.y, point.z) for point in points]
+
+    return indices[:len(deltas)], deltas
+
+
+def _set_target_item_deltas(item_plug, indices, deltas, mod):
+    """
+    Internal function that queues the given modified vertices and deltas of the given input target item plug into
+    given modifier
+    :param item_plug: MPlug
+    :param indices: list(int)
+    :param deltas: list(tuple(float, float, float))
+    :param mod: MDGModifier
+    """
+
+    component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+    components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+    component_fn.addElements(list(indices))
+    components_data_fn = maya.api.OpenMaya.MFnComponentListData()
+    components_data = components_data_fn.create()
+    components_data_fn.add(components)
+
+    # Maya stores the deltas sorted by vertex index
+    sorted_deltas = [delta for _, delta in sorted(zip(indices, deltas))]
+    points_data = maya.api.OpenMaya.MFnPointArrayData().create(
+        maya.api.OpenMaya.MPointArray([maya.api.OpenMaya.MPoint(*delta[:3]) for delta in sorted_deltas]))
+
+    mod.newPlugValue(_get_child_plug(item_plug, 'inputComponentsTarget'), components_data)
+    mod.newPlugValue(_get_child_plug(item_plug, 'inputPointsTarget'), points_data)
 
 
 def is_mesh_blendshape_compatible(base, target):
@@ -0,0 +1,163 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the codec of the blendshape targets file format
+Blendshape targets files can be dumped as JSON to compare them:
+    python -m tpDcc.dccs.maya.core.blendshapefile targets.bsd > targets.json
+
+Files use the binary container of binaryfile module:
+    - JSON header: format version, number of vertices of the base geometry and, for each target, its name, index,
+    its input target items and the position of its data chunk in the file
+    - one chunk per target with its per vertex weights (omitted and flagged as default weights in the
+    header if all of them are 1.0) and, for each input target item, the indices of the modified vertices and their
+    deltas
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import json
+import array
+
+from tpDcc.dccs.maya.core import binaryfile
+
+MAGIC = b'TPBSHPD\x00'
+VERSION = 1
+
+
+def encode_target(target_data):
+    """
+    Encodes the data of a blendshape target into a compressed chunk
+    :param target_data: dict, target data with the following keys:
+        name (str), index (int), weights (list(float) or None, per vertex target weights),
+        default_weights (bool, optional, whether all target weights are 1.0) and
+        items (list(dict), one per input target item with keys: item (int, 6000 based weight of the item),
+        indices (list(int), modified vertices) and deltas (list(tuple(float, float, float)), vertex deltas))
+    :return: tuple(dict, bytes), target header entry and compressed chunk
+    """
+
+    weights = target_data.get('weights')
+    default_weights = target_data.get('default_weights', False)
+    if weights and all(weight == 1.0 for weight in weights):
+        weights = None
+        default_weights = True
+    arrays = [array.array('f', weights or list())]
+
+    items = list()
+    for item_data in target_data.get('items', list()):
+        indices = array.array('I', item_data['indices'])
+        deltas = array.array('f', [value for delta in item_data['deltas'] for value in delta[:3]])
+        arrays.extend([indices, deltas])
+        items.append({'item': item_data['item'], 'count': len(indices)})
+
+    chunk = binaryfile.compress_arrays(arrays)
+
+    entry = {
+        'name': target_data['name'],
+        'index': target_data['index'],
+        'weights_count': len(weights) if weights else 0,
+        'items': items
+    }
+    if default_weights:
+        entry['default_weights'] = True
+
+    return entry, chunk
+
+
+def decode_target(entry, chunk):
+    """
+    Decodes the data of a blendshape target from its header entry and its compressed chunk
+    :param entry: dict, target header entry
+    :param chunk: bytes, compressed chunk
+    :return: dict, target data (see encode_target)
+    """
+
+    layout = [('f', entry['weights_count'])]
+    for item in entry['items']:
+        layout.extend([('I', item['count']), ('f', item['count'] * 3)])
+    arrays = binaryfile.decompress_arrays(chunk, layout)
+
+    weights = arrays[0]
+    items = list()
+    for i, item in enumerate(entry['items']):
+        indices, deltas = arrays[1 + i * 2:3 + i * 2]
+        items.append({
+            'item': item['item'],
+            'indices': list(indices),
+            'deltas': [(deltas[i], deltas[i + 1], deltas[i + 2]) for i in range(0, len(deltas), 3)]
+        })
+
+    target_data = {
+        'name': entry['name'],
+        'index': entry['index'],
+        'weights': list(weights) if entry['weights_count'] else None,
+        'items': items
+    }
+    if entry.get('default_weights'):
+        target_data['default_weights'] = True
+
+    return target_data
+
+
+def get_target_weights(target_data, vertex_count):
+    """
+    Returns the per vertex weights that must be set for the given target data
+    :param target_data: dict, target data (see encode_target). Targets flagged with default_weights get all their
+        weights set to 1.0
+    :param vertex_count: int, number of vertices of the blendshape base geometry
+    :return: list(float) or None, None if the target data has no weights to set
+    """
+
+    if target_data.get('weights'):
+        return target_data['weights']
+    if target_data.get('default_weights'):
+        return [1.0] * vertex_count
+
+    return None
+
+
+def write_blendshape_file(file_path, targets_data, vertex_count=0):
+    """
+    Writes the given blendshape targets data into a blendshape targets file
+    :param file_path: str, path of the file to write
+    :param targets_data: list(dict), data of each target (see encode_target)
+    :param vertex_count: int, number of vertices of the blendshape base geometry
+    :return: dict, written file header
+    """
+
+    encoded = [encode_target(target_data) for target_data in targets_data]
+    entries = [entry for entry, _ in encoded]
+    header = {'version': VERSION, 'vertex_count': vertex_count, 'targets': entries}
+
+    return binaryfile.write_file(file_path, MAGIC, header, entries, [chunk for _, chunk in encoded])
+
+
+def read_blendshape_header(file_path):
+    """
+    Returns the header of the given blendshape targets file without decoding any target
+    :param file_path: str
+    :return: dict
+    """
+
+    return binaryfile.read_file_header(file_path, MAGIC, VERSION, 'blendshape targets')
+
+
+def read_blendshape_file(file_path, targets=None):
+    """
+    Reads the blendshape targets data stored in the given blendshape targets file
+    :param file_path: str, path of the file to read
+    :param targets: list(str) or None, names of the targets to read. If None, all targets are read
+    :return: list(dict), data of each target (see encode_target)
+    """
+
+    entries = binaryfile.read_file(file_path, MAGIC, VERSION, 'blendshape targets', 'targets', names=targets)[1]
+
+    return [decode_target(entry, chunk) for entry, chunk in entries]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print('Usage: python -m tpDcc.dccs.maya.core.blendshapefile <blendshape targets file>')
+        sys.exit(1)
+    print(json.dumps(read_blendshape_file(sys.argv[1]), indent=2, sort_keys=True))
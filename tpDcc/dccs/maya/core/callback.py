@@ -7,11 +7,36 @@ Utility module that contains classes and functions to work with Maya callbacks
 
 from __future__ import print_function, division, absolute_import
 
+import contextlib
+
 import maya.cmds
 import maya.api.OpenMaya
 
 from tpDcc.abstract import callback
 
+# Messages sent before and after the scene, or a big part of it, is replaced
+SCENE_CHANGED_MESSAGES = (
+    maya.api.OpenMaya.MSceneMessage.kBeforeImport,
+    maya.api.OpenMaya.MSceneMessage.kAfterImport,
+    maya.api.OpenMaya.MSceneMessage.kBeforeCreateReference,
+    maya.api.OpenMaya.MSceneMessage.kAfterCreateReference,
+    maya.api.OpenMaya.MSceneMessage.kBeforeRemoveReference,
+    maya.api.OpenMaya.MSceneMessage.kAfterRemoveReference,
+    maya.api.OpenMaya.MSceneMessage.kBeforeLoadReference,
+    maya.api.OpenMaya.MSceneMessage.kAfterLoadReference,
+    maya.api.OpenMaya.MSceneMessage.kBeforeUnloadReference,
+    maya.api.OpenMaya.MSceneMessage.kAfterUnloadReference,
+    maya.api.OpenMaya.MSceneMessage.kBeforeImportReference,
+    maya.api.OpenMaya.MSceneMessage.kAfterImportReference,
+    maya.api.OpenMaya.MSceneMessage.kAfterNew,
+    maya.api.OpenMaya.MSceneMessage.kAfterOpen
+)
+
+# Messages sent before the current scene is closed
+SCENE_CLOSED_MESSAGES = (maya.api.OpenMaya.MSceneMessage.kBeforeNew, maya.api.OpenMaya.MSceneMessage.kBeforeOpen)
+
+_SCENE_CACHES = list()
+
 
 class MayaCallback(object):
 
@@ -174,3 +199,193 @@ class MayaCallback(object):
         def unregister(cls, token):
             if token:
                 maya.api.OpenMaya.MSceneMessage.removeCallback(token)
+
+
+class SceneCache(object):
+    """
+    Data of the current scene cached until the scene changes
+    The cached value is built lazily. Callbacks that keep it updated are installed when the value is built and removed
+    when the scene is closed or the cache is cleared, so no callback runs while the cache is not used. Callback
+    handlers are only called while a value is cached and they receive that value as first argument; callbacks without
+    handler invalidate the cached value
+    """
+
+    def __init__(self, build_fn):
+        """
+        :param build_fn: callable, function that returns the value to cache
+        """
+
+        self._build_fn = build_fn
+        self._value = None
+        self._callbacks = list()
+        self._callback_ids = list()
+        self._suspended = False
+        _SCENE_CACHES.append(self)
+
+    @property
+    def value(self):
+        """
+        Returns the cached value without building it
+        :return: object or None
+        """
+
+        return self._value
+
+    def get(self, refresh=False):
+        """
+        Returns the cached value building it if necessary
+        :param refresh: bool, Whether to force the rebuild of the value
+        :return: object
+        """
+
+        if refresh or self._value is None:
+            self._value = self._build_fn()
+        if not self._callback_ids and not self._suspended:
+            self._install_callbacks()
+
+        return self._value
+
+    def invalidate(self):
+        """
+        Invalidates the cached value. It will be built again the next time it is requested
+        """
+
+        self._value = None
+
+    def clear(self):
+        """
+        Invalidates the cached value and removes its callbacks
+        """
+
+        self._value = None
+        self._remove_callbacks()
+
+    def suspend(self):
+        """
+        Removes the callbacks of the cache and invalidates its value until resume is called
+        """
+
+        self._suspended = True
+        self.clear()
+
+    def resume(self):
+        """
+        Resumes a suspended cache. Its value is built again the next time it is requested
+        """
+
+        self._suspended = False
+        self._value = None
+
+    def add_scene_callback(self, messages=SCENE_CHANGED_MESSAGES, handler=None):
+        """
+        Adds a callback called when the given scene messages are sent
+        :param messages: list(int), MSceneMessage messages
+        :param handler: callable or None
+        """
+
+        def _register(fn):
+            return [maya.api.OpenMaya.MSceneMessage.addCallback(message, fn) for message in messages]
+
+        self._callbacks.append((_register, handler))
+
+    def add_node_added_callback(self, handler=None, node_type='dependNode'):
+        """
+        Adds a callback called when a node of the given type is created
+        :param handler: callable or None
+        :param node_type: str, node type to filter by
+        """
+
+        self._callbacks.append((lambda fn: maya.api.OpenMaya.MDGMessage.addNodeAddedCallback(fn, node_type), handler))
+
+    def add_node_removed_callback(self, handler=None, node_type='dependNode'):
+        """
+        Adds a callback called when a node of the given type is deleted
+        :param handler: callable or None
+        :param node_type: str, node type to filter by
+        """
+
+        self._callbacks.append(
+            (lambda fn: maya.api.OpenMaya.MDGMessage.addNodeRemovedCallback(fn, node_type), handler))
+
+    def add_name_changed_callback(self, handler=None):
+        """
+        Adds a callback called when any node is renamed
+        :param handler: callable or None
+        """
+
+        self._callbacks.append((lambda fn: maya.api.OpenMaya.MNodeMessage.addNameChangedCallback(
+            maya.api.OpenMaya.MObject.kNullObj, fn), handler))
+
+    def add_dag_changed_callback(self, handler=None):
+        """
+        Adds a callback called when any DAG node is parented, unparented, reordered or instanced
+        :param handler: callable or None
+        """
+
+        self._callbacks.append((maya.api.OpenMaya.MDagMessage.addAllDagChangesCallback, handler))
+
+    def _install_callbacks(self):
+        """
+        Internal function that registers all the callbacks of the cache
+        """
+
+        callback_ids = [
+            maya.api.OpenMaya.MSceneMessage.addCallback(message, self._on_scene_closed)
+            for message in SCENE_CLOSED_MESSAGES]
+        for register_fn, handler in self._callbacks:
+            callback_id = register_fn(self._get_callback_fn(handler))
+            callback_ids.extend(callback_id if isinstance(callback_id, list) else [callback_id])
+        self._callback_ids = callback_ids
+
+    def _remove_callbacks(self):
+        """
+        Internal function that removes all the registered callbacks of the cache
+        """
+
+        for callback_id in self._callback_ids:
+            try:
+                maya.api.OpenMaya.MMessage.removeCallback(callback_id)
+            except RuntimeError:
+                pass
+        self._callback_ids = list()
+
+    def _get_callback_fn(self, handler):
+        """
+        Internal function that returns the function registered for the given handler
+        :param handler: callable or None
+        :return: callable
+        """
+
+        def _callback_fn(*args):
+            if self._value is None:
+                return
+            if handler is None:
+                self._value = None
+            else:
+                handler(self._value, *args)
+
+        return _callback_fn
+
+    def _on_scene_closed(self, *args):
+        """
+        Internal callback function called before the current scene is closed
+        """
+
+        self.clear()
+
+
+@contextlib.contextmanager
+def suspended_scene_caches():
+    """
+    Context manager that suspends all scene caches, so bulk scene edits do not run their callbacks. Caches are
+    built again the next time they are requested
+    """
+
+    caches = [cache for cache in _SCENE_CACHES if not cache._suspended]
+    for cache in caches:
+        cache.suspend()
+    try:
+        yield
+    finally:
+        for cache in caches:
+            cache.resume()
@@ -10,6 +10,7 @@ from __future__ import print_function, division, absolute_import
 import contextlib
 
 import maya.cmds
+import maya.api.OpenMaya
 
 
 @contextlib.contextmanager
@@ -23,3 +24,31 @@ def maya_no_undo():
         yield
     finally:
         maya.cmds.undoInfo(stateWithoutFlush=True)
+
+
+@contextlib.contextmanager
+def dg_context(time=None):
+    """
+    Makes the DG evaluate plugs at the given time during the context without changing the current scene time
+    :param time: float or None, frame (in current UI time units) to evaluate. If None, current time is used
+    """
+
+    if time is None:
+        yield maya.api.OpenMaya.MDGContext.kNormal
+        return
+
+    context = maya.api.OpenMaya.MDGContext(maya.api.OpenMaya.MTime(time, maya.api.OpenMaya.MTime.uiUnit()))
+    if hasattr(context, 'makeCurrent'):
+        previous_context = context.makeCurrent()
+        try:
+            yield context
+        finally:
+            previous_context.makeCurrent()
+    else:
+        # old Maya versions cannot make a context current, so time is changed without updating the scene
+        current_time = maya.cmds.currentTime(query=True)
+        maya.cmds.currentTime(time, update=False)
+        try:
+            yield context
+        finally:
+            maya.cmds.currentTime(current_time, update=False)
@@ -0,0 +1,272 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to resolve file dependencies of Maya scenes into a dependency manifest
+Dependencies can be collected from an open scene (see scene.scan_scene_dependencies) or from Maya ASCII files (see
+parser.extract_ascii_dependencies). File paths can contain UDIM, UV tile and frame tokens in their file name:
+    <UDIM>, <UVTILE>, <u>, <v>, <f>, #### and %04d
+Files are checked through a pool of worker threads, so existence and size checks on network storage run in
+parallel, and directory listings and file stats are cached in a FileStatCache
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import re
+import threading
+from multiprocessing.pool import ThreadPool
+
+DEFAULT_THREADS = 16
+
+_TOKENS_REGEX = re.compile(r'(<udim>|<uvtile>|<u>|<v>|<f\d*>|#+|%0?\d*d)', re.IGNORECASE)
+_UDIM_REGEX = re.compile(r'(?<!\d)1\d{3}(?!\d)')
+_UV_TILE_REGEX = re.compile(r'u-?\d+_v-?\d+')
+_FRAME_REGEX = re.compile(r'-?\d+(?=\D*$)')
+
+
+class FileStatCache(object):
+    """
+    Thread safe cache of file stats and directory listings
+    """
+
+    def __init__(self):
+        self._stats = dict()
+        self._listings = dict()
+        self._lock = threading.Lock()
+
+    def stat(self, file_path):
+        """
+        Returns the stat data of the given file
+        :param file_path: str
+        :return: dict, with exists (bool), size (int or None) and mtime (float or None) keys
+        """
+
+        with self._lock:
+            file_stat = self._stats.get(file_path)
+        if file_stat is not None:
+            return file_stat
+
+        try:
+            os_stat = os.stat(file_path)
+            file_stat = {'exists': True, 'size': os_stat.st_size, 'mtime': os_stat.st_mtime}
+        except (OSError, IOError):
+            file_stat = {'exists': False, 'size': None, 'mtime': None}
+        with self._lock:
+            self._stats[file_path] = file_stat
+
+        return file_stat
+
+    def list_directory(self, directory):
+        """
+        Returns the names of the files in the given directory
+        :param directory: str
+        :return: list(str), empty if the directory does not exist
+        """
+
+        with self._lock:
+            file_names = self._listings.get(directory)
+        if file_names is not None:
+            return file_names
+
+        try:
+            file_names = sorted(os.listdir(directory or os.curdir))
+        except (OSError, IOError):
+            file_names = list()
+        with self._lock:
+            self._listings[directory] = file_names
+
+        return file_names
+
+    def clear(self):
+        """
+        Clears all cached stats and directory listings
+        """
+
+        with self._lock:
+            self._stats = dict()
+            self._listings = dict()
+
+
+def has_file_tokens(file_path):
+    """
+    Returns whether or not the file name of the given path contains UDIM, UV tile or frame tokens
+    :param file_path: str
+    :return: bool
+    """
+
+    return bool(_TOKENS_REGEX.search(os.path.basename(file_path)))
+
+
+def get_file_pattern_regex(file_name):
+    """
+    Returns a regular expression that matches the file names of the given file name pattern
+    :param file_name: str, file name with UDIM, UV tile or frame tokens
+    :return: re.Pattern
+    """
+
+    regex = list()
+    for i, part in enumerate(_TOKENS_REGEX.split(file_name)):
+        if not i % 2:
+            regex.append(re.escape(part))
+            continue
+        token = part.lower()
+        if token == '<udim>':
+            regex.append(r'\d{4}')
+        elif token == '<uvtile>':
+            regex.append(r'u-?\d+_v-?\d+')
+        elif token.startswith('#'):
+            regex.append(r'-?\d{{{},}}'.format(len(token)))
+        elif token.startswith('%'):
+            padding = token[1:-1].lstrip('0')
+            regex.append(r'-?\d{{{},}}'.format(padding) if padding else r'-?\d+')
+        else:
+            regex.append(r'-?\d+')
+
+    return re.compile('^{}$'.format(''.join(regex)))
+
+
+def expand_file_pattern(file_path, stat_cache=None):
+    """
+    Returns the files that match the given file path pattern
+    :param file_path: str, file path that can contain UDIM, UV tile or frame tokens in its file name
+    :param stat_cache: FileStatCache or None, cache used to list the directory of the file
+    :return: list(str), matching files sorted by name. If the path has no tokens, the path itself is returned
+    """
+
+    if not has_file_tokens(file_path):
+        return [file_path]
+
+    stat_cache = stat_cache or FileStatCache()
+    directory, file_name = os.path.split(file_path)
+    pattern_regex = get_file_pattern_regex(file_name)
+
+    return [os.path.join(directory, name) for name in stat_cache.list_directory(directory) if pattern_regex.match(name)]
+
+
+def get_file_texture_pattern(file_path, uv_tiling_mode=0, use_frame_extension=False):
+    """
+    Returns the file name pattern of a file texture from its file path and its tiling and frame extension settings
+    :param file_path: str, file path of one of the tiles or frames of the texture
+    :param uv_tiling_mode: int, UV tiling mode of the file texture (0: off, 1: ZBrush, 2: Mudbox, 3: Mari, 4: explicit)
+    :param use_frame_extension: bool, Whether the file texture is a frame sequence or not
+    :return: str
+    """
+
+    directory, file_name = os.path.split(file_path)
+    if has_file_tokens(file_name):
+        return file_path
+
+    if uv_tiling_mode in (1, 2):
+        file_name = _replace_last(_UV_TILE_REGEX, file_name, '<UVTILE>')
+    elif uv_tiling_mode == 3:
+        file_name = _replace_last(_UDIM_REGEX, file_name, '<UDIM>')
+    if use_frame_extension:
+        file_name = _replace_last(_FRAME_REGEX, file_name, '<f>')
+
+    return os.path.join(directory, file_name) if directory else file_name
+
+
+def resolve_file_path(file_path, root_directory=None):
+    """
+    Resolves environment variables, user home and relative paths of the given file path
+    :param file_path: str
+    :param root_directory: str or None, directory relative paths are resolved from
+    :return: str
+    """
+
+    file_path = os.path.expanduser(os.path.expandvars(file_path))
+    if root_directory and not os.path.isabs(file_path):
+        file_path = os.path.join(root_directory, file_path)
+
+    return os.path.normpath(file_path)
+
+
+def build_dependency_manifest(dependencies, root_directory=None, check_files=True, stat_cache=None, threads=None):
+    """
+    Builds a dependency manifest from the given dependencies
+    :param dependencies: list(dict), dependencies with at least the following keys:
+        type (str, dependency type, such as texture or reference) and
+        path (str, file path that can contain UDIM, UV tile or frame tokens).
+        Other keys (such as node or attribute) are kept in the manifest entries
+    :param root_directory: str or None, directory relative paths are resolved from
+    :param check_files: bool, Whether to expand file patterns and check files or not
+    :param stat_cache: FileStatCache or None, cache of file stats and directory listings
+    :param threads: int or None, number of worker threads used to check the files. If None, DEFAULT_THREADS is used
+    :return: dict, manifest with the following keys:
+        dependencies (list(dict), input dependencies with resolved_path (str), files (list(str)) and
+            missing (bool or None) keys),
+        files (dict(str, dict), stat data of each checked file, see FileStatCache.stat),
+        missing (list(str), resolved paths of the dependencies with missing files) and
+        total_size (int, total size in bytes of the existing files)
+    """
+
+    stat_cache = stat_cache or FileStatCache()
+    entries = list()
+    for dependency in dependencies:
+        entry = dict(dependency)
+        entry['resolved_path'] = resolve_file_path(dependency['path'], root_directory=root_directory)
+        entries.append(entry)
+    manifest = {'dependencies': entries, 'files': dict(), 'missing': list(), 'total_size': 0}
+    if not check_files:
+        for entry in entries:
+            entry['files'] = [entry['resolved_path']]
+            entry['missing'] = None
+        return manifest
+
+    directories = set(
+        os.path.dirname(entry['resolved_path']) for entry in entries if has_file_tokens(entry['resolved_path']))
+    _map(stat_cache.list_directory, directories, threads)
+    for entry in entries:
+        entry['files'] = expand_file_pattern(entry['resolved_path'], stat_cache=stat_cache)
+
+    file_paths = sorted(set(file_path for entry in entries for file_path in entry['files']))
+    manifest['files'] = dict(zip(file_paths, _map(stat_cache.stat, file_paths, threads)))
+    missing = set()
+    for entry in entries:
+        entry['missing'] = not entry['files'] or not all(
+            manifest['files'][file_path]['exists'] for file_path in entry['files'])
+        if entry['missing']:
+            missing.add(entry['resolved_path'])
+    manifest['missing'] = sorted(missing)
+    manifest['total_size'] = sum(file_stat['size'] for file_stat in manifest['files'].values() if file_stat['exists'])
+
+    return manifest
+
+
+def _replace_last(regex, file_name, token):
+    """
+    Internal function that replaces the last match of the given regular expression in the given file name
+    :param regex: re.Pattern
+    :param file_name: str
+    :param token: str
+    :return: str
+    """
+
+    matches = list(regex.finditer(file_name))
+    if not matches:
+        return file_name
+
+    return '{}{}{}'.format(file_name[:matches[-1].start()], token, file_name[matches[-1].end():])
+
+
+def _map(fn, items, threads=None):
+    """
+    Internal function that applies the given function to all items using worker threads
+    File system calls release the GIL so checks of different files run in parallel
+    :param fn: callable
+    :param items: list
+    :param threads: int or None
+    :return: list
+    """
+
+    items = list(items)
+    if len(items) < 2 or threads == 1:
+        return [fn(item) for item in items]
+
+    pool = ThreadPool(min(threads or DEFAULT_THREADS, len(items)))
+    try:
+        return pool.map(fn, items)
+    finally:
+        pool.close()
+        pool.join()
@@ -11,8 +11,10 @@ import logging
 from collections import OrderedDict
 
 import maya.cmds
+import maya.api.OpenMaya
 
 from tpDcc.libs.python import python
+from tpDcc.dccs.maya.core import callback, hierarchy
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
@@ -73,6 +75,239 @@ PROTECTED_NODES = [
 ]
 
 
+class NodeTypeIndex(object):
+    """
+    Index of the nodes of the current scene grouped by node type
+    The index is built in a single pass over the scene nodes and it is updated incrementally when nodes are added or
+    removed. Node types inheritance is resolved once per node type and transforms grouped by the type of their shapes
+    are cached until the DAG changes. Names of DAG nodes are resolved through the DAG hierarchy snapshot
+    """
+
+    def __init__(self):
+        self._nodes = dict()
+        self._types = dict()
+        self._dag_nodes = set()
+        self._default_nodes = set()
+        self._names = dict()
+        self._inherited_types = dict()
+        self._matching_types = dict()
+        self._shape_transforms = dict()
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Rebuilds the full index traversing all the nodes of the scene
+        """
+
+        self._nodes = dict()
+        self._types = dict()
+        self._dag_nodes = set()
+        self._default_nodes = set()
+        self._names = dict()
+        self._matching_types = dict()
+        self._shape_transforms = dict()
+        node_it = maya.api.OpenMaya.MItDependencyNodes()
+        while not node_it.isDone():
+            self.add_node(node_it.thisNode())
+            node_it.next()
+
+    def add_node(self, mobj):
+        """
+        Adds the given node to the index
+        :param mobj: MObject
+        """
+
+        handle = maya.api.OpenMaya.MObjectHandle(mobj)
+        hash_code = handle.hashCode()
+        node_fn = maya.api.OpenMaya.MFnDependencyNode(mobj)
+        type_name = node_fn.typeName
+        if type_name not in self._types:
+            self._types[type_name] = set()
+            self._matching_types = dict()
+        self._types[type_name].add(hash_code)
+        self._nodes[hash_code] = (handle, type_name)
+        if node_fn.isDefaultNode:
+            self._default_nodes.add(hash_code)
+        if mobj.hasFn(maya.api.OpenMaya.MFn.kDagNode):
+            self._dag_nodes.add(hash_code)
+            self._shape_transforms = dict()
+
+    def remove_node(self, mobj):
+        """
+        Removes the given node from the index
+        :param mobj: MObject
+        """
+
+        hash_code = maya.api.OpenMaya.MObjectHandle(mobj).hashCode()
+        node_data = self._nodes.pop(hash_code, None)
+        if not node_data:
+            return
+        self._types[node_data[1]].discard(hash_code)
+        self._default_nodes.discard(hash_code)
+        self._names.pop(hash_code, None)
+        if hash_code in self._dag_nodes:
+            self._dag_nodes.discard(hash_code)
+            self._shape_transforms = dict()
+
+    def clear_name(self, mobj):
+        """
+        Clears the cached name of the given node
+        :param mobj: MObject
+        """
+
+        self._names.pop(maya.api.OpenMaya.MObjectHandle(mobj).hashCode(), None)
+
+    def clear_shape_transforms(self):
+        """
+        Clears the cached transforms grouped by shape type
+        """
+
+        self._shape_transforms = dict()
+
+    def nodes(self, node_types=None, dag=False, exclude_defaults=False):
+        """
+        Returns the long names of the nodes of the given types
+        :param node_types: str or list(str) or None, node types (inherited types are taken into account).
+            If not given, all nodes are returned
+        :param dag: bool, Whether to return only DAG nodes or not
+        :param exclude_defaults: bool, Whether to exclude Maya default nodes or not
+        :return: list(str)
+        """
+
+        if node_types is None:
+            hash_codes = set(self._nodes)
+        else:
+            hash_codes = set()
+            for node_type in python.force_list(node_types):
+                for type_name in self._get_matching_types(node_type):
+                    hash_codes.update(self._types[type_name])
+        if dag:
+            hash_codes &= self._dag_nodes
+        if exclude_defaults:
+            hash_codes -= self._default_nodes
+
+        return self._get_names(hash_codes)
+
+    def filter_nodes(self, nodes, node_types, dag=False):
+        """
+        Returns the given nodes that are of the given types
+        Only the given nodes are looked up in the index, so the cost does not depend on the number of scene nodes
+        :param nodes: list(str), node names
+        :param node_types: str or list(str), node types (inherited types are taken into account)
+        :param dag: bool, Whether to return only DAG nodes or not
+        :return: list(str)
+        """
+
+        type_names = set()
+        for node_type in python.force_list(node_types):
+            type_names.update(self._get_matching_types(node_type))
+
+        filtered_nodes = list()
+        selection_list = maya.api.OpenMaya.MSelectionList()
+        for node in nodes:
+            selection_list.clear()
+            try:
+                selection_list.add(node)
+            except RuntimeError:
+                continue
+            hash_code = maya.api.OpenMaya.MObjectHandle(selection_list.getDependNode(0)).hashCode()
+            node_data = self._nodes.get(hash_code)
+            if not node_data or node_data[1] not in type_names or (dag and hash_code not in self._dag_nodes):
+                continue
+            filtered_nodes.append(node)
+
+        return filtered_nodes
+
+    def shape_transforms(self, shape_type):
+        """
+        Returns the full paths of the transforms that have shapes of the given type
+        :param shape_type: str, shape node type (inherited types are taken into account)
+        :return: dict(str, list(str)), transform full path with its shapes full paths
+        """
+
+        if shape_type in self._shape_transforms:
+            return self._shape_transforms[shape_type]
+
+        dag_snapshot = hierarchy.get_dag_snapshot()
+        transforms = dict()
+        for type_name in self._get_matching_types(shape_type):
+            for hash_code in self._types[type_name]:
+                handle = self._nodes[hash_code][0]
+                if not handle.isValid() or not handle.object().hasFn(maya.api.OpenMaya.MFn.kShape):
+                    continue
+                for shape_path in dag_snapshot.node_paths(handle):
+                    transforms.setdefault(shape_path.rpartition('|')[0], list()).append(shape_path)
+        self._shape_transforms[shape_type] = transforms
+
+        return transforms
+
+    def _get_matching_types(self, node_type):
+        """
+        Internal function that returns the indexed node types that are or inherit from the given node type
+        :param node_type: str
+        :return: list(str)
+        """
+
+        if node_type in self._matching_types:
+            return self._matching_types[node_type]
+
+        matching_types = list()
+        for type_name in self._types:
+            inherited_types = self._inherited_types.get(type_name)
+            if inherited_types is None:
+                inherited_types = maya.cmds.nodeType(type_name, isTypeName=True, inherited=True) or [type_name]
+                self._inherited_types[type_name] = inherited_types
+            if node_type in inherited_types:
+                matching_types.append(type_name)
+        self._matching_types[node_type] = matching_types
+
+        return matching_types
+
+    def _get_names(self, hash_codes):
+        """
+        Internal function that returns the long names of the given indexed nodes
+        :param hash_codes: set(int)
+        :return: list(str)
+        """
+
+        dag_snapshot = hierarchy.get_dag_snapshot() if hash_codes & self._dag_nodes else None
+        names = list()
+        for hash_code in hash_codes:
+            handle = self._nodes[hash_code][0]
+            if not handle.isValid():
+                continue
+            if hash_code in self._dag_nodes:
+                dag_paths = dag_snapshot.node_paths(handle)
+                names.extend(dag_paths or [maya.api.OpenMaya.MFnDagNode(handle.object()).fullPathName()])
+            else:
+                name = self._names.get(hash_code)
+                if name is None:
+                    name = self._names[hash_code] = maya.api.OpenMaya.MFnDependencyNode(handle.object()).name()
+                names.append(name)
+
+        return names
+
+
+def get_node_type_index(refresh=False):
+    """
+    Returns the node type index of the current scene
+    The index is built once, it is updated when nodes are added or removed and it is rebuilt after a new scene is
+    opened or imported and after a reference is created, removed, loaded or unloaded
+    :param refresh: bool, Whether to force the rebuild of the index
+    :return: NodeTypeIndex
+    """
+
+    return _NODE_TYPE_INDEX.get(refresh=refresh)
+
+
+def clear_node_type_index():
+    """
+    Removes the node type index of the current scene and its callbacks
+    """
+
+    _NODE_TYPE_INDEX.clear()
+
+
 def filter_all_node_types(
         selection_only=True, search_hierarchy=False, dag=False, transforms_only=False, remove_maya_defaults=True):
     """
@@ -89,18 +324,17 @@ def filter_all_node_types(
     from tpDcc.dccs.maya.core import camera
 
     if not selection_only:
-        all_objs = maya.cmds.ls(long=True, dagObjects=search_hierarchy, dag=dag)
+        all_objs = get_node_type_index().nodes(dag=dag or search_hierarchy, exclude_defaults=True)
         if not remove_maya_defaults:
-            protected = maya.cmds.ls(defaultNodes=True) + PROTECTED_NODES
-            scene_filtered = list(set(all_objs) - set(protected))
+            scene_filtered = list(set(all_objs) - set(PROTECTED_NODES))
             if not transforms_only:
                 return scene_filtered
             else:
                 return filter_transforms_from_shapes_list(scene_filtered)
 
-        default_cameras = camera.get_startup_camera_transforms() + camera.get_startup_camera_shapes()
-        maya_defaults = default_cameras + maya.cmds.ls(defaultNodes=True) + PROTECTED_NODES
-        scene_filtered = list(set(all_objs) - set(maya_defaults))
+        default_cameras = maya.cmds.ls(
+            camera.get_startup_camera_transforms() + camera.get_startup_camera_shapes(), long=True)
+        scene_filtered = list(set(all_objs) - set(default_cameras + PROTECTED_NODES))
         if not transforms_only:
             return scene_filtered
         else:
@@ -275,13 +509,12 @@ def filter_list_by_types(
 
     filter_types = python.force_list(filter_types)
 
-    filtered_objs = list()
-    if not selection_only:
-        for filter_type in filter_types:
-            filtered_objs += maya.cmds.ls(type=filter_type, long=True, dagObjects=search_hierarchy, dag=dag)
+    node_type_index = get_node_type_index()
+    if selection_only and objs_list:
+        objs_list = maya.cmds.ls(objs_list, long=True, dagObjects=search_hierarchy, dag=dag) or list()
+        filtered_objs = node_type_index.filter_nodes(objs_list, filter_types, dag=dag or search_hierarchy)
     else:
-        for filter_type in filter_types:
-            filtered_objs += maya.cmds.ls(objs_list, type=filter_type, long=True, dagObjects=search_hierarchy, dag=dag)
+        filtered_objs = node_type_index.nodes(filter_types, dag=dag or search_hierarchy)
 
     return list(set(filtered_objs))
 
@@ -300,17 +533,15 @@ def filter_transforms_with_shapes(transforms_list, children=False, shape_type='n
     transforms_shapes = list()
     full_objs_list = python.force_list(transforms_list)
     if children:
-        joints = maya.cmds.listRelatives(transforms_list, children=True, allDescendents=True, f=True, type='joint')
-        if joints:
-            full_objs_list += joints
         transforms = maya.cmds.listRelatives(
             transforms_list, children=True, allDescendents=True, f=True, type='transform')
         if transforms:
-            full_objs_list += joints
+            full_objs_list += transforms
         full_objs_list = list(set(full_objs_list))
 
-    for obj in full_objs_list:
-        shapes = maya.cmds.listRelatives(obj, shapes=True, fullPath=True, type=shape_type)
+    shape_transforms = get_node_type_index().shape_transforms(shape_type)
+    for obj, long_name in zip(full_objs_list, _get_long_names(full_objs_list)):
+        shapes = shape_transforms.get(long_name)
         if shapes:
             transforms_with_shapes_of_type.append(obj)
             transforms_shapes.extend(shapes)
@@ -344,11 +575,72 @@ def filter_nodes_with_shapes(nodes_list, shape_type='nurbsCurve'):
 
     shapes_found = list()
 
+    node_type_index = get_node_type_index()
+    shape_transforms = node_type_index.shape_transforms(shape_type)
+    shapes_of_type = set(shape for shapes in shape_transforms.values() for shape in shapes)
     nodes_list = python.force_list(nodes_list)
-    for node in nodes_list:
-        if maya.cmds.objectType(node, isType='transform') or maya.cmds.objectType(node, isType='joint'):
-            shapes_found += filter_transforms_with_shapes([node], shape_type=shape_type, return_as_shapes=True)
-        elif maya.cmds.objectType(node, isType=shape_type):
+    for node, long_name in zip(nodes_list, _get_long_names(nodes_list)):
+        if long_name in shape_transforms:
+            shapes_found += shape_transforms[long_name]
+        elif long_name in shapes_of_type:
             shapes_found.append(node)
 
     return shapes_found
+
+
+def _get_long_names(nodes_list):
+    """
+    Internal function that returns the long names of the given nodes keeping the same order and length
+    :param nodes_list: list(str)
+    :return: list(str)
+    """
+
+    if not nodes_list:
+        return list()
+
+    long_names = maya.cmds.ls(nodes_list, long=True) or list()
+    if len(long_names) != len(nodes_list):
+        long_names = [(maya.cmds.ls(node, long=True) or [node])[0] for node in nodes_list]
+
+    return long_names
+
+
+def _on_node_added(node_type_index, node, *args):
+    """
+    Internal callback function called when a node is created
+    """
+
+    node_type_index.add_node(node)
+
+
+def _on_node_removed(node_type_index, node, *args):
+    """
+    Internal callback function called when a node is deleted
+    """
+
+    node_type_index.remove_node(node)
+
+
+def _on_node_name_changed(node_type_index, node, *args):
+    """
+    Internal callback function called when a node is renamed
+    """
+
+    node_type_index.clear_name(node)
+
+
+def _on_dag_changed(node_type_index, *args):
+    """
+    Internal callback function called when a DAG node is parented, unparented or instanced
+    """
+
+    node_type_index.clear_shape_transforms()
+
+
+# The index contains nodes of all types, so node added and removed callbacks cannot be filtered by type
+_NODE_TYPE_INDEX = callback.SceneCache(NodeTypeIndex)
+_NODE_TYPE_INDEX.add_scene_callback()
+_NODE_TYPE_INDEX.add_node_added_callback(_on_node_added)
+_NODE_TYPE_INDEX.add_node_removed_callback(_on_node_removed)
+_NODE_TYPE_INDEX.add_name_changed_callback(_on_node_name_changed)
+_NODE_TYPE_INDEX.add_dag_changed_callback(_on_dag_changed)
@@ -0,0 +1,387 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a cached snapshot of the DAG hierarchy of the current scene
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import logging
+
+import maya.api.OpenMaya
+
+from tpDcc.dccs.maya.core import callback
+
+LOGGER = logging.getLogger('tpDcc-dccs-maya')
+
+
+class DagSnapshot(object):
+    """
+    Snapshot of the DAG hierarchy of the current scene
+    Each DAG path is stored once with an index into flat arrays (full path, parent index, children indices, root index
+    and depth), so parent, root and top level queries are O(1) and ancestor queries are O(depth). Instanced nodes have
+    one entry per path.
+    The snapshot is refreshed incrementally: hierarchies under modified top level nodes are marked as dirty and only
+    those hierarchies are traversed again on the next query
+    """
+
+    def __init__(self):
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Rebuilds the full snapshot traversing all the DAG hierarchy
+        """
+
+        self.__init_arrays()
+        world = maya.api.OpenMaya.MItDag().root()
+        world_fn = maya.api.OpenMaya.MFnDagNode(world)
+        for i in range(world_fn.childCount()):
+            for root_path in maya.api.OpenMaya.MDagPath.getAllPathsTo(world_fn.child(i)):
+                if root_path.length() == 1:
+                    self._add_hierarchy(root_path)
+
+    def refresh(self):
+        """
+        Applies all pending changes: dirty hierarchies are traversed again
+        If the number of removed entries is bigger than the number of alive ones, the full snapshot is rebuilt
+        """
+
+        if not self._dirty_roots and not self._pending_nodes:
+            return
+
+        handles = list(self._pending_nodes)
+        for root_index in self._dirty_roots:
+            if self._alive[root_index]:
+                handles.append(self._handles[root_index])
+                self._remove_hierarchy(root_index)
+        self._dirty_roots = set()
+        self._pending_nodes = list()
+
+        root_paths = dict()
+        for handle in handles:
+            if not handle.isValid() or not handle.object().hasFn(maya.api.OpenMaya.MFn.kDagNode):
+                continue
+            for dag_path in maya.api.OpenMaya.MDagPath.getAllPathsTo(handle.object()):
+                if dag_path.length() < 1:
+                    continue
+                while dag_path.length() > 1:
+                    dag_path.pop()
+                root_paths[dag_path.fullPathName()] = dag_path
+        for root_path_name, root_path in root_paths.items():
+            root_index = self._path_indices.get(root_path_name)
+            if root_index is not None:
+                self._remove_hierarchy(root_index)
+            self._add_hierarchy(root_path)
+
+        if self._dead_count > len(self._paths) - self._dead_count:
+            self.rebuild()
+        elif root_paths:
+            self._sort_top_level()
+
+    def mark_dirty(self, mobj):
+        """
+        Marks the hierarchies that contain the given node as dirty
+        :param mobj: MObject
+        """
+
+        handle = maya.api.OpenMaya.MObjectHandle(mobj)
+        for index in self._node_indices.get(handle.hashCode(), list()):
+            self._dirty_roots.add(self._roots[index])
+        self._pending_nodes.append(handle)
+
+    def index(self, node):
+        """
+        Returns the snapshot index of the given DAG path
+        :param node: str or MDagPath, DAG node name (full, partial or short) or path
+        :return: int or None
+        """
+
+        if isinstance(node, maya.api.OpenMaya.MDagPath):
+            return self._path_indices.get(node.fullPathName())
+
+        index = self._path_indices.get(node)
+        if index is not None:
+            return index
+
+        selection_list = maya.api.OpenMaya.MSelectionList()
+        try:
+            selection_list.add(node)
+            dag_path = selection_list.getDagPath(0)
+        except (RuntimeError, TypeError):
+            return None
+
+        return self._path_indices.get(dag_path.fullPathName())
+
+    def node_paths(self, mobj):
+        """
+        Returns the full paths of all the instances of the given DAG node
+        :param mobj: MObject or MObjectHandle
+        :return: list(str)
+        """
+
+        if not isinstance(mobj, maya.api.OpenMaya.MObjectHandle):
+            mobj = maya.api.OpenMaya.MObjectHandle(mobj)
+
+        return [self._paths[index] for index in self._node_indices.get(mobj.hashCode(), list())]
+
+    def full_path(self, index):
+        """
+        Returns the full path name stored in the given index
+        :param index: int
+        :return: str
+        """
+
+        return self._paths[index]
+
+    def parent(self, node):
+        """
+        Returns the full path of the parent of the given DAG node
+        :param node: str or MDagPath
+        :return: str or None, None if the node is located under the world
+        """
+
+        index = self._get_index(node)
+        parent_index = self._parents[index]
+
+        return self._paths[parent_index] if parent_index != -1 else None
+
+    def children(self, node, transforms_only=False):
+        """
+        Returns the full paths of the children of the given DAG node
+        :param node: str or MDagPath
+        :param transforms_only: bool, Whether to return only transform children or not
+        :return: list(str)
+        """
+
+        index = self._get_index(node)
+
+        return [self._paths[i] for i in self._children[index] if not transforms_only or self._transforms[i]]
+
+    def ancestors(self, node, transforms_only=False):
+        """
+        Returns the full paths of all the parents of the given DAG node, from the nearest one to the top level one
+        :param node: str or MDagPath
+        :param transforms_only: bool, Whether to return only transform parents or not
+        :return: list(str)
+        """
+
+        ancestors = list()
+        index = self._parents[self._get_index(node)]
+        while index != -1:
+            if not transforms_only or self._transforms[index]:
+                ancestors.append(self._paths[index])
+            index = self._parents[index]
+
+        return ancestors
+
+    def descendants(self, node, transforms_only=False):
+        """
+        Returns the full paths of all the nodes below the given DAG node in depth first order
+        Only transform nodes are traversed if transforms_only is True
+        :param node: str or MDagPath
+        :param transforms_only: bool, Whether to return only transforms or not
+        :return: list(str)
+        """
+
+        descendants = list()
+        stack = list(reversed(self._children[self._get_index(node)]))
+        while stack:
+            index = stack.pop()
+            if transforms_only and not self._transforms[index]:
+                continue
+            descendants.append(self._paths[index])
+            stack.extend(reversed(self._children[index]))
+
+        return descendants
+
+    def root(self, node):
+        """
+        Returns the full path of the top level node of the hierarchy of the given DAG node
+        :param node: str or MDagPath
+        :return: str
+        """
+
+        return self._paths[self._roots[self._get_index(node)]]
+
+    def depth(self, node):
+        """
+        Returns the number of parents of the given DAG node
+        :param node: str or MDagPath
+        :return: int
+        """
+
+        return self._depths[self._get_index(node)]
+
+    def top_level(self):
+        """
+        Returns the full paths of all the nodes located under the world
+        :return: list(str)
+        """
+
+        return [self._paths[index] for index in self._top_level]
+
+    def is_top_level(self, node):
+        """
+        Returns whether or not given DAG node is located under the world
+        :param node: str or MDagPath
+        :return: bool
+        """
+
+        return self._parents[self._get_index(node)] == -1
+
+    def _get_index(self, node):
+        """
+        Internal function that returns the snapshot index of the given DAG path and raises an exception if it does not
+        exist
+        :param node: str or MDagPath
+        :return: int
+        """
+
+        index = self.index(node)
+        if index is None:
+            raise ValueError('DAG node "{}" does not exist!'.format(node))
+
+        return index
+
+    def _add_hierarchy(self, root_path):
+        """
+        Internal function that adds the hierarchy under the given top level DAG path to the snapshot
+        :param root_path: MDagPath
+        """
+
+        dag_it = maya.api.OpenMaya.MItDag()
+        dag_it.reset(root_path, maya.api.OpenMaya.MItDag.kDepthFirst, maya.api.OpenMaya.MFn.kInvalid)
+        while not dag_it.isDone():
+            dag_path = dag_it.getPath()
+            dag_it.next()
+            full_path = dag_path.fullPathName()
+            if full_path in self._path_indices:
+                continue
+            index = len(self._paths)
+            parent_index = self._path_indices.get(full_path.rpartition('|')[0], -1)
+            mobj = dag_path.node()
+            handle = maya.api.OpenMaya.MObjectHandle(mobj)
+            self._paths.append(full_path)
+            self._parents.append(parent_index)
+            self._children.append(list())
+            self._handles.append(handle)
+            self._transforms.append(mobj.hasFn(maya.api.OpenMaya.MFn.kTransform))
+            self._alive.append(True)
+            self._path_indices[full_path] = index
+            self._node_indices.setdefault(handle.hashCode(), list()).append(index)
+            if parent_index == -1:
+                self._roots.append(index)
+                self._depths.append(0)
+                self._top_level.append(index)
+            else:
+                self._roots.append(self._roots[parent_index])
+                self._depths.append(self._depths[parent_index] + 1)
+                self._children[parent_index].append(index)
+
+    def _sort_top_level(self):
+        """
+        Internal function that sorts top level nodes following the order of the world children, so re-added
+        hierarchies keep their outliner position
+        """
+
+        world_fn = maya.api.OpenMaya.MFnDagNode(maya.api.OpenMaya.MItDag().root())
+        child_indices = dict()
+        for i in range(world_fn.childCount()):
+            child_indices.setdefault(maya.api.OpenMaya.MObjectHandle(world_fn.child(i)).hashCode(), i)
+        self._top_level.sort(key=lambda index: child_indices.get(self._handles[index].hashCode(), len(child_indices)))
+
+    def _remove_hierarchy(self, root_index):
+        """
+        Internal function that removes the hierarchy under the given top level index from the snapshot
+        :param root_index: int
+        """
+
+        stack = [root_index]
+        while stack:
+            index = stack.pop()
+            if not self._alive[index]:
+                continue
+            stack.extend(self._children[index])
+            self._alive[index] = False
+            self._dead_count += 1
+            self._path_indices.pop(self._paths[index], None)
+            indices = self._node_indices.get(self._handles[index].hashCode())
+            if indices and index in indices:
+                indices.remove(index)
+        if root_index in self._top_level:
+            self._top_level.remove(root_index)
+
+    def __init_arrays(self):
+        self._paths = list()
+        self._parents = list()
+        self._children = list()
+        self._roots = list()
+        self._depths = list()
+        self._handles = list()
+        self._transforms = list()
+        self._alive = list()
+        self._path_indices = dict()
+        self._node_indices = dict()
+        self._top_level = list()
+        self._dead_count = 0
+        self._dirty_roots = set()
+        self._pending_nodes = list()
+
+
+def get_dag_snapshot(refresh=True):
+    """
+    Returns the DAG hierarchy snapshot of the current scene
+    The snapshot is built once. DAG, node added/removed and node renamed messages mark the modified hierarchies as
+    dirty, and new/open/import scene and reference messages invalidate the full snapshot
+    :param refresh: bool, Whether to apply pending changes before returning the snapshot
+    :return: DagSnapshot
+    """
+
+    dag_snapshot = _DAG_SNAPSHOT.get()
+    if refresh:
+        dag_snapshot.refresh()
+
+    return dag_snapshot
+
+
+def clear_dag_snapshot():
+    """
+    Removes the DAG hierarchy snapshot of the current scene and its callbacks
+    """
+
+    _DAG_SNAPSHOT.clear()
+
+
+def _on_dag_changed(dag_snapshot, msg, child, parent, *args):
+    """
+    Internal callback function called when a DAG node is parented, unparented, reordered or instanced
+    """
+
+    dag_snapshot.mark_dirty(child.node())
+
+
+def _on_dag_node_changed(dag_snapshot, node, *args):
+    """
+    Internal callback function called when a DAG node is created or deleted
+    """
+
+    dag_snapshot.mark_dirty(node)
+
+
+def _on_node_name_changed(dag_snapshot, node, previous_name, *args):
+    """
+    Internal callback function called when a node is renamed
+    """
+
+    if node.hasFn(maya.api.OpenMaya.MFn.kDagNode):
+        dag_snapshot.mark_dirty(node)
+
+
+_DAG_SNAPSHOT = callback.SceneCache(DagSnapshot)
+_DAG_SNAPSHOT.add_scene_callback()
+_DAG_SNAPSHOT.add_dag_changed_callback(_on_dag_changed)
+_DAG_SNAPSHOT.add_node_added_callback(_on_dag_node_changed, node_type='dagNode')
+_DAG_SNAPSHOT.add_node_removed_callback(_on_dag_node_changed, node_type='dagNode')
+_DAG_SNAPSHOT.add_name_changed_callback(_on_node_name_changed)
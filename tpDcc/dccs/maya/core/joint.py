@@ -9,6 +9,7 @@ from __future__ import print_function, division, absolute_import
 
 import math
 import random
+import fnmatch
 import logging
 
 import maya.cmds
@@ -2145,3 +2146,95 @@ def auto_assign_labels_to_mesh_influences(skinned_mesh, input_left=None, input_r
     success = auto_label_joints(all_joints, input_left=input_left, input_right=input_right)
 
     return success
+
+
+def get_mirror_joints_map(joints, input_left='*_l_*', input_right='*_r_*'):
+    """
+    Returns a dictionary that maps each one of the given joints to its opposite side joint
+    Joints sides follow auto_label_joints conventions: joints names matching the left and right patterns are paired
+    if their names without the side token match. Joints not paired by name are paired by their joint labels: joints
+    sharing a label on both sides are paired by their mirrored world positions (X axis). Labels that cannot be
+    paired (a different number of joints on each side) are reported
+    Center joints and joints without opposite side joint are mapped to themselves
+    :param joints: list(str), joints to map
+    :param input_left: str, string to identify all joints that are on the left side
+    :param input_right: str, string to identify all joints that are on the right side
+    :return: dict(str, str)
+    """
+
+    if '*' not in input_left:
+        input_left = '*{}*'.format(input_left)
+    if '*' not in input_right:
+        input_right = '*{}*'.format(input_right)
+    left_token = input_left.strip('*')
+    right_token = input_right.strip('*')
+
+    sides = {1: dict(), 2: dict()}
+    unpaired = list()
+    for joint in joints:
+        short_name = joint.split('|')[-1]
+        if fnmatch.fnmatchcase(short_name, input_left):
+            sides[1][('name', short_name.replace(left_token, ''))] = joint
+        elif fnmatch.fnmatchcase(short_name, input_right):
+            sides[2][('name', short_name.replace(right_token, ''))] = joint
+        else:
+            unpaired.append(joint)
+
+    labels = {1: dict(), 2: dict()}
+    for joint in unpaired:
+        if not maya.cmds.objExists('{}.side'.format(joint)):
+            continue
+        side = maya.cmds.getAttr('{}.side'.format(joint))
+        if side not in labels:
+            continue
+        label = maya.cmds.getAttr('{}.type'.format(joint))
+        if label == 18:
+            label = maya.cmds.getAttr('{}.otherType'.format(joint))
+        labels[side].setdefault(label, list()).append(joint)
+
+    mirror_map = dict((joint, joint) for joint in joints)
+    for key, left_joint in sides[1].items():
+        right_joint = sides[2].get(key)
+        if not right_joint:
+            continue
+        mirror_map[left_joint] = right_joint
+        mirror_map[right_joint] = left_joint
+
+    for label, left_joints in labels[1].items():
+        right_joints = labels[2].get(label)
+        if not right_joints:
+            continue
+        if len(left_joints) != len(right_joints):
+            LOGGER.warning('Joint label "{}" is ambiguous ({} left and {} right joints), joints not paired: {}'.format(
+                label, len(left_joints), len(right_joints), left_joints + right_joints))
+            continue
+        for left_joint, right_joint in _pair_joints_by_mirrored_position(left_joints, right_joints):
+            mirror_map[left_joint] = right_joint
+            mirror_map[right_joint] = left_joint
+
+    return mirror_map
+
+
+def _pair_joints_by_mirrored_position(left_joints, right_joints):
+    """
+    Internal function that pairs each left joint with the right joint closest to its world position mirrored in X
+    :param left_joints: list(str)
+    :param right_joints: list(str), same number of joints as left_joints
+    :return: list(tuple(str, str))
+    """
+
+    if len(left_joints) == 1:
+        return [(left_joints[0], right_joints[0])]
+
+    right_positions = dict(
+        (joint, maya.cmds.xform(joint, query=True, worldSpace=True, translation=True)) for joint in right_joints)
+    pairs = list()
+    for left_joint in left_joints:
+        x, y, z = maya.cmds.xform(left_joint, query=True, worldSpace=True, translation=True)
+        mirrored_position = (-x, y, z)
+        right_joint = min(right_positions, key=lambda joint: sum(
+            (value - mirrored_value) ** 2 for value, mirrored_value in zip(right_positions[joint], mirrored_position)))
+        pairs.append((left_joint, right_joint))
+        right_positions.pop(right_joint)
+
+    return pairs
@@ -11,7 +11,27 @@ import math
 
 import maya.api.OpenMaya
 
-from tpDcc.dccs.maya.api import mathlib
+from tpDcc.libs.python import python
+from tpDcc.dccs.maya.api import mathlib, modifier
+from tpDcc.dccs.maya.core import contexts
+
+
+class MatrixTypes(object):
+    World = 'world'
+    WorldInverse = 'worldInverse'
+    Parent = 'parent'
+    ParentInverse = 'parentInverse'
+    Local = 'local'
+
+
+# matrix type > (node attribute, is array attribute)
+MATRIX_ATTRIBUTES = {
+    MatrixTypes.World: ('worldMatrix', True),
+    MatrixTypes.WorldInverse: ('worldInverseMatrix', True),
+    MatrixTypes.Parent: ('parentMatrix', True),
+    MatrixTypes.ParentInverse: ('parentInverseMatrix', True),
+    MatrixTypes.Local: ('matrix', False)
+}
 
 
 def create_matrix_from_list(values_list):
@@ -241,3 +261,102 @@ def print_matrix(matrix):
         '%.3f' % matrix(2, 3))
     print('%.3f' % matrix(3, 0)) + ', ' + ('%.3f' % matrix(3, 1)) + ', ' + ('%.3f' % matrix(3, 2)) + ', ' + (
         '%.3f' % matrix(3, 3))
+
+
+def get_matrices(nodes, matrix_type=MatrixTypes.World, time=None):
+    """
+    Returns the matrices of all given DAG nodes in one pass
+    :param nodes: list(str or MObject), DAG nodes to retrieve matrices of
+    :param matrix_type: str, MatrixTypes value that defines which matrix is returned (world, parent, local, ...)
+    :param time: float or None, frame to evaluate matrices at. If None, current frame is used. Scene current time
+        is not changed.
+    :return: MMatrixArray
+    """
+
+    if matrix_type not in MATRIX_ATTRIBUTES:
+        raise ValueError('Invalid matrix type "{}". Valid ones are: {}'.format(
+            matrix_type, list(MATRIX_ATTRIBUTES.keys())))
+
+    attr_name, is_array = MATRIX_ATTRIBUTES[matrix_type]
+    attr = maya.api.OpenMaya.MNodeClass('dagNode').attribute(attr_name)
+    mobjs = _get_mobjects(nodes)
+
+    matrices = maya.api.OpenMaya.MMatrixArray()
+    with contexts.dg_context(time):
+        for mobj in mobjs:
+            plug = maya.api.OpenMaya.MPlug(mobj, attr)
+            if is_array:
+                plug = plug.elementByLogicalIndex(0)
+            matrices.append(maya.api.OpenMaya.MFnMatrixData(plug.asMObject()).matrix())
+
+    return matrices
+
+
+def set_matrices(nodes, matrices, world_space=True, undoable=True):
+    """
+    Sets the transform values of the given nodes so they match the given matrices in one modifier pass
+    Joint orients are taken into account. Pivots, rotate axis and shear of the nodes are expected to be zero.
+    :param nodes: list(str or MObject), transform nodes to set matrices of
+    :param matrices: MMatrixArray or list(MMatrix), matrices to set, one per node
+    :param world_space: bool, Whether given matrices are world space or local (parent space) matrices
+    :param undoable: bool, Whether or not the operation should be undoable
+    :return: MDGModifier
+    """
+
+    mobjs = _get_mobjects(nodes)
+    matrices = mathlib.as_matrix_array(matrices)
+    if len(mobjs) != len(matrices):
+        raise ValueError('Number of nodes ({}) and matrices ({}) does not match'.format(len(mobjs), len(matrices)))
+
+    if world_space:
+        matrices = mathlib.multiply_matrices(matrices, get_matrices(mobjs, MatrixTypes.ParentInverse))
+
+    mod = maya.api.OpenMaya.MDGModifier()
+    for mobj, matrix in zip(mobjs, matrices):
+        node_fn = maya.api.OpenMaya.MFnDependencyNode(mobj)
+        rotation_order = node_fn.findPlug('rotateOrder', False).asInt()
+        transform_matrix = maya.api.OpenMaya.MTransformationMatrix(matrix)
+        translation = transform_matrix.translation(maya.api.OpenMaya.MSpace.kTransform)
+        scale = transform_matrix.scale(maya.api.OpenMaya.MSpace.kTransform)
+        if mobj.hasFn(maya.api.OpenMaya.MFn.kJoint):
+            # joint local matrix rotation is rotate * jointOrient, so joint orient needs to be removed
+            joint_orient = maya.api.OpenMaya.MEulerRotation(
+                [node_fn.findPlug('jointOrient{}'.format(axis), False).asDouble() for axis in 'XYZ'])
+            rotation_matrix = transform_matrix.rotation(asQuaternion=True).asMatrix()
+            rotation = maya.api.OpenMaya.MTransformationMatrix(
+                rotation_matrix * joint_orient.asMatrix().inverse()).rotation(asQuaternion=False)
+        else:
+            rotation = transform_matrix.rotation(asQuaternion=False)
+        rotation.reorderIt(rotation_order)
+        for attr_name, values in zip(('translate', 'rotate', 'scale'), (translation, rotation, scale)):
+            for axis, value in zip('XYZ', (values[0], values[1], values[2])):
+                plug = node_fn.findPlug('{}{}'.format(attr_name, axis), False)
+                if plug.isLocked or plug.isDestination:
+                    continue
+                mod.newPlugValueDouble(plug, value)
+
+    modifier.apply_modifier(mod, undoable=undoable)
+
+    return mod
+
+
+def _get_mobjects(nodes):
+    """
+    Internal function that returns MObjects of the given nodes
+    :param nodes: list(str or MObject)
+    :return: list(MObject)
+    """
+
+    nodes = python.force_list(nodes)
+    names = [node for node in nodes if python.is_string(node)]
+    if not names:
+        return nodes
+
+    # selection lists merge repeated items, so each name is only added once
+    unique_names = list(dict.fromkeys(names))
+    selection_list = maya.api.OpenMaya.MSelectionList()
+    for name in unique_names:
+        selection_list.add(name)
+    found = dict((name, selection_list.getDependNode(i)) for i, name in enumerate(unique_names))
+
+    return [found[node] if python.is_string(node) else node for node in nodes]
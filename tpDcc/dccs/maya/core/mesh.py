@@ -16,10 +16,14 @@ import maya.api.OpenMaya
 
 from tpDcc.dccs.maya import api
 from tpDcc.libs.python import python
-from tpDcc.dccs.maya.core import helpers, exceptions, node
+from tpDcc.dccs.maya.core import helpers, exceptions, node, callback
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
+# vertex adjacency of the meshes of the current scene, by mesh shape
+_VERTEX_ADJACENCY_CACHE = callback.SceneCache(dict)
+_VERTEX_ADJACENCY_CACHE.add_scene_callback()
+
 
 def check_mesh(mesh):
     """
@@ -347,6 +351,34 @@ def get_assigned_uvs(mesh, uv_set=None):
     return list(uv_count), list(uv_ids)
 
 
+def get_vertex_adjacency(mesh):
+    """
+    Returns the connected vertices of each one of the vertices of the given mesh
+    Adjacency is cached per mesh shape until the scene changes and it is only rebuilt if the face vertices of the mesh
+    change
+    :param mesh: str, mesh to get vertex adjacency of
+    :return: list(tuple(int)), connected vertex indices of each vertex, ordered by vertex index
+    """
+
+    mesh_fn = get_mesh_fn(mesh)
+    mesh_path = mesh_fn.fullPathName()
+    vertex_counts, vertex_ids = mesh_fn.getVertices()
+    topology = hash((mesh_fn.numVertices, tuple(vertex_counts), tuple(vertex_ids)))
+    adjacencies = _VERTEX_ADJACENCY_CACHE.get()
+    cached = adjacencies.get(mesh_path)
+    if cached and cached[0] == topology:
+        return cached[1]
+
+    adjacency = [tuple()] * mesh_fn.numVertices
+    vert_iter = maya.api.OpenMaya.MItMeshVertex(mesh_fn.dagPath())
+    while not vert_iter.isDone():
+        adjacency[vert_iter.index()] = tuple(vert_iter.getConnectedVertices())
+        vert_iter.next()
+    adjacencies[mesh_path] = (topology, adjacency)
+
+    return adjacency
+
+
 def get_connected_vertices(mesh, vertex_selection_set):
     """
     Get list of connected vertices in groups
@@ -355,51 +387,31 @@ def get_connected_vertices(mesh, vertex_selection_set):
     :return:
     """
 
-    # TODO: We need to rewrite this function to make it compatible with Maya API 1 and 2
-
-    def get_neighbour_vertices(curr_vert_iter, vert_index):
-        """
-        Get neighbour of given vertex index
-        :param curr_vert_iter: MItMeshVertex, iterator used to loop through all mesh vertices
-        :param vert_index: int, current vertex index being processed
-        :return: set<int>
-        """
-
-        curr_vert_iter.setIndex(vert_index, maya.api.OpenMaya.MScriptUtil().asIntPtr())
-        int_array = maya.api.OpenMaya.MIntArray()
-        curr_vert_iter.getConnectedVertices(int_array)
-
-        return set(int(x) for x in int_array)
+    adjacency = get_vertex_adjacency(mesh)
+    selection_set = set(vertex_selection_set)
 
     # Set (non repeated elements) of already visited vertices
     visited_neighbours = set()
     district_dict = defaultdict(list)
     district_number = 0
 
-    dep_node = node.get_depend_node(node=mesh)
-
-    vert_iter = maya.api.OpenMaya.MItMeshVertex(dep_node)
     for index in vertex_selection_set:
-        district_houses = set()
-        if index not in visited_neighbours:
-            district_houses.add(index)
-            current_neighbours = get_neighbour_vertices(vert_iter, index)
-
-            while current_neighbours:
-                new_neighbours = set()
-                for neighbour in current_neighbours:
-                    if neighbour in vertex_selection_set and neighbour not in visited_neighbours:
-                        visited_neighbours.add(neighbour)
-                        district_houses.add(neighbour)
-                        new_neighbours = new_neighbours.union(get_neighbour_vertices(vert_iter, neighbour))
-
-                current_neighbours = new_neighbours
-
-            district_dict[district_number] = district_houses
-            district_number += 1
-
-        vert_iter.setIndex(index, maya.api.OpenMaya.MScriptUtil().asIntPtr())
-        vert_iter.next()
+        if index in visited_neighbours:
+            continue
+        visited_neighbours.add(index)
+        district_houses = set([index])
+        current_neighbours = set(adjacency[index])
+        while current_neighbours:
+            new_neighbours = set()
+            for neighbour in current_neighbours:
+                if neighbour in selection_set and neighbour not in visited_neighbours:
+                    visited_neighbours.add(neighbour)
+                    district_houses.add(neighbour)
+                    new_neighbours.update(adjacency[neighbour])
+            current_neighbours = new_neighbours
+
+        district_dict[district_number] = district_houses
+        district_number += 1
 
     return district_dict
 
@@ -33,10 +33,11 @@ class FindUniqueName(naming_utils.FindUniqueString, object):
     If no number is found, it will append a 1 to the end of the name
     """
 
-    def __init__(self, name):
+    def __init__(self, name, reserved_names=None):
         super(FindUniqueName, self).__init__(name)
 
         self.work_on_last_number = True
+        self.reserved_names = reserved_names or set()
 
     def get_last_number(self, bool_value):
         """
@@ -52,7 +53,7 @@ class FindUniqueName(naming_utils.FindUniqueString, object):
         :return: list<str>
         """
 
-        if maya.cmds.objExists(self.increment_string):
+        if self.increment_string in self.reserved_names or maya.cmds.objExists(self.increment_string):
             return [self.increment_string]
 
         return list()
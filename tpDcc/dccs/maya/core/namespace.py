@@ -5,15 +5,188 @@
 Module that contains functions and classes related with namespaces
 """
 
-import types
+from __future__ import print_function, division, absolute_import
+
 import logging
 
 import maya.cmds
+import maya.api.OpenMaya
 
-from tpDcc.dccs.maya.core import name as naming
+from tpDcc.libs.python import python
+from tpDcc.dccs.maya.api import modifier as api_modifier
+from tpDcc.dccs.maya.core import decorators, callback
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
+IGNORE_NAMESPACES = ['UI', 'shared']
+
+
+class NamespaceTree(object):
+    """
+    In memory tree of the namespaces of the current scene
+    Namespace names are stored as absolute names without the leading colon ('' is the root namespace). Namespaces
+    given to the query methods are resolved from the current namespace (as Maya namespace command does) unless they
+    start with a colon, and the current namespace is never modified. Nodes of each namespace are only retrieved when
+    they are queried for the first time and they are stored as handles, so their names are resolved on each query
+    """
+
+    def __init__(self):
+        self._children = {'': list()}
+        self._contents = dict()
+        for namespace in maya.api.OpenMaya.MNamespace.getNamespaces(':', True):
+            namespace = namespace.strip(':')
+            self._children.setdefault(namespace, list())
+            self._children.setdefault(namespace.rpartition(':')[0], list()).append(namespace)
+
+    def exists(self, namespace):
+        """
+        Returns whether or not given namespace exists
+        :param namespace: str
+        :return: bool
+        """
+
+        return self.resolve(namespace) in self._children
+
+    def resolve(self, namespace):
+        """
+        Returns the absolute name (without the leading colon) of the given namespace
+        :param namespace: str
+        :return: str
+        """
+
+        if namespace.startswith(':'):
+            return namespace.strip(':')
+
+        current_namespace = maya.api.OpenMaya.MNamespace.currentNamespace().strip(':')
+
+        return ':'.join([name for name in (current_namespace, namespace.strip(':')) if name])
+
+    def children(self, namespace=':', recursive=False):
+        """
+        Returns the child namespaces of the given namespace
+        :param namespace: str
+        :param recursive: bool, Whether to return all descendant namespaces or only the direct ones
+        :return: list(str), absolute names (without the leading colon) of the child namespaces
+        """
+
+        namespaces = list(self._children.get(self.resolve(namespace), list()))
+        if recursive:
+            for child in list(namespaces):
+                namespaces.extend(self.children(':' + child, recursive=True))
+
+        return namespaces
+
+    def contents(self, namespace):
+        """
+        Returns the nodes contained in the given namespace (child namespaces contents are not included)
+        :param namespace: str
+        :return: list(str), full names of the nodes
+        """
+
+        nodes = list()
+        for handle in self._get_handles(self.resolve(namespace)):
+            mobj = handle.object()
+            if mobj.hasFn(maya.api.OpenMaya.MFn.kDagNode):
+                nodes.append(maya.api.OpenMaya.MDagPath.getAPathTo(mobj).fullPathName())
+            else:
+                nodes.append(maya.api.OpenMaya.MFnDependencyNode(mobj).name())
+
+        return nodes
+
+    def is_empty(self, namespace):
+        """
+        Returns whether or not given namespace and all its child namespaces do not contain any node
+        :param namespace: str
+        :return: bool
+        """
+
+        namespace = self.resolve(namespace)
+        if self._get_handles(namespace):
+            return False
+
+        return all(self.is_empty(':' + child) for child in self._children.get(namespace, list()))
+
+    def empty_namespaces(self, exclude_list=None):
+        """
+        Returns all empty namespaces sorted so child namespaces are located before their parents
+        :param exclude_list: list(str) or None, namespaces to ignore
+        :return: list(str), absolute names (without the leading colon) of the empty namespaces
+        """
+
+        exclude_list = set(IGNORE_NAMESPACES + list(exclude_list or list()))
+        namespaces = [
+            namespace for namespace in self._children if namespace and namespace.split(':')[0] not in exclude_list]
+        empty = [namespace for namespace in namespaces if self.is_empty(':' + namespace)]
+
+        return sorted(empty, key=lambda namespace: namespace.count(':'), reverse=True)
+
+    def unique_namespace(self, namespace, increment_fn=None):
+        """
+        Returns the first namespace, generated with the given increment function, that does not exist yet
+        :param namespace: str
+        :param increment_fn: fn(basename, index) or None
+        :return: str
+        """
+
+        if not self.exists(namespace):
+            return namespace
+
+        def _increment(b, i):
+            return "%s%02i" % (b, i)
+
+        increment_fn = increment_fn or _increment
+        index = 1
+        while True:
+            test_namespace = increment_fn(namespace, index)
+            index += 1
+            if not self.exists(test_namespace):
+                return test_namespace
+
+    def clear_contents(self):
+        """
+        Removes the cached nodes of all namespaces
+        """
+
+        self._contents.clear()
+
+    def _get_handles(self, namespace):
+        """
+        Internal function that returns the handles of the valid nodes contained in the given absolute namespace
+        :param namespace: str
+        :return: list(MObjectHandle)
+        """
+
+        if namespace not in self._contents:
+            handles = list()
+            if namespace in self._children:
+                for mobj in maya.api.OpenMaya.MNamespace.getNamespaceObjects(':' + namespace, False):
+                    handles.append(maya.api.OpenMaya.MObjectHandle(mobj))
+            self._contents[namespace] = handles
+
+        return [handle for handle in self._contents[namespace] if handle.isValid()]
+
+
+def get_namespace_tree(refresh=False):
+    """
+    Returns the namespace tree of the current scene
+    The tree is built once and it is rebuilt after a node is renamed, after a new scene is opened or imported and
+    after a reference is created, removed, loaded or unloaded. Cached namespaces contents are cleared when a node is
+    added. Maya does not notify namespaces added or removed without renaming any node, so functions that must be
+    exact rebuild the tree or validate its results
+    :param refresh: bool, Whether to force the rebuild of the tree
+    :return: NamespaceTree
+    """
+
+    return _NAMESPACE_TREE.get(refresh=refresh)
+
+
+def clear_namespace_tree():
+    """
+    Removes the namespace tree of the current scene and its callbacks
+    """
+
+    _NAMESPACE_TREE.clear()
+
 
 def namespace_exists(namespace):
     """
@@ -60,9 +233,11 @@ def get_namespace_from_list(objs_list, check_obj=True, top_only=True):
     """
 
     namespaces = list()
-    if isinstance(objs_list, types.StringTypes):
-        obj_list = [str(objs_list)]
-    for obj in objs_list:
+    visited = set()
+    for obj in python.force_list(objs_list):
+        if obj in visited:
+            continue
+        visited.add(obj)
         namespace = get_namespace(obj, check_obj=check_obj, top_only=top_only)
         if namespace not in namespaces:
             namespaces.append(namespace)
@@ -92,20 +267,13 @@ def remove_empty_namespaces():
     """
 
     delete_namespaces = list()
-
-    def _namespace_children_count(ns):
-        return ns.count(':')
-
-    # Retrieve namespaces and sort them in a way that namespaces with more children are located at the front
-    namespace_list = maya.cmds.namespaceInfo(listOnlyNamespaces=True, recurse=True)
-    namespace_list.sort(key=_namespace_children_count, reverse=True)
-
-    for namespace in namespace_list:
+    for namespace in get_namespace_tree(refresh=True).empty_namespaces():
         try:
-            maya.cmds.namespace(removeNamespace=namespace)
+            maya.cmds.namespace(removeNamespace=':' + namespace)
             delete_namespaces.append(namespace)
         except RuntimeError:
             pass
+    _NAMESPACE_TREE.invalidate()
 
     if delete_namespaces:
         LOGGER.info('Namespaces removed: {}'.format(delete_namespaces))
@@ -119,17 +287,10 @@ def get_all_namespaces(exclude_list=None):
     :return: list(str)
     """
 
-    IGNORE_NAMESPACES = ['UI', 'shared']
-    if not exclude_list:
-        exclude_list = IGNORE_NAMESPACES
-    else:
-        exclude_list.extend(IGNORE_NAMESPACES)
+    exclude_list = set(IGNORE_NAMESPACES + list(exclude_list or list()))
+    namespaces = get_namespace_tree(refresh=True).children(':', recursive=True)
 
-    namespaces = maya.cmds.namespaceInfo(listOnlyNamespaces=True, recurse=True)
-    namespaces = list(set(namespaces) - set(exclude_list))
-    namespaces = sorted(namespaces)
-
-    return namespaces
+    return sorted(set(namespaces) - exclude_list)
 
 
 def get_current_namespace():
@@ -167,6 +328,7 @@ def delete_namespace(namespace_name):
 
     maya.cmds.namespace(mv=[namespace_name, ':'], f=True)
     maya.cmds.namespace(rm=namespace_name)
+    _NAMESPACE_TREE.invalidate()
 
 
 def move_namespace(source_namespace, target_namespace):
@@ -183,6 +345,7 @@ def move_namespace(source_namespace, target_namespace):
         target_namespace = maya.cmds.namespace(add=target_namespace, f=True)
 
     new_namespace = maya.cmds.namespace(mv=(source_namespace, target_namespace), f=True)
+    _NAMESPACE_TREE.invalidate()
 
     return new_namespace
 
@@ -205,6 +368,7 @@ def rename_namepace(namespace, new_namespace, parent_namespace=None):
         maya.cmds.namespace(rename=[namespace, new_namespace])
     else:
         maya.cmds.namespace(rename=[namespace, new_namespace], parent=parent_namespace)
+    _NAMESPACE_TREE.invalidate()
 
     return new_namespace
 
@@ -229,12 +393,11 @@ def get_all_in_namespace(namespace_name):
     if not maya.cmds.namespace(exists=namespace_name):
         raise Exception('Namespace "{}" does not exist!'.format(namespace_name))
 
-    current_namesapce = maya.cmds.namespaceInfo(currentNamespace=True)
-    maya.cmds.namespace(set=namespace_name)
-    namespace_nodes_list = maya.cmds.namespaceInfo(lod=True, dagPath=True)
-    maya.cmds.namespace(set=current_namesapce)
+    namespace_tree = get_namespace_tree()
+    if not namespace_tree.exists(namespace_name):
+        namespace_tree = get_namespace_tree(refresh=True)
 
-    return namespace_nodes_list
+    return list(namespace_tree.contents(namespace_name))
 
 
 def add_hierarchy_to_namespace(root, namespace, replace_namespace=True):
@@ -249,23 +412,10 @@ def add_hierarchy_to_namespace(root, namespace, replace_namespace=True):
     if not maya.cmds.objExists(root):
         raise Exception('Hierarchy root object "{}" does not exist!'.format(root))
 
-    if not maya.cmds.namespace(exists=namespace):
-        maya.cmds.namespace(add=namespace)
-
     hierarchy = maya.cmds.ls(maya.cmds.listRelatives(root, ad=True, pa=True), transform=True)
     hierarchy.append(root)
 
-    for i in range(len(hierarchy)):
-        item = hierarchy[i]
-        current_namespace = get_namespace(item, check_obj=True, top_only=False)
-        if current_namespace:
-            maya.cmds.rename(item, item.replace(current_namespace, namespace))
-        else:
-            maya.cmds.rename(item, '{}:{}'.format(namespace, item))
-
-        hierarchy[i] = item
-
-    return hierarchy
+    return set_nodes_namespace(hierarchy, namespace, replace_namespace=replace_namespace)
 
 
 def find_unique_namespace(namespace, increment_fn=None):
@@ -277,21 +427,12 @@ def find_unique_namespace(namespace, increment_fn=None):
     :return: str, unique namespace that is guaranteed not to exists below the current namespace
     """
 
-    if not namespace_exists(namespace):
-        return namespace
-
-    def _increment(b, i):
-        return "%s%02i" % (b, i)
+    unique_namespace = get_namespace_tree().unique_namespace(namespace, increment_fn=increment_fn)
+    if namespace_exists(unique_namespace):
+        # namespaces created without renaming any node are not notified, so the tree could be outdated
+        unique_namespace = get_namespace_tree(refresh=True).unique_namespace(namespace, increment_fn=increment_fn)
 
-    if not increment_fn:
-        increment_fn = _increment
-
-    index = 1
-    while True:
-        test_namespace = increment_fn(namespace, index)
-        index += 1
-        if not namespace_exists(test_namespace):
-            return test_namespace
+    return unique_namespace
 
 
 def assign_namespace_to_object(obj_names, namespace, force_create=True, uuid=None, rename_shape=True):
@@ -305,33 +446,18 @@ def assign_namespace_to_object(obj_names, namespace, force_create=True, uuid=Non
     :return:str, new name of the object
     """
 
-    def _assign_namespace(obj_name, obj_uuid=None):
-        long_prefix, obj_namespace, base_name = naming.get_node_name_parts(obj_name)
-        if namespace == obj_namespace:
-            return obj_name
-
-        new_name = naming.join_node_name_parts(long_prefix, namespace, base_name)
-
-        return naming.rename(obj_name, new_name, uuid=obj_uuid, rename_shape=rename_shape)
-
     if not obj_names:
         obj_names = maya.cmds.ls(sl=True, long=True)
 
-    if not maya.cmds.namespace(exists=namespace):
-        if force_create:
-            maya.cmds.namespace(set=':')
-            maya.cmds.namespace(add=namespace)
-        else:
-            return obj_names
+    if not maya.cmds.namespace(exists=namespace) and not force_create:
+        return obj_names
 
     if isinstance(obj_names, (tuple, list)):
-        uuid_list = maya.cmds.ls(obj_names, uuid=True)
-        for i, obj in enumerate(obj_names):
-            _assign_namespace(obj, uuid_list[i])
-        maya.cmds.namespace(set=':')
-        return maya.cmds.ls(uuid_list, long=True)
+        return set_nodes_namespace(obj_names, namespace, rename_shapes=rename_shape)
     else:
-        return _assign_namespace(obj_names, uuid)
+        if uuid:
+            obj_names = maya.cmds.ls(uuid, long=True)[0]
+        return set_nodes_namespace([obj_names], namespace, rename_shapes=rename_shape)[0]
 
 
 def remove_namespace_from_object(obj_names, namespace, uuid=None, rename_shape=True):
@@ -344,12 +470,6 @@ def remove_namespace_from_object(obj_names, namespace, uuid=None, rename_shape=T
     :return:str, new name of the object
     """
 
-    def _remove_namespace(obj_name, obj_uuid=None):
-        long_prefix, obj_namespace, base_name = naming.get_node_name_parts(obj_name)
-        new_name = naming.join_node_name_parts(long_prefix, '', base_name)
-
-        return naming.rename(obj_name, new_name, uuid=obj_uuid, rename_shape=rename_shape)
-
     if not obj_names:
         obj_names = maya.cmds.ls(sl=True, long=True)
 
@@ -357,16 +477,122 @@ def remove_namespace_from_object(obj_names, namespace, uuid=None, rename_shape=T
         return obj_names
 
     if isinstance(obj_names, (tuple, list)):
-        uuid_list = maya.cmds.ls(obj_names, uuid=True)
-        for i, obj in enumerate(obj_names):
-            _remove_namespace(obj, uuid_list[i])
-        maya.cmds.namespace(set=':')
-        remove_empty_namespaces()
-        return maya.cmds.ls(uuid_list, long=True)
+        new_names = set_nodes_namespace(obj_names, '', rename_shapes=rename_shape)
     else:
-        removed_namespaces = _remove_namespace(obj_names, uuid)
-        remove_empty_namespaces()
-        return removed_namespaces
+        if uuid:
+            obj_names = maya.cmds.ls(uuid, long=True)[0]
+        new_names = set_nodes_namespace([obj_names], '', rename_shapes=rename_shape)[0]
+    remove_empty_namespaces()
+
+    return new_names
+
+
+@decorators.undo_chunk
+def set_nodes_namespace(nodes, namespace, replace_namespace=True, rename_shapes=True):
+    """
+    Moves the given nodes into the given namespace
+    New names of all nodes are computed first and then they are applied with a single undoable rename modifier.
+    Locked and referenced nodes cannot be renamed so they are skipped
+    :param nodes: list(str), names of the nodes to move
+    :param namespace: str, namespace to move nodes into (it is created if it does not exist). If empty, nodes are
+        moved into the root namespace
+    :param replace_namespace: bool, Whether current namespace of the nodes is replaced or the given namespace is
+        added as parent of it
+    :param rename_shapes: bool, Whether shapes of the given transforms are moved into the namespace too
+    :return: list(str), long names of the given nodes after being renamed
+    """
+
+    namespace = namespace.strip(':') if namespace else ''
+
+    # selection list merges duplicated nodes
+    selection_list = maya.api.OpenMaya.MSelectionList()
+    for node in python.force_list(nodes):
+        try:
+            selection_list.add(node)
+        except RuntimeError:
+            LOGGER.warning('Node "{}" does not exist!'.format(node))
+    mobjs = [selection_list.getDependNode(i) for i in range(selection_list.length())]
+    handles = [maya.api.OpenMaya.MObjectHandle(mobj) for mobj in mobjs]
+
+    to_rename = list(mobjs)
+    if rename_shapes:
+        visited = set([handle.hashCode() for handle in handles])
+        for mobj in mobjs:
+            if not mobj.hasFn(maya.api.OpenMaya.MFn.kTransform):
+                continue
+            dag_fn = maya.api.OpenMaya.MFnDagNode(mobj)
+            for i in range(dag_fn.childCount()):
+                child = dag_fn.child(i)
+                child_hash = maya.api.OpenMaya.MObjectHandle(child).hashCode()
+                if child.hasFn(maya.api.OpenMaya.MFn.kShape) and child_hash not in visited:
+                    visited.add(child_hash)
+                    to_rename.append(child)
+
+    new_namespaces = set()
+    renames = list()
+    for mobj in to_rename:
+        node_fn = maya.api.OpenMaya.MFnDependencyNode(mobj)
+        current_namespace, _, base_name = node_fn.name().rpartition(':')
+        new_namespace = namespace
+        if not replace_namespace:
+            new_namespace = ':'.join([name for name in (namespace, current_namespace) if name])
+        if new_namespace == current_namespace:
+            continue
+        if node_fn.isLocked or node_fn.isFromReferencedFile:
+            LOGGER.warning('Node "{}" is locked or referenced and cannot be renamed!'.format(node_fn.name()))
+            continue
+        if new_namespace:
+            new_namespaces.add(new_namespace)
+        renames.append((mobj, ':{}:{}'.format(new_namespace, base_name) if new_namespace else ':' + base_name))
+
+    for new_namespace in sorted(new_namespaces):
+        _create_namespace(new_namespace)
+
+    if renames:
+        mod = maya.api.OpenMaya.MDagModifier()
+        for mobj, new_name in renames:
+            mod.renameNode(mobj, new_name)
+        api_modifier.apply_modifier(mod)
+
+    new_names = list()
+    for handle in handles:
+        mobj = handle.object()
+        if mobj.hasFn(maya.api.OpenMaya.MFn.kDagNode):
+            new_names.append(maya.api.OpenMaya.MDagPath.getAPathTo(mobj).fullPathName())
+        else:
+            new_names.append(maya.api.OpenMaya.MFnDependencyNode(mobj).name())
+
+    return new_names
+
+
+def _create_namespace(namespace):
+    """
+    Internal function that creates the given absolute namespace and its parent namespaces if they do not exist
+    Current namespace is not modified
+    :param namespace: str
+    """
+
+    parent_namespace = ':'
+    for name in namespace.strip(':').split(':'):
+        child_namespace = '{}:{}'.format(parent_namespace.rstrip(':'), name)
+        if not maya.cmds.namespace(exists=child_namespace):
+            maya.cmds.namespace(add=name, parent=parent_namespace)
+        parent_namespace = child_namespace
+    _NAMESPACE_TREE.invalidate()
+
+
+def _on_node_added(namespace_tree, *args):
+    """
+    Internal callback function called when a node is added
+    """
+
+    namespace_tree.clear_contents()
+
+
+_NAMESPACE_TREE = callback.SceneCache(NamespaceTree)
+_NAMESPACE_TREE.add_scene_callback()
+_NAMESPACE_TREE.add_name_changed_callback()
+_NAMESPACE_TREE.add_node_added_callback(_on_node_added)
 
 
 def assign_namespace_to_object_by_filter(namespace, filter_type, force_create=True, rename_shape=True,
@@ -15,11 +15,14 @@ import maya.cmds
 import maya.api.OpenMaya
 
 from tpDcc.libs.python import python, name, color
-from tpDcc.dccs.maya.api import node as api_node
+from tpDcc.dccs.maya.api import node as api_node, modifier as api_modifier
 from tpDcc.dccs.maya.core import exceptions, helpers, color as maya_color
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
+# inherited types of each node type, resolved once when color nodes are queried
+_INHERITED_NODE_TYPES = dict()
+
 
 def is_a_shape(node_name):
     """
@@ -864,43 +867,65 @@ def get_all_hierarchy_nodes(node, direction=None, object_type=None):
     :return:
     """
 
-    if direction is None:
-        # if helpers.get_maya_version() > 2016:
-        #     direction = maya.api.OpenMaya.MItDependencyGraph.kDownstream
-        # else:
-        #     direction = OpenMaya.MItDependencyGraph.kDownstream
-        direction = maya.api.OpenMaya.MItDependencyGraph.kDownstream
+    return list(iterate_hierarchy_nodes(node, direction=direction, filter_types=object_type, as_names=True))
 
-    check_node(node)
 
-    object_type = python.force_list(object_type)
-    nodes = list()
+def iterate_hierarchy_nodes(
+        node, direction=None, filter_types=None, prune_types=None, depth_limit=None, depth_first=False,
+        include_root=True, as_names=False):
+    """
+    Generator that walks the dependency graph from the given node at node level yielding each connected node once
+    Iteration can be stopped at any moment by the caller, and nodes should not be deleted while iterating
+    :param node: str or MObject, node to start walking the dependency graph from
+    :param direction: int or None, MItDependencyGraph direction (kDownstream or kUpstream). If None, downstream is used
+    :param filter_types: int or list(int) or None, MFn types of the nodes to yield. If None, all nodes are yielded
+    :param prune_types: int or list(int) or None, MFn types of the nodes where the walk does not continue through.
+        Pruned nodes are still yielded if they match filter types
+    :param depth_limit: int or None, maximum number of connections between the root node and the yielded nodes. If 0,
+        only the root node is yielded
+    :param depth_first: bool, Whether to walk the graph depth first or breadth first
+    :param include_root: bool, Whether to yield the given node or not
+    :param as_names: bool, Whether to yield node names or MObjectHandles
+    :return: generator(MObjectHandle or str)
+    """
+
+    if direction is None:
+        direction = maya.api.OpenMaya.MItDependencyGraph.kDownstream
 
-    if type(node) == maya.api.OpenMaya.MObject:
+    if isinstance(node, maya.api.OpenMaya.MObject):
         mobj = node
     else:
         sel_list = maya.api.OpenMaya.MSelectionList()
         sel_list.add(node)
         mobj = sel_list.getDependNode(0)
 
-    mit_dependency_graph = maya.api.OpenMaya.MItDependencyGraph(
-        mobj, direction, maya.api.OpenMaya.MItDependencyGraph.kPlugLevel)
-
-    while not mit_dependency_graph.isDone():
-        current_item = mit_dependency_graph.currentNode()
-        depend_node_fn = maya.api.OpenMaya.MFnDependencyNode(current_item)
-        node_name = depend_node_fn.name()
-        if object_type:
-            for o_type in object_type:
-                if current_item.hasFn(o_type):
-                    nodes.append(node_name)
-                    break
-        else:
-            nodes.append(node_name)
-
-        mit_dependency_graph.next()
-
-    return nodes
+    filter_types = python.force_list(filter_types)
+    prune_types = python.force_list(prune_types)
+    traversal = maya.api.OpenMaya.MItDependencyGraph.kDepthFirst if depth_first else \
+        maya.api.OpenMaya.MItDependencyGraph.kBreadthFirst
+
+    graph_it = maya.api.OpenMaya.MItDependencyGraph(
+        mobj, maya.api.OpenMaya.MFn.kInvalid, direction, traversal, maya.api.OpenMaya.MItDependencyGraph.kNodeLevel)
+    while not graph_it.isDone():
+        current_item = graph_it.currentNode()
+        is_root = current_item == mobj
+        if depth_limit is not None:
+            depth = len(graph_it.getNodePath()) - 1
+            if depth > depth_limit:
+                graph_it.prune()
+                graph_it.next()
+                continue
+            if depth >= depth_limit:
+                graph_it.prune()
+        if not is_root and prune_types and any(current_item.hasFn(prune_type) for prune_type in prune_types):
+            graph_it.prune()
+        if (include_root or not is_root) and (
+                not filter_types or any(current_item.hasFn(filter_type) for filter_type in filter_types)):
+            if as_names:
+                yield maya.api.OpenMaya.MFnDependencyNode(current_item).name()
+            else:
+                yield maya.api.OpenMaya.MObjectHandle(current_item)
+        graph_it.next()
 
 
 def get_objects_of_mtype_iterator(object_type):
@@ -952,12 +977,30 @@ def get_index_color(node):
     if not node:
         return None
 
-    if not maya.cmds.getAttr('{}.overrideEnabled'.format(node)):
-        return 0
-    elif not maya.cmds.getAttr('{}.overrideRGBColors'.format(node)):
-        return maya.cmds.getAttr('{}.overrideColor'.format(node))
+    return get_index_colors([node])[0]
+
 
-    return -1
+def get_index_colors(nodes):
+    """
+    Returns the color of the given nodes as Maya color indices
+    :param nodes: list(str)
+    :return: list(int or None), 0 if color override is disabled, -1 if RGB mode color is enabled and None if the node
+        has no color override
+    """
+
+    color_data = get_nodes_color_data(nodes, query_shapes=False)
+    index_colors = list()
+    for enabled, use_rgb, color_index in zip(color_data['enabled'], color_data['use_rgb'], color_data['index']):
+        if enabled is None:
+            index_colors.append(None)
+        elif not enabled:
+            index_colors.append(0)
+        elif not use_rgb:
+            index_colors.append(color_index)
+        else:
+            index_colors.append(-1)
+
+    return index_colors
 
 
 def get_rgb_color(node, linear=True, limit_decimal_places=False):
@@ -1020,11 +1063,7 @@ def set_color(nodes, color_index):
     :param color_index: int, color index to set override color to
     """
 
-    nodes = python.force_list(nodes)
-    for node in nodes:
-        if maya.cmds.objExists('{}.overrideEnabled'.format(node)):
-            maya.cmds.setAttr('{}.overrideEnabled'.format(node), True)
-            maya.cmds.setAttr('{}.overrideColor'.format(node), color_index)
+    set_nodes_override_color(nodes, color_index=color_index)
 
 
 def set_index_color(node, index):
@@ -1116,19 +1155,11 @@ def filter_nodes_by_rgb_color(nodes_list, rgb_color, tolerance=0.05, query_shape
     :return: list(str), list of filtered nodes
     """
 
-    # Import here to avoid cyclic imports
-    from tpDcc.dccs.maya.core import shape as shape_utils
-
-    colored_nodes = list()
-    for i, node in enumerate(nodes_list):
-        nodes_to_check = [nodes_list[i]]
-        if query_shapes:
-            nodes_to_check = shape_utils.filter_shapes_in_list([node])
-        if nodes_to_check:
-            if color.compare_rgb_colors_tolerance(get_rgb_color(nodes_to_check[0]), rgb_color, tolerance=tolerance):
-                colored_nodes.append(node)
+    color_data = get_nodes_color_data(nodes_list, query_shapes=query_shapes)
+    rgb_colors = get_nodes_rgb_colors(color_data)
 
-    return colored_nodes
+    return [node for node, color_node, node_color in zip(nodes_list, color_data['color_nodes'], rgb_colors) if
+            color_node and all(abs(value - other) <= tolerance for value, other in zip(node_color, rgb_color[:3]))]
 
 
 def select_nodes_by_rgb_color(nodes_list, rgb_color, tolerance=0.05, query_shapes=False):
@@ -1149,6 +1180,196 @@ def select_nodes_by_rgb_color(nodes_list, rgb_color, tolerance=0.05, query_shape
     return colored_nodes
 
 
+def get_nodes_color_data(nodes, query_shapes=True):
+    """
+    Returns the override color data of the given nodes in a single pass, as parallel lists
+    Data matches the one returned by api.node.get_node_color_data for each node, but nodes without override color
+    attributes are allowed (their values are None)
+    :param nodes: list(str), nodes to get color data of
+    :param query_shapes: bool, Whether to read the color of the first colorable shape of each node (or the node itself
+        if it is a colorable shape) instead of the color of the node
+    :return: dict, lists with the following keys (one item per given node): color_nodes (str or None, full name of
+        the node whose color is read), enabled (bool), use_rgb (bool), index (int), rgb (tuple(float, float, float)),
+        use_outliner (bool) and outliner_rgb (tuple(float, float, float))
+    """
+
+    from tpDcc.dccs.maya.core import shape as shape_utils
+
+    shape_types = set(shape_utils.get_shapes_types_with_color()) if query_shapes else None
+    color_data = {
+        'color_nodes': list(), 'enabled': list(), 'use_rgb': list(), 'index': list(), 'rgb': list(),
+        'use_outliner': list(), 'outliner_rgb': list()}
+    for node in python.force_list(nodes):
+        color_node = _get_color_node(node, shape_types)
+        node_fn = maya.api.OpenMaya.MFnDependencyNode(color_node) if color_node else None
+        if not node_fn or not node_fn.hasAttribute('overrideEnabled'):
+            color_data['color_nodes'].append(maya.api.OpenMaya.MFnDependencyNode(
+                color_node).name() if color_node and not query_shapes else None)
+            for key in ('enabled', 'use_rgb', 'index', 'rgb', 'use_outliner', 'outliner_rgb'):
+                color_data[key].append(None)
+            continue
+        color_data['color_nodes'].append(_get_color_node_name(color_node))
+        color_data['enabled'].append(node_fn.findPlug('overrideEnabled', False).asBool())
+        color_data['index'].append(node_fn.findPlug('overrideColor', False).asInt())
+        if node_fn.hasAttribute('overrideRGBColors'):
+            rgb_plug = node_fn.findPlug('overrideColorRGB', False)
+            color_data['use_rgb'].append(node_fn.findPlug('overrideRGBColors', False).asBool())
+            color_data['rgb'].append(tuple([rgb_plug.child(i).asFloat() for i in range(3)]))
+        else:
+            color_data['use_rgb'].append(False)
+            color_data['rgb'].append(None)
+        if node_fn.hasAttribute('useOutlinerColor'):
+            outliner_plug = node_fn.findPlug('outlinerColor', False)
+            color_data['use_outliner'].append(node_fn.findPlug('useOutlinerColor', False).asBool())
+            color_data['outliner_rgb'].append(tuple([outliner_plug.child(i).asFloat() for i in range(3)]))
+        else:
+            color_data['use_outliner'].append(None)
+            color_data['outliner_rgb'].append(None)
+
+    return color_data
+
+
+def get_nodes_rgb_colors(color_data, linear=True):
+    """
+    Returns the RGB color displayed by each node of the given color data (see get_nodes_color_data)
+    :param color_data: dict
+    :param linear: bool, Whether or not the RGB should be in linear space (matches viewport color)
+    :return: list(tuple(float, float, float))
+    """
+
+    maya_colors = maya_color.MAYA_COLORS_LINEAR_RGB if linear else maya_color.MAYA_COLORS_SRGB
+    rgb_colors = list()
+    for enabled, use_rgb, color_index, rgb in zip(
+            color_data['enabled'], color_data['use_rgb'], color_data['index'], color_data['rgb']):
+        if not enabled:
+            rgb_colors.append(maya_colors[0])
+        elif not use_rgb:
+            rgb_colors.append(maya_colors[color_index])
+        else:
+            rgb_colors.append(rgb if linear else color.convert_color_linear_to_srgb(rgb))
+
+    return rgb_colors
+
+
+def set_nodes_override_color(nodes, color_index=None, rgb_color=None, color_shapes=False):
+    """
+    Enables the color override of the given nodes and sets their index or RGB color with a single undoable modifier
+    Nodes without color override attributes and locked or connected color plugs are skipped
+    :param nodes: list(str), nodes to change color of
+    :param color_index: int or None, Maya color index to set. Used if no RGB color is given
+    :param rgb_color: tuple(float, float, float) or None, linear RGB color to set
+    :param color_shapes: bool, Whether to color the shapes of the given transforms (and the given shapes) instead of
+        the given nodes
+    :return: list(str), full names of the colored nodes
+    """
+
+    color_nodes = list()
+    for node in python.force_list(nodes):
+        selection_list = maya.api.OpenMaya.MSelectionList()
+        try:
+            selection_list.add(node)
+        except RuntimeError:
+            continue
+        mobj = selection_list.getDependNode(0)
+        if not color_shapes or mobj.hasFn(maya.api.OpenMaya.MFn.kShape):
+            color_nodes.append(mobj)
+        elif mobj.hasFn(maya.api.OpenMaya.MFn.kTransform):
+            dag_fn = maya.api.OpenMaya.MFnDagNode(mobj)
+            color_nodes.extend([dag_fn.child(i) for i in range(dag_fn.childCount()) if dag_fn.child(i).hasFn(
+                maya.api.OpenMaya.MFn.kShape)])
+
+    def _set_plug_value(plug, value, set_fn):
+        if plug.isLocked or plug.isDestination:
+            return
+        set_fn(plug, value)
+
+    mod = maya.api.OpenMaya.MDGModifier()
+    colored_nodes = list()
+    for color_node in color_nodes:
+        node_fn = maya.api.OpenMaya.MFnDependencyNode(color_node)
+        if not node_fn.hasAttribute('overrideEnabled'):
+            continue
+        _set_plug_value(node_fn.findPlug('overrideEnabled', False), True, mod.newPlugValueBool)
+        if rgb_color is not None:
+            if not node_fn.hasAttribute('overrideRGBColors'):
+                continue
+            _set_plug_value(node_fn.findPlug('overrideRGBColors', False), True, mod.newPlugValueBool)
+            rgb_plug = node_fn.findPlug('overrideColorRGB', False)
+            for i in range(3):
+                _set_plug_value(rgb_plug.child(i), rgb_color[i], mod.newPlugValueFloat)
+        else:
+            if node_fn.hasAttribute('overrideRGBColors'):
+                _set_plug_value(node_fn.findPlug('overrideRGBColors', False), False, mod.newPlugValueBool)
+            _set_plug_value(node_fn.findPlug('overrideColor', False), color_index, mod.newPlugValueInt)
+        colored_nodes.append(_get_color_node_name(color_node))
+    if colored_nodes:
+        api_modifier.apply_modifier(mod)
+
+    return colored_nodes
+
+
+def _get_color_node(node, shape_types=None):
+    """
+    Internal function that returns the node whose override color is displayed for the given node
+    :param node: str
+    :param shape_types: set(str) or None, colorable shape types, subtypes included. If given, the given node (if it is
+        a colorable shape) or its first colorable shape is returned
+    :return: MObject or None
+    """
+
+    selection_list = maya.api.OpenMaya.MSelectionList()
+    try:
+        selection_list.add(node)
+    except RuntimeError:
+        return None
+    mobj = selection_list.getDependNode(0)
+    if shape_types is None:
+        return mobj
+
+    if not mobj.hasFn(maya.api.OpenMaya.MFn.kDagNode):
+        return None
+    dag_fn = maya.api.OpenMaya.MFnDagNode(mobj)
+    if _is_node_of_types(mobj, shape_types):
+        return mobj
+    for i in range(dag_fn.childCount()):
+        child = dag_fn.child(i)
+        if child.hasFn(maya.api.OpenMaya.MFn.kShape) and _is_node_of_types(child, shape_types):
+            return child
+
+    return None
+
+
+def _is_node_of_types(mobj, node_types):
+    """
+    Internal function that returns whether or not the given node is of any of the given types or inherits from them
+    Inherited types of each node type are only resolved once
+    :param mobj: MObject
+    :param node_types: set(str)
+    :return: bool
+    """
+
+    type_name = maya.api.OpenMaya.MFnDependencyNode(mobj).typeName
+    inherited_types = _INHERITED_NODE_TYPES.get(type_name)
+    if inherited_types is None:
+        inherited_types = set(maya.cmds.nodeType(type_name, inherited=True, isTypeName=True) or [type_name])
+        _INHERITED_NODE_TYPES[type_name] = inherited_types
+
+    return not inherited_types.isdisjoint(node_types)
+
+
+def _get_color_node_name(mobj):
+    """
+    Internal function that returns the full name of the given node
+    :param mobj: MObject
+    :return: str
+    """
+
+    if mobj.hasFn(maya.api.OpenMaya.MFn.kDagNode):
+        return maya.api.OpenMaya.MDagPath.getAPathTo(mobj).fullPathName()
+
+    return maya.api.OpenMaya.MFnDependencyNode(mobj).name()
+
+
 def get_node_by_id(node_id, full_path=True):
     """
     Returns a node by its UUID (support starting from Maya 2016)
@@ -1187,10 +1408,10 @@ def get_all_parents(node, full_path=True):
     :return: list(str)
     """
 
-    parents = maya.cmds.ls(node, long=True)[0].split('|')[1:-1]
-    if full_path:
-        parents = ['|'.join(parents[:i]) for i in range(1, 1 + len(parents))]
-        for i, obj in enumerate(parents):
-            parents[i] = '|{}'.format(obj)
+    from tpDcc.dccs.maya.core import hierarchy
+
+    parents = list(reversed(hierarchy.get_dag_snapshot().ancestors(node)))
+    if not full_path:
+        parents = [parent.rpartition('|')[-1] for parent in parents]
 
     return parents
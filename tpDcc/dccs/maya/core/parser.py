@@ -3,9 +3,19 @@
 
 """
 Module that contains Maya File Parser classes
+Dependencies of Maya ASCII files can be extracted from a shell:
+    python -m tpDcc.dccs.maya.core.parser scene.ma > manifest.json
 """
 
+from __future__ import print_function, division, absolute_import
+
+import io
+import sys
 import json
+import functools
+import multiprocessing
+
+from tpDcc.dccs.maya.core import dependencies
 
 
 class MayaParserBase(object):
@@ -339,6 +349,7 @@ class MayaAsciiParser(MayaAsciiParserBase):
         """
 
         lines = []
+        handled = None
 
         line = self.__stream.readline()
         while True:
@@ -354,20 +365,24 @@ class MayaAsciiParser(MayaAsciiParserBase):
             # A command may span multiple lines
             else:
                 line = line.rstrip("\r\n")
-                if line and line.endswith(";"):
-                    # Remove trailing semicolon here so the command line
-                    # processor doesn't have to deal with it.
-                    lines.append(line[:-1])
-                    break
-                elif line:
-                    lines.append(line)
+                if line:
+                    # Lines of commands we do not handle are skipped without being stored
+                    if handled is None:
+                        handled = self.has_command(line.lstrip().partition(" ")[0].rstrip(";"))
+                    if line.endswith(";"):
+                        # Remove trailing semicolon here so the command line
+                        # processor doesn't have to deal with it.
+                        if handled:
+                            lines.append(line[:-1])
+                        break
+                    elif handled:
+                        lines.append(line)
             line = self.__stream.readline()
 
         if lines:
             self.__parse_command_lines(lines)
-            return True
 
-        return False
+        return handled is not None
 
     def __parse_command_lines(self, lines):
         # Pop command name from the first line
@@ -420,3 +435,247 @@ class MayaAsciiParser(MayaAsciiParserBase):
 
             # Done tokenizing arguments, call command handler
             self.exec_command(command, args)
+
+
+class MayaAsciiDependencyParser(MayaAsciiParser):
+    """
+    Class to extract the file dependencies of Maya ASCII files: references, plugin requirements and file paths of
+    file and AlembicNode nodes
+    Only createNode, select, file, requires commands and setAttr commands of file and AlembicNode nodes are tokenized,
+    all other commands are skipped while the file is streamed
+    """
+
+    NODE_DEPENDENCY_TYPES = {'file': 'texture', 'AlembicNode': 'alembic'}
+    FILE_ATTRIBUTES = ('ftn', 'fn')
+    TEXTURE_ATTRIBUTES = ('uvt', 'ufe')
+
+    def __init__(self, stream):
+        super(MayaAsciiDependencyParser, self).__init__(stream)
+
+        self.maya_version = None
+        self.plugins = list()
+        self.references = list()
+        self.file_nodes = list()
+        self._current_node = None
+
+        self.register_handler('requires', self._exec_dependency_requires)
+        self.register_handler('file', self._exec_dependency_file)
+        self.register_handler('createNode', self._exec_dependency_create_node)
+        self.register_handler('select', self._exec_dependency_select)
+        self.register_handler('setAttr', self._exec_dependency_set_attr)
+
+    def has_command(self, command):
+        """
+        Overrides base has_command function to skip setAttr commands of nodes that are not file dependencies
+        :param command: str
+        :return: bool
+        """
+
+        if command == 'setAttr':
+            return self._current_node is not None
+
+        return super(MayaAsciiDependencyParser, self).has_command(command)
+
+    def get_dependencies(self):
+        """
+        Returns the dependencies found in the parsed file
+        :return: list(dict), dependencies with type, node and path keys (see dependencies.build_dependency_manifest)
+        """
+
+        file_dependencies = list()
+        for reference in self.references:
+            reference_dependency = {'type': 'reference'}
+            reference_dependency.update(reference)
+            file_dependencies.append(reference_dependency)
+        for file_node in self.file_nodes:
+            attributes = file_node['attributes']
+            attribute = next((attr for attr in self.FILE_ATTRIBUTES if attributes.get(attr)), None)
+            if not attribute:
+                continue
+            file_path = attributes[attribute]
+            if file_node['type'] == 'file':
+                file_path = dependencies.get_file_texture_pattern(
+                    file_path, uv_tiling_mode=int(attributes.get('uvt') or 0),
+                    use_frame_extension=attributes.get('ufe') in ('yes', 'true', '1'))
+            file_dependencies.append({
+                'type': self.NODE_DEPENDENCY_TYPES[file_node['type']], 'node': file_node['name'],
+                'attribute': attribute, 'path': file_path, 'value': attributes[attribute]})
+
+        return file_dependencies
+
+    def _exec_dependency_requires(self, args):
+        """
+        Internal function that handles requires commands: requires [-nodeType type] [-dataType type] plugin version
+        :param args: list(str)
+        """
+
+        node_types = list()
+        while len(args) > 2 and args[0].startswith('-'):
+            if args[0] in ('-nodeType', '-dataType'):
+                node_types.append(args[1])
+            args = args[2:]
+        if len(args) < 2:
+            return
+
+        if args[0] == 'maya':
+            self.maya_version = args[1]
+        else:
+            self.plugins.append({'name': args[0], 'version': args[1], 'node_types': node_types})
+
+    def _exec_dependency_file(self, args):
+        """
+        Internal function that handles file -r commands
+        :param args: list(str)
+        """
+
+        reference = {'namespace': None, 'node': None, 'file_type': None, 'deferred': False}
+        is_reference = False
+        argptr = 0
+        while argptr < len(args) - 1:
+            arg = args[argptr]
+            if arg in ('-r', '--reference'):
+                is_reference = True
+                argptr += 1
+            elif arg in ('-rdi', '--referenceDepthInfo'):
+                return
+            elif arg in ('-ns', '--namespace'):
+                reference['namespace'] = args[argptr + 1]
+                argptr += 2
+            elif arg in ('-dr', '--deferReference'):
+                reference['deferred'] = bool(int(args[argptr + 1]))
+                argptr += 2
+            elif arg in ('-rfn', '--referenceNode'):
+                reference['node'] = args[argptr + 1]
+                argptr += 2
+            elif arg in ('-typ', '--type'):
+                reference['file_type'] = args[argptr + 1]
+                argptr += 2
+            elif arg.startswith('-'):
+                argptr += 2
+            else:
+                break
+
+        if is_reference and argptr < len(args):
+            reference['path'] = _unescape(args[-1])
+            self.references.append(reference)
+
+    def _exec_dependency_create_node(self, args):
+        """
+        Internal function that handles createNode commands keeping track of current file dependency node
+        :param args: list(str)
+        """
+
+        self._current_node = None
+        if args[0] not in self.NODE_DEPENDENCY_TYPES:
+            return
+
+        name = None
+        for i, arg in enumerate(args[1:-1], start=1):
+            if arg in ('-n', '--name'):
+                name = args[i + 1]
+                break
+        self._current_node = {'type': args[0], 'name': name, 'attributes': dict()}
+        self.file_nodes.append(self._current_node)
+
+    def _exec_dependency_select(self, args):
+        """
+        Internal function that handles select commands
+        :param args: list(str)
+        """
+
+        self._current_node = None
+
+    def _exec_dependency_set_attr(self, args):
+        """
+        Internal function that handles setAttr commands of file dependency nodes
+        :param args: list(str)
+        """
+
+        attribute = args[0].lstrip('.')
+        if attribute in self.FILE_ATTRIBUTES or attribute in self.TEXTURE_ATTRIBUTES:
+            self._current_node['attributes'][attribute] = _unescape(args[-1])
+
+
+def extract_ascii_dependencies(file_path, root_directory=None, check_files=False, stat_cache=None, threads=None):
+    """
+    Extracts the dependencies of the given Maya ASCII file without Maya
+    :param file_path: str, path of the Maya ASCII file
+    :param root_directory: str or None, directory relative paths are resolved from
+    :param check_files: bool, Whether to expand file patterns and check files existence and size or not
+    :param stat_cache: dependencies.FileStatCache or None, cache of file stats and directory listings
+    :param threads: int or None, number of worker threads used to check the files
+    :return: dict, dependency manifest (see dependencies.build_dependency_manifest) with file (str),
+        maya_version (str) and plugins (list(dict), with name, version and node_types keys) keys
+    """
+
+    with io.open(file_path, 'r', buffering=1024 * 1024, encoding='utf-8', errors='replace') as stream:
+        parser = MayaAsciiDependencyParser(stream)
+        parser.parse()
+
+    manifest = dependencies.build_dependency_manifest(
+        parser.get_dependencies(), root_directory=root_directory, check_files=check_files, stat_cache=stat_cache,
+        threads=threads)
+    manifest['file'] = file_path
+    manifest['maya_version'] = parser.maya_version
+    manifest['plugins'] = parser.plugins
+
+    return manifest
+
+
+def extract_ascii_dependencies_batch(file_paths, processes=None, **kwargs):
+    """
+    Extracts the dependencies of the given Maya ASCII files using a pool of worker processes
+    :param file_paths: list(str), paths of the Maya ASCII files
+    :param processes: int or None, number of worker processes. If None, one per CPU is used
+    :param kwargs: dict, extra arguments passed to extract_ascii_dependencies
+    :return: list(dict), dependency manifest of each file. Manifests of files that could not be parsed only contain
+        file and error keys
+    """
+
+    extract_fn = functools.partial(_extract_ascii_dependencies, **kwargs)
+    file_paths = list(file_paths)
+    if len(file_paths) < 2 or processes == 1:
+        return [extract_fn(file_path) for file_path in file_paths]
+
+    processes = min(processes or multiprocessing.cpu_count(), len(file_paths))
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(extract_fn, file_paths, chunksize=max(1, len(file_paths) // (processes * 16)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _extract_ascii_dependencies(file_path, **kwargs):
+    """
+    Internal function that extracts the dependencies of the given Maya ASCII file and returns parsing errors in the
+    manifest instead of raising them, so a batch does not stop on a corrupted file
+    :param file_path: str
+    :param kwargs: dict
+    :return: dict
+    """
+
+    try:
+        return extract_ascii_dependencies(file_path, **kwargs)
+    except (MayaAsciiError, IndexError, ValueError, IOError, OSError) as exc:
+        return {'file': file_path, 'error': str(exc)}
+
+
+def _unescape(value):
+    """
+    Internal function that removes the escape characters of a Maya ASCII string value
+    :param value: str
+    :return: str
+    """
+
+    if '\\' not in value:
+        return value
+
+    return value.replace('\\\\', '\\').replace('\\"', '"')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python -m tpDcc.dccs.maya.core.parser <Maya ASCII file> [<Maya ASCII file> ...]')
+        sys.exit(1)
+    print(json.dumps(extract_ascii_dependencies_batch(sys.argv[1:]), indent=2, sort_keys=True))
@@ -11,6 +11,9 @@ import logging
 import traceback
 
 import maya.cmds
+import maya.api.OpenMaya
+
+from tpDcc.dccs.maya.core import callback
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
@@ -53,7 +56,7 @@ def is_reference(ref_node):
     :return: bool
     """
 
-    return ref_node in list_references()
+    return ref_node in get_reference_index()['references']
 
 
 def is_proxy_manager(node):
@@ -134,22 +137,13 @@ def get_reference_proxy_manager(ref_node):
     :return: str
     """
 
-    if not maya.cmds.attributeQuery('proxyMsg', n=ref_node, ex=True):
+    reference_data = get_reference_index()['references'].get(ref_node)
+    if not reference_data or not reference_data['proxy_manager']:
         LOGGER.warning(
-            'Reference "{}" has no proxyMsg attribute! Unable to determine proxy manager ...'.format(ref_node))
-        return None
-
-    proxy_manager = maya.cmds.ls(
-        maya.cmds.listConnections(ref_node + '.proxyMsg', s=True, d=False) or list(), type='proxyManager') or list()
-    if not proxy_manager:
-        LOGGER.warning('Reference "{}" has no valid proxyMsg connections! Unable to determine proxy manager ...')
+            'Reference "{}" has no valid proxyMsg connections! Unable to determine proxy manager ...'.format(ref_node))
         return None
 
-    if len(proxy_manager) > 1:
-        LOGGER.warning('Multiple proxy manager nodes attached to reference "{}"! Returning first node only ...')
-        LOGGER.warning(str(proxy_manager))
-
-    return proxy_manager[0]
+    return reference_data['proxy_manager']
 
 
 def get_references_from_proxy_manager(proxy_manager):
@@ -162,9 +156,11 @@ def get_references_from_proxy_manager(proxy_manager):
     if not is_proxy_manager(proxy_manager):
         raise Exception('Object "{}" is not a valid proxyManager node!'.format(proxy_manager))
 
-    ref_list = maya.cmds.listConnections(proxy_manager + '.proxyList', s=False, d=True) or list()
+    ref_list = get_reference_index()['proxy_managers'].get(proxy_manager)
+    if ref_list is None:
+        ref_list = maya.cmds.listConnections(proxy_manager + '.proxyList', s=False, d=True) or list()
 
-    return ref_list
+    return list(ref_list)
 
 
 def get_namespace(ref_node):
@@ -176,9 +172,11 @@ def get_namespace(ref_node):
 
     check_reference(ref_node)
 
-    namespace = maya.cmds.referenceQuery(ref_node, namespace=True)
-    if namespace.startswith(':'):
-        namespace = namespace[1:]
+    # Namespaces can be renamed without Maya sending any message, so the namespace is not taken from the index
+    namespace = _get_associated_namespace(ref_node)
+    index = _REFERENCE_INDEX.value
+    if index and index['references'].get(ref_node, dict()).get('namespace') != namespace:
+        _REFERENCE_INDEX.invalidate()
 
     return namespace
 
@@ -186,48 +184,154 @@ def get_namespace(ref_node):
 def get_reference_from_namespace(namespace, parent_namespace=None):
     """
     Returns the reference node associated with the given namespace
+    If the reference is managed by a proxy manager, its active proxy reference node is returned
     :param namespace: str, namespace to query reference node from
     :param parent_namespace: str or None, parent namespace to query reference nodes from
     :return: str or None
     """
 
     if namespace.endswith(':'):
+        namespace = namespace[:-1]
+    if namespace.startswith(':'):
         namespace = namespace[1:]
     if not maya.cmds.namespace(ex=namespace):
         raise Exception('Namespace "{}" does not exists!'.format(namespace))
 
     if parent_namespace:
-        parent_namespace += ':'
-    else:
-        parent_namespace = ''
+        namespace = '{}:{}'.format(parent_namespace.strip(':'), namespace)
+
+    # the index is only rebuilt if the indexed reference namespace was renamed, which Maya does not notify
+    ref_node = get_reference_index()['namespaces'].get(namespace)
+    if ref_node and _get_associated_namespace(ref_node) != namespace:
+        ref_node = get_reference_index(refresh=True)['namespaces'].get(namespace)
+    if not ref_node:
+        LOGGER.warning('Unable to determine reference from namespace: {}'.format(namespace))
+        return ''
+
+    return ref_node
+
+
+def get_reference_index(refresh=False):
+    """
+    Returns the index of the references of the current scene
+    The index is built once iterating all reference nodes and it is invalidated when a reference is created,
+    removed, loaded, unloaded or imported, when a reference node is renamed and when a new scene is opened.
+    Namespace renames are not notified by Maya, so namespaces must be validated before using them.
+    Returned dictionaries must not be modified
+    :param refresh: bool, Whether to force the rebuild of the index
+    :return: dict, index with the following keys:
+        references (dict(str, dict)), reference node data (namespace, file, loaded, proxy_manager and
+        active_reference) of each reference node
+        namespaces (dict(str, str)), reference node of each namespace (active proxy reference if the reference is
+        managed by a proxy manager)
+        proxy_managers (dict(str, list(str))), reference nodes of each proxy manager
+    """
+
+    return _REFERENCE_INDEX.get(refresh=refresh)
+
+
+def clear_reference_index():
+    """
+    Removes the index of the references of the current scene and its callbacks
+    """
+
+    _REFERENCE_INDEX.clear()
+
+
+def _build_reference_index():
+    """
+    Internal function that builds the index of the references of the current scene
+    :return: dict
+    """
 
-    for ref_node in list_references(parent_namespace):
+    references = dict()
+    proxy_managers = dict()
+    node_it = maya.api.OpenMaya.MItDependencyNodes(maya.api.OpenMaya.MFn.kReference)
+    while not node_it.isDone():
+        reference_fn = maya.api.OpenMaya.MFnReference(node_it.thisNode())
+        node_it.next()
+        ref_node = reference_fn.name()
+        if 'sharedReferenceNode' in ref_node or '_UNKNOWN_REF_NODE_' in ref_node:
+            continue
         try:
-            ref_namespace = maya.cmds.referenceQuery(ref_node, namespace=True)
-        except Exception:
+            namespace = reference_fn.associatedNamespace(False)
+            file_path = reference_fn.fileName(True, True, False)
+            loaded = reference_fn.isLoaded()
+        except RuntimeError:
             continue
+        proxy_manager, active_reference = _get_proxy_data(reference_fn)
+        references[ref_node] = {
+            'namespace': namespace.lstrip(':'),
+            'file': file_path,
+            'loaded': loaded,
+            'proxy_manager': proxy_manager,
+            'active_reference': active_reference
+        }
+        if proxy_manager:
+            proxy_managers.setdefault(proxy_manager, list()).append(ref_node)
+
+    namespaces = dict()
+    for ref_node, reference_data in references.items():
+        active_reference = reference_data['active_reference']
+        if active_reference in references:
+            namespaces[references[active_reference]['namespace']] = active_reference
+        else:
+            namespaces.setdefault(reference_data['namespace'], ref_node)
 
-        if ref_namespace.startswith(':'):
-            ref_namespace = ref_namespace[1:]
-
-        if ref_namespace == parent_namespace + namespace:
-            if maya.cmds.attributeQuery('proxyMsg', n=ref_node, ex=True):
-                proxy_manager = maya.cmds.ls(
-                    maya.cmds.listConnections(
-                        ref_node + '.proxyMsg', s=True, d=True) or list(), type='proxyManager') or list()
-                if proxy_manager:
-                    active_proxy_plug = maya.cmds.connectionInfo(
-                        proxy_manager[0] + '.activeProxy', destinationFromSource=True)[0]
-                    active_proxy_info = maya.cmds.connectionInfo(active_proxy_plug, destinationFromSource=True)
-                    if not active_proxy_info:
-                        raise Exception(
-                            'Error getting active reference from proxy manager "{}"!'.format(proxy_manager[0]))
-                    return maya.cmds.ls(active_proxy_info[0], o=True)[0]
-
-            return ref_node
+    return {'references': references, 'namespaces': namespaces, 'proxy_managers': proxy_managers}
 
-        LOGGER.warning('Unable to determine reference from namespace: {}'.format(namespace))
-        return ''
+
+def _get_proxy_data(reference_fn):
+    """
+    Internal function that returns the proxy manager of the given reference node and its active proxy reference node
+    :param reference_fn: MFnReference
+    :return: tuple(str or None, str or None)
+    """
+
+    if not reference_fn.hasAttribute('proxyMsg'):
+        return None, None
+
+    for other_plug in reference_fn.findPlug('proxyMsg', False).connectedTo(True, True):
+        proxy_manager_fn = maya.api.OpenMaya.MFnDependencyNode(other_plug.node())
+        if proxy_manager_fn.typeName != 'proxyManager':
+            continue
+        active_reference = None
+        for proxy_plug in proxy_manager_fn.findPlug('activeProxy', False).connectedTo(False, True):
+            for reference_plug in proxy_plug.connectedTo(False, True):
+                active_reference = maya.api.OpenMaya.MFnDependencyNode(reference_plug.node()).name()
+                break
+        return proxy_manager_fn.name(), active_reference
+
+    return None, None
+
+
+def _get_associated_namespace(ref_node):
+    """
+    Internal function that returns the namespace currently associated with the given reference node
+    :param ref_node: str
+    :return: str
+    """
+
+    selection_list = maya.api.OpenMaya.MSelectionList()
+    selection_list.add(ref_node)
+
+    return maya.api.OpenMaya.MFnReference(selection_list.getDependNode(0)).associatedNamespace(False).lstrip(':')
+
+
+def _on_node_name_changed(index, node, *args):
+    """
+    Internal callback function called when a node is renamed
+    """
+
+    if node.hasFn(maya.api.OpenMaya.MFn.kReference):
+        _REFERENCE_INDEX.invalidate()
+
+
+_REFERENCE_INDEX = callback.SceneCache(_build_reference_index)
+_REFERENCE_INDEX.add_scene_callback()
+_REFERENCE_INDEX.add_node_added_callback(node_type='reference')
+_REFERENCE_INDEX.add_node_removed_callback(node_type='reference')
+_REFERENCE_INDEX.add_name_changed_callback(_on_node_name_changed)
 
 
 def all_references_from_namespace(namespace):
@@ -1268,37 +1268,44 @@ def parent_shape_in_place(transform, shape_source, keep_source=True, replace_sha
         maya.cmds.parent(shape, transform, add=True, shape=True)
 
 
-def create_follow_fade(source_guide, drivers, skip_lower=0.0001):
+def create_follow_fade(source_guide, drivers, skip_lower=0.0001, spatial_index=None):
     """
     Creates a multiply divide for each transform in drivers with a weight value based on the distance from source guide
     :param source_guide: str, name of a transform in maya to calculate distance from
     :param drivers: list(str), list of drivers to apply fade based in the distance from source guide
     :param skip_lower: float, distance below which multiplyDivide no fading stops
+    :param spatial_index: TransformSpatialIndex or None, prebuilt index containing the drivers. Useful when creating
+        fades for multiple guides with the same drivers
     :return: list(str), list of multiplyDivide nodes created
     """
 
     distance_list, distance_dict, original_distance_order = transform_utils.get_ordered_distance_and_transform(
-        source_guide, drivers)
+        source_guide, drivers, spatial_index=spatial_index)
     multiplies = list()
 
     if not distance_list[-1] > 0:
         return multiplies
 
-    for dst in original_distance_order:
-        scaler = 1.0 - (dst / distance_list[-1])
-        if scaler <= skip_lower:
-            continue
-        multi = attr_utils.MultiplyDivideNode(source_guide)
-        multi.set_input2(scaler, scaler, scaler)
-        multi.input1X_in('{}.translateX'.format(source_guide))
-        multi.input1Y_in('{}.translateY'.format(source_guide))
-        multi.input1Z_in('{}.translateZ'.format(source_guide))
-
-        for driver in distance_dict[dst]:
-            multi.outputX_out('{}.translateX'.format(driver))
-            multi.outputY_out('{}.translateY'.format(driver))
-            multi.outputZ_out('{}.translateZ'.format(driver))
-
+    # multiply nodes creation, their unique names, input values and connections are applied in one go
+    fades = list()
+    with attr_utils.GraphBuilder() as builder:
+        for dst in original_distance_order:
+            scaler = 1.0 - (dst / distance_list[-1])
+            if scaler <= skip_lower:
+                continue
+            multi = attr_utils.MultiplyDivideNode(source_guide, builder=builder)
+            multi.set_input2(scaler, scaler, scaler)
+            multi.input1X_in('{}.translateX'.format(source_guide))
+            multi.input1Y_in('{}.translateY'.format(source_guide))
+            multi.input1Z_in('{}.translateZ'.format(source_guide))
+            for driver in distance_dict[dst]:
+                multi.outputX_out('{}.translateX'.format(driver))
+                multi.outputY_out('{}.translateY'.format(driver))
+                multi.outputZ_out('{}.translateZ'.format(driver))
+            fades.append((dst, multi))
+
+    for dst, multi in fades:
+        driver = distance_dict[dst][-1]
         multi_dict = dict()
         multi_dict['node'] = multi
         multi_dict['source'] = source_guide
@@ -8,10 +8,12 @@ Module that contains functions and classes related with Maya scene
 from __future__ import print_function, division, absolute_import
 
 import os
+import time
 import string
 import logging
 import traceback
 import contextlib
+from collections import OrderedDict
 
 from Qt.QtWidgets import QMessageBox
 
@@ -21,10 +23,17 @@ import maya.api.OpenMaya
 from tpDcc import dcc
 from tpDcc.abstract import scene
 from tpDcc.libs.python import python, path as path_utils
-from tpDcc.dccs.maya.core import helpers, name as name_utils, node as node_utils
+from tpDcc.dccs.maya.api import modifier as api_modifier
+from tpDcc.dccs.maya.core import helpers, name as name_utils, node as node_utils, hierarchy, dependencies
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
+TEXTURE_NODE_ATTRIBUTES = OrderedDict([
+    ('file', 'fileTextureName'),
+    ('imagePlane', 'imageName'),
+    ('aiImage', 'filename')
+])
+
 
 class MayaScene(scene.AbstractScene, object):
     def __init__(self):
@@ -326,29 +335,61 @@ def find_additional_scene_dependencies(references=True, textures=True):
 
     ref_paths = set()
     if references:
-        ref_paths.union(find_scene_references())
+        ref_paths.update(find_scene_references())
     if textures:
-        ref_paths.union(find_scene_textures())
+        ref_paths.update(find_scene_textures())
 
     return ref_paths
 
 
+def iter_texture_nodes_data(include_references=True, node_attributes=None):
+    """
+    Generator function that returns the file path data of each texture node of the current scene
+    Nodes are retrieved from the node type index and attributes are read through the API, so no command is executed
+    per node
+    :param include_references: bool, Whether to include referenced texture nodes or not
+    :param node_attributes: dict(str, str) or None, node types with the name of their file path attribute.
+        If not given, TEXTURE_NODE_ATTRIBUTES is used
+    :return: Generator<dict>, with node (str), type (str), attribute (str), path (str, attribute value),
+        pattern (str, path with UDIM, UV tile or frame tokens of tiled or sequence file textures) and
+        referenced (bool) keys
+    """
+
+    from tpDcc.dccs.maya.core import filtertypes
+
+    node_type_index = filtertypes.get_node_type_index()
+    for node_type, attribute in (node_attributes or TEXTURE_NODE_ATTRIBUTES).items():
+        for node_name in node_type_index.nodes(node_type):
+            selection_list = maya.api.OpenMaya.MSelectionList()
+            try:
+                selection_list.add(node_name)
+                node_fn = maya.api.OpenMaya.MFnDependencyNode(selection_list.getDependNode(0))
+                texture_path = node_fn.findPlug(attribute, False).asString()
+            except RuntimeError:
+                continue
+            if not texture_path:
+                continue
+            referenced = node_fn.isFromReferencedFile
+            if referenced and not include_references:
+                continue
+            pattern = texture_path
+            tiled = node_fn.hasAttribute('computedFileTextureNamePattern') and any((
+                node_fn.findPlug('uvTilingMode', False).asInt(), node_fn.findPlug('useFrameExtension', False).asBool()))
+            if tiled:
+                pattern = node_fn.findPlug('computedFileTextureNamePattern', False).asString() or texture_path
+            yield {
+                'node': node_name, 'type': node_type, 'attribute': attribute, 'path': texture_path,
+                'pattern': pattern, 'referenced': referenced}
+
+
 def find_scene_textures():
     """
     Find scene texture dependencies of the current scene that are not referenced
     :return: set<str>
     """
 
-    paths = set()
-    for f in maya.cmds.ls(long=True, type='file'):
-        if maya.cmds.referenceQuery(f, isNodeReferenced=True):
-            continue
-
-        texture_path = maya.cmds.getAttr(os.path.normpath('.'.join([f, 'fileTextureName'])))
-        if texture_path:
-            paths.add(texture_path)
-
-    return paths
+    return set(texture_data['path'] for texture_data in iter_texture_nodes_data(
+        include_references=False, node_attributes={'file': 'fileTextureName'}))
 
 
 def find_texture_node_pairs():
@@ -358,16 +399,8 @@ def find_texture_node_pairs():
     :return: set<str>
     """
 
-    paths = set()
-    for f in maya.cmds.ls(long=True, type='file'):
-        if maya.cmds.referenceQuery(f, isNodeReferenced=True):
-            continue
-
-        texture_path = maya.cmds.getAttr(os.path.normpath('.'.join([f, 'fileTextureName'])))
-        if texture_path:
-            paths.add((f, texture_path))
-
-    return paths
+    return set((texture_data['node'], texture_data['path']) for texture_data in iter_texture_nodes_data(
+        include_references=False, node_attributes={'file': 'fileTextureName'}))
 
 
 def iter_texture_node_pairs(include_references=False):
@@ -376,26 +409,65 @@ def iter_texture_node_pairs(include_references=False):
     :return:
     """
 
-    for f in maya.cmds.ls(long=True, type='file'):
-        if include_references and maya.cmds.referenceQuery(f, isNodeReferenced=True):
-            continue
-
-        texture_path = maya.cmds.getAttr(os.path.normpath('.'.join([f, 'fileTextureName'])))
-        if texture_path:
-            yield ([f, texture_path])
+    for texture_data in iter_texture_nodes_data(
+            include_references=include_references, node_attributes={'file': 'fileTextureName'}):
+        yield [texture_data['node'], texture_data['path']]
 
 
 def find_scene_references():
     paths = set()
 
     for ref in iter_references():
-        ref_path = ref.fileName(True, False, False).replace('/', os.path.sep)
+        ref_path = maya.api.OpenMaya.MFnReference(ref).fileName(True, False, False).replace('/', os.path.sep)
         if ref_path:
             paths.add(ref_path)
 
     return paths
 
 
+def scan_scene_dependencies(references=True, textures=True, include_references=True, check_files=True,
+                            stat_cache=None, threads=None):
+    """
+    Scans the file dependencies of the current scene and returns a dependency manifest
+    Texture paths are expanded using their UDIM, UV tile or frame tokens and all files are checked through a pool of
+    worker threads. Relative paths are resolved from the current workspace
+    :param references: bool, Whether to include loaded reference files or not
+    :param textures: bool, Whether to include texture files or not
+    :param include_references: bool, Whether to include textures of referenced nodes or not
+    :param check_files: bool, Whether to expand file patterns and check files existence and size or not
+    :param stat_cache: dependencies.FileStatCache or None, cache of file stats shared between scans
+    :param threads: int or None, number of worker threads used to check the files
+    :return: dict, dependency manifest (see dependencies.build_dependency_manifest) with timings. Each dependency
+        keeps the type of the node it comes from under node_type
+    """
+
+    start = time.time()
+    scene_dependencies = list()
+    if references:
+        for ref in iter_references():
+            reference_fn = maya.api.OpenMaya.MFnReference(ref)
+            ref_path = reference_fn.fileName(True, False, False)
+            if ref_path:
+                scene_dependencies.append({
+                    'type': 'reference', 'node': reference_fn.name(), 'node_type': 'reference', 'path': ref_path})
+    if textures:
+        for texture_data in iter_texture_nodes_data(include_references=include_references):
+            texture_data['node_type'] = texture_data['type']
+            texture_data['type'] = 'texture'
+            texture_data['value'] = texture_data['path']
+            texture_data['path'] = texture_data.pop('pattern')
+            scene_dependencies.append(texture_data)
+    collect_time = time.time() - start
+
+    start = time.time()
+    manifest = dependencies.build_dependency_manifest(
+        scene_dependencies, root_directory=maya.cmds.workspace(query=True, rootDirectory=True),
+        check_files=check_files, stat_cache=stat_cache, threads=threads)
+    manifest['timings'] = {'collect_time': collect_time, 'resolve_time': time.time() - start}
+
+    return manifest
+
+
 @contextlib.contextmanager
 def isolated_nodes(nodes, panel):
     """
@@ -454,7 +526,7 @@ def get_top_dag_nodes(exclude_cameras=True, namespace=None):
     :return: list<str>
     """
 
-    top_transforms = maya.cmds.ls(assemblies=True)
+    top_transforms = [top_node.lstrip('|') for top_node in hierarchy.get_dag_snapshot().top_level()]
     if exclude_cameras:
         cameras = get_scene_cameras(get_transforms=True)
         for camera in cameras:
@@ -478,12 +550,12 @@ def get_top_dag_nodes_in_list(list_of_transforms):
     :return: list<str>
     """
 
+    dag_snapshot = hierarchy.get_dag_snapshot()
     found = list()
     for xform in list_of_transforms:
-        long_name = maya.cmds.ls(xform, long=True)
-        if long_name:
-            if long_name[0].count('|') == 1:
-                found.append(xform)
+        index = dag_snapshot.index(xform)
+        if index is not None and dag_snapshot.is_top_level(dag_snapshot.full_path(index)):
+            found.append(xform)
 
     return found
 
@@ -496,14 +568,13 @@ def get_node_transform_root(node, full_path=True):
     :return: str
     """
 
-    while True:
-        parent = maya.cmds.listRelatives(node, parent=True, fullPath=full_path)
-        if not parent:
-            break
+    dag_snapshot = hierarchy.get_dag_snapshot()
+    if dag_snapshot.is_top_level(node):
+        return node
 
-        node = parent[0]
+    root = dag_snapshot.root(node)
 
-    return node
+    return root if full_path else root.lstrip('|')
 
 
 def get_root_node():
@@ -540,23 +611,7 @@ def get_all_parent_nodes(node_name):
     :return: list(str)
     """
 
-    def _append_parents(node_name_, node_list_):
-        """
-        Internal function to recursively append parents to list
-        :param node_name_: str
-        :param node_list_: list<str>
-        """
-
-        parents = maya.cmds.listRelatives(node_name_, parent=True, fullPath=True, type='transform')
-        if parents:
-            for parent in parents:
-                node_list_.append(parent)
-                _append_parents(parent, node_list_)
-
-    node_list = list()
-    _append_parents(node_name, node_list)
-
-    return node_list
+    return hierarchy.get_dag_snapshot().ancestors(node_name, transforms_only=True)
 
 
 def get_all_children_nodes(node_name):
@@ -566,23 +621,7 @@ def get_all_children_nodes(node_name):
     :return: list<str>
     """
 
-    def _append_children(node_name_, node_list_):
-        """
-        Internal function to recursively append children to list
-        :param node_name_: str
-        :param node_list_: list<str>
-        """
-
-        children = maya.cmds.listRelatives(node_name_, fullPath=True, type='transform')
-        if children:
-            for child in children:
-                node_list_.append(child)
-                _append_children(child, node_list_)
-
-    node_list = list()
-    _append_children(node_name, node_list)
-
-    return node_list
+    return hierarchy.get_dag_snapshot().descendants(node_name, transforms_only=True)
 
 
 def get_sets():
@@ -646,16 +685,17 @@ def delete_turtle_nodes():
 def delete_unused_plugins():
     """
     Removes all nodes in the scene that belongs to unused plugins (plugins that are not loaded)
+    :return: list(str), removed plugins
     """
 
     # This functionality is not available in old Maya versions
     list_cmds = dir(maya.cmds)
     if 'unknownPlugin' not in list_cmds:
-        return
+        return list()
 
     unknown_nodes = maya.cmds.ls(type='unknown')
     if unknown_nodes:
-        return
+        return list()
 
     unused = list()
     unknown_plugins = maya.cmds.unknownPlugin(query=True, list=True)
@@ -669,6 +709,8 @@ def delete_unused_plugins():
 
     LOGGER.debug('Removed unused plugins: {}'.format(unused))
 
+    return unused
+
 
 def delete_garbage():
     """
@@ -714,12 +756,207 @@ def delete_garbage():
     LOGGER.debug('Delete Garbage Nodes: {}'.format(garbage_nodes))
 
 
-def clean_scene():
+class SceneGarbageCollector(object):
+    """
+    Finds and deletes garbage nodes of current scene: unknown nodes, Turtle nodes, hyper graph layout nodes and
+    empty sets and partitions
+    All scene nodes are visited once, emptiness of sets and partitions is evaluated from cached connections (that
+    are updated when a connected node is collected) and all garbage nodes are deleted with a single modifier. If any
+    of them cannot be deleted, nodes are deleted one by one and only the deleted ones are reported
+    """
+
+    TURTLE_TYPES = ('ilrBakeLayer', 'ilrBakeLayerManager', 'ilrOptionsNode', 'ilrUIOptionsNode')
+    LAYOUT_TYPES = ('hyperLayout', 'hyperView')
+    DEFAULT_NODES = (
+        'defaultLightSet', 'defaultObjectSet', 'initialShadingGroup', 'uiConfigurationScriptNode',
+        'sceneConfigurationScriptNode', 'characterPartition')
+    IGNORED_CONNECTIONS = ('defaultRenderGlobals',)
+
+    def __init__(self):
+        self._stats = dict()
+
+    @property
+    def stats(self):
+        """
+        Returns timing information of each phase of the last collection
+        :return: dict
+        """
+
+        return dict(self._stats)
+
+    def collect(self):
+        """
+        Returns all garbage nodes of current scene
+        :return: dict(str, list(MObject)), garbage nodes of each category (unknown, turtle, layout and empty)
+        """
+
+        self._stats = dict()
+        start = time.time()
+
+        # Maya 2014 crashes when trying to remove hyper graph layout nodes
+        layout_types = self.LAYOUT_TYPES if helpers.get_maya_version() > 2014 else tuple()
+
+        collected = dict()
+        candidates = list()
+        node_it = maya.api.OpenMaya.MItDependencyNodes()
+        while not node_it.isDone():
+            mobj = node_it.thisNode()
+            node_it.next()
+            node_fn = maya.api.OpenMaya.MFnDependencyNode(mobj)
+            if node_fn.isFromReferencedFile or node_fn.isDefaultNode or node_fn.isShared:
+                continue
+            type_name = node_fn.typeName
+            if type_name == 'unknown':
+                collected[maya.api.OpenMaya.MObjectHandle(mobj).hashCode()] = (mobj, 'unknown')
+            elif type_name in self.TURTLE_TYPES:
+                collected[maya.api.OpenMaya.MObjectHandle(mobj).hashCode()] = (mobj, 'turtle')
+            elif type_name in layout_types:
+                collected[maya.api.OpenMaya.MObjectHandle(mobj).hashCode()] = (mobj, 'layout')
+            elif mobj.hasFn(maya.api.OpenMaya.MFn.kSet) or mobj.hasFn(maya.api.OpenMaya.MFn.kPartition):
+                if node_fn.name() not in self.DEFAULT_NODES:
+                    candidates.append(mobj)
+        self._stats['scan_time'] = time.time() - start
+
+        start = time.time()
+        connections = dict()
+        dependents = dict()
+        objects = dict()
+        for mobj in candidates:
+            node_fn = maya.api.OpenMaya.MFnDependencyNode(mobj)
+            if self._has_keyable_user_attributes(node_fn):
+                continue
+            handle = maya.api.OpenMaya.MObjectHandle(mobj).hashCode()
+            connected = set()
+            for plug in node_fn.getConnections():
+                for other_plug in plug.connectedTo(True, True):
+                    other_node = other_plug.node()
+                    if maya.api.OpenMaya.MFnDependencyNode(other_node).name() in self.IGNORED_CONNECTIONS:
+                        continue
+                    connected.add(maya.api.OpenMaya.MObjectHandle(other_node).hashCode())
+            connected.discard(handle)
+            connections[handle] = connected
+            objects[handle] = mobj
+            for other_handle in connected:
+                dependents.setdefault(other_handle, set()).add(handle)
+
+        pending = list(collected)
+        for handle, connected in connections.items():
+            if not connected:
+                collected[handle] = (objects[handle], 'empty')
+                pending.append(handle)
+        while pending:
+            handle = pending.pop()
+            for dependent in dependents.pop(handle, set()):
+                if dependent in collected:
+                    continue
+                connected = connections[dependent]
+                connected.discard(handle)
+                if not connected:
+                    collected[dependent] = (objects[dependent], 'empty')
+                    pending.append(dependent)
+        self._stats['evaluate_time'] = time.time() - start
+
+        garbage = {'unknown': list(), 'turtle': list(), 'layout': list(), 'empty': list()}
+        for mobj, category in collected.values():
+            garbage[category].append(mobj)
+
+        return garbage
+
+    def clean(self, dry_run=False):
+        """
+        Deletes all garbage nodes of current scene and the plugins that are not used anymore
+        :param dry_run: bool, If True, garbage nodes are found but nothing is deleted
+        :return: dict(str, list(str)), names of the garbage nodes of each category and removed plugins
+        """
+
+        garbage = self.collect()
+        report = dict()
+        for category, mobjs in garbage.items():
+            report[category] = [maya.api.OpenMaya.MFnDependencyNode(mobj).name() for mobj in mobjs]
+        report['plugins'] = list()
+        if dry_run:
+            return report
+
+        start = time.time()
+        category_handles = dict()
+        for category, mobjs in garbage.items():
+            category_handles[category] = [maya.api.OpenMaya.MObjectHandle(mobj) for mobj in mobjs]
+        handles = [handle for handles_list in category_handles.values() for handle in handles_list]
+        if handles:
+            mod = maya.api.OpenMaya.MDGModifier()
+            for handle in handles:
+                self._delete_node(mod, handle.object())
+            try:
+                api_modifier.apply_modifier(mod)
+            except RuntimeError as exc:
+                # one node that cannot be deleted aborts the whole modifier, so nodes are deleted one by one instead
+                LOGGER.debug('Garbage nodes could not be deleted at once, deleting them one by one: {}'.format(exc))
+                try:
+                    mod.undoIt()
+                except RuntimeError:
+                    pass
+                for handle in handles:
+                    if not handle.isValid():
+                        continue
+                    node_mod = maya.api.OpenMaya.MDGModifier()
+                    self._delete_node(node_mod, handle.object())
+                    try:
+                        api_modifier.apply_modifier(node_mod)
+                    except RuntimeError as exc:
+                        LOGGER.warning('Impossible to delete garbage node "{}": {}'.format(
+                            maya.api.OpenMaya.MFnDependencyNode(handle.object()).name(), exc))
+            # only nodes that were actually deleted are reported
+            for category, handles_list in category_handles.items():
+                report[category] = [
+                    name for name, handle in zip(report[category], handles_list) if not handle.isValid()]
+        self._stats['delete_time'] = time.time() - start
+
+        start = time.time()
+        report['plugins'] = delete_unused_plugins()
+        self._stats['plugins_time'] = time.time() - start
+
+        return report
+
+    def _delete_node(self, mod, mobj):
+        """
+        Internal function that adds the deletion of the given node, unlocking it first if necessary, to a modifier
+        :param mod: MDGModifier
+        :param mobj: MObject
+        """
+
+        node_fn = maya.api.OpenMaya.MFnDependencyNode(mobj)
+        if node_fn.isLocked:
+            mod.commandToExecute('lockNode -lock off "{}";'.format(node_fn.name()))
+        mod.deleteNode(mobj)
+
+    def _has_keyable_user_attributes(self, node_fn):
+        """
+        Internal function that returns whether or not given node has keyable user defined attributes
+        :param node_fn: MFnDependencyNode
+        :return: bool
+        """
+
+        for i in range(node_fn.attributeCount()):
+            attr = node_fn.attribute(i)
+            if node_fn.attributeClass(attr) != maya.api.OpenMaya.MFnDependencyNode.kLocalDynamicAttr:
+                continue
+            if maya.api.OpenMaya.MFnAttribute(attr).keyable:
+                return True
+
+        return False
+
+
+def clean_scene(dry_run=False):
     """
     Cleans invalid nodes from current scene
+    :param dry_run: bool, If True, invalid nodes are reported but nothing is deleted
+    :return: dict, names of removed nodes of each category (unknown, turtle, layout and empty), removed plugins and
+        timing information of each phase
     """
 
-    delete_unknown_nodes()
-    delete_turtle_nodes()
-    delete_unused_plugins()
-    delete_garbage()
+    collector = SceneGarbageCollector()
+    report = collector.clean(dry_run=dry_run)
+    report['timings'] = collector.stats
+    LOGGER.debug('Clean scene: {}'.format(report))
+
+    return report
@@ -7,8 +7,9 @@ Module that contains functions and classes related with skins
 
 from __future__ import print_function, division, absolute_import
 
+import time
+import heapq
 import logging
-import cStringIO
 import traceback
 
 import maya.cmds
@@ -17,14 +18,20 @@ import maya.api.OpenMaya
 import maya.api.OpenMayaAnim
 
 from tpDcc import dcc
+from tpDcc.core import command
 from tpDcc.dccs.maya import api
 from tpDcc.libs.python import python, mathlib, kdtree
-from tpDcc.dccs.maya.api import mathlib as api_mathlib, skin as api_skin
+from tpDcc.dccs.maya.api import mathlib as api_mathlib, skin as api_skin, plugs as api_plugs, modifier as api_modifier
 from tpDcc.dccs.maya.core import decorators, exceptions, deformer, attribute, node as node_utils, mesh as mesh_utils
+from tpDcc.dccs.maya.core import skinfile, spatial, callback
 from tpDcc.dccs.maya.core import joint as jnt_utils, transform as xform_utils, shape as shape_utils, name as name_utils
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
+# vertex mirror maps of the current scene, by mesh shape and mirror axis
+_VERTEX_MIRROR_MAP_CACHE = callback.SceneCache(dict)
+_VERTEX_MIRROR_MAP_CACHE.add_scene_callback()
+
 
 class ShowJointInfluence(object):
     """
@@ -91,47 +98,38 @@ class ShowJointInfluence(object):
 
         affected_verts = list()
         affected_value = list()
+        affected_positions = list()
 
-        connections = list(set(maya.cmds.listConnections(self.joint, type='skinCluster')))
+        connections = list(set(maya.cmds.listConnections(self.joint, type='skinCluster') or list()))
         if len(connections) <= 0:
             LOGGER.warning('Wrapped joint "{}" has no skinCluster!'.format(self.joint))
             return
 
         for skin_cluster in connections:
-            skin_cluster_set = None
-            tree_connections = maya.cmds.listConnections(
-                skin_cluster, destination=True, source=False, plugs=False, connections=False)
-            for branch in tree_connections:
-                node_type = maya.cmds.nodeType(branch)
-                if node_type == 'objectSet':
-                    skin_cluster_set = branch
-                    break
-
-            if skin_cluster_set <= 0:
+            geometries = maya.cmds.skinCluster(skin_cluster, query=True, geometry=True) or list()
+            meshes = maya.cmds.ls(geometries, type='mesh')
+            if not meshes:
                 LOGGER.warning(
-                    'Wrapped joint "{}" with skinCluster "{}" has no valid SkinClusterSet'.format(
-                        self.joint, skin_cluster))
+                    'Wrapped joint "{}" with skinCluster "{}" has no valid mesh'.format(self.joint, skin_cluster))
                 return
 
-            obj = maya.cmds.listConnections(
-                skin_cluster_set, destination=True, source=False, plugs=False, connections=False)
-            vertex_num = maya.cmds.polyEvaluate(obj, vertex=True)
-            for vtx in range(vertex_num):
-                self._display_weighted_verts.step()
-                vtx_name = '{0}.vtx[{1}]'.format(obj[0], str(vtx))
-                weights = maya.cmds.skinPercent(skin_cluster, vtx_name, query=True, value=True)
-                influences = maya.cmds.skinPercent(skin_cluster, vtx_name, query=True, transform=None)
-                for i in range(len(influences)):
-                    if influences[i] == self.joint and weights[i] > 0:
-                        affected_verts.append(vtx_name)
-                        affected_value.append(weights[i])
-                        break
+            for mesh in meshes:
+                influence_weights = get_influence_vertex_weights(mesh, influences=self.joint)
+                if not influence_weights:
+                    continue
+                vertices, weights = influence_weights[self.joint]
+                points = mesh_utils.get_mesh_fn(mesh).getPoints(maya.api.OpenMaya.MSpace.kWorld)
+                for vertex, weight in zip(vertices, weights):
+                    self._display_weighted_verts.step()
+                    affected_verts.append('{}.vtx[{}]'.format(mesh, vertex))
+                    affected_value.append(weight)
+                    affected_positions.append(points[vertex])
 
         if self.show_weights:
             maya.cmds.select(clear=True)
             grp = maya.cmds.group(empty=True, n='annotations_{}'.format(self.joint))
             for i in range(len(affected_verts)):
-                pos = maya.cmds.pointPosition(affected_verts[i], world=True)
+                pos = affected_positions[i]
                 loc = maya.cmds.spaceLocator()[0]
                 maya.cmds.setAttr('{}.t'.format(loc), pos[0], pos[1], pos[2])
                 maya.cmds.setAttr('{}.v'.format(loc), 0)
@@ -834,6 +832,377 @@ class SkinJointCurve(SkinJointSurface, object):
         return last_joint
 
 
+class SkinWeightsBlock(object):
+    """
+    Reads and writes the skin weights of a set of vertices of a skinned mesh as one block
+    Weights are read with a single getWeights call and written back with a single undoable setWeights call, so
+    weights operations (averaging, smoothing, interpolation...) can be computed in memory
+    """
+
+    def __init__(self, mesh, skin_cluster=None):
+        """
+        Constructor
+        :param mesh: str, name of a skinned mesh
+        :param skin_cluster: str or None, name of the skinCluster. If None, skinCluster attached to the mesh is used
+        """
+
+        self._mesh = mesh
+        self._skin_cluster = skin_cluster or find_related_skin_cluster(mesh)
+        check_skin(self._skin_cluster)
+
+        mesh_fn = mesh_utils.get_mesh_fn(mesh)
+        self._mesh_path = mesh_fn.dagPath()
+        self._points = None
+        self._skin_fn = maya.api.OpenMayaAnim.MFnSkinCluster(node_utils.get_mobject(self._skin_cluster))
+        self._influences = maya.api.OpenMaya.MIntArray()
+        for influence_path in self._skin_fn.influenceObjects():
+            self._influences.append(self._skin_fn.indexForInfluenceObject(influence_path))
+        self._influences_count = len(self._influences)
+        self._weights = dict()
+
+    @property
+    def skin_cluster(self):
+        return self._skin_cluster
+
+    @property
+    def influences_count(self):
+        return self._influences_count
+
+    def get_adjacency(self):
+        """
+        Returns the cached vertex adjacency of the mesh
+        :return: list(tuple(int))
+        """
+
+        return mesh_utils.get_vertex_adjacency(self._mesh)
+
+    def get_point(self, vertex):
+        """
+        Returns world position of the given vertex. All mesh points are read the first time this is called
+        :param vertex: int
+        :return: MPoint
+        """
+
+        if self._points is None:
+            self._points = maya.api.OpenMaya.MFnMesh(self._mesh_path).getPoints(maya.api.OpenMaya.MSpace.kWorld)
+
+        return self._points[vertex]
+
+    def get_distance(self, vertex1, vertex2):
+        """
+        Returns world space distance between given vertices
+        :param vertex1: int
+        :param vertex2: int
+        :return: float
+        """
+
+        return self.get_point(vertex1).distanceTo(self.get_point(vertex2))
+
+    def read(self, vertices):
+        """
+        Reads the weights of the given vertices that have not been read yet
+        :param vertices: list(int)
+        :return: dict(int, list(float)), weights of all read vertices ordered by influence
+        """
+
+        missing = [vertex for vertex in set(vertices) if vertex not in self._weights]
+        if not missing:
+            return self._weights
+
+        components, elements = self._get_components(missing)
+        weights = list(self._skin_fn.getWeights(self._mesh_path, components, self._influences))
+        count = self._influences_count
+        for i, vertex in enumerate(elements):
+            self._weights[vertex] = list(weights[i * count:(i + 1) * count])
+
+        return self._weights
+
+    def write(self, weights):
+        """
+        Writes the given weights into the skinCluster in one undoable operation
+        :param weights: dict(int, list(float)), weights of each vertex ordered by influence
+        """
+
+        if not weights:
+            return
+
+        components, elements = self._get_components(list(weights.keys()))
+        weights_array = maya.api.OpenMaya.MDoubleArray(
+            [weight for vertex in elements for weight in weights[vertex]])
+
+        runner = command.CommandRunner()
+        runner.run(
+            'tpDcc-dccs-maya-commands-setSkinWeights',
+            skin_cluster=self._skin_fn, mesh_path=self._mesh_path, mesh_components=components,
+            influences_array=self._influences, weights_array=weights_array)
+        self._weights.update(weights)
+
+    def blend(self, vertices, factors):
+        """
+        Returns the normalized weighted sum of the weights of the given vertices
+        :param vertices: list(int)
+        :param factors: list(float), weight factor of each vertex
+        :return: list(float)
+        """
+
+        self.read(vertices)
+        result = [0.0] * self._influences_count
+        for vertex, factor in zip(vertices, factors):
+            if not factor:
+                continue
+            result = [value + weight * factor for value, weight in zip(result, self._weights[vertex])]
+
+        return self._normalize(result)
+
+    def interpolate(self, path, use_distance=False):
+        """
+        Returns the weights of the inner vertices of the given path interpolated between path start and end weights
+        :param path: list(int), ordered vertices from start vertex to end vertex
+        :param use_distance: bool, Whether interpolation factors are computed using vertex distances or vertex count
+        :return: dict(int, list(float))
+        """
+
+        if len(path) < 3:
+            return dict()
+
+        start, end = path[0], path[-1]
+        if use_distance:
+            lengths = [0.0]
+            for i in range(1, len(path)):
+                lengths.append(lengths[-1] + self.get_distance(path[i - 1], path[i]))
+            total_length = lengths[-1] or 1.0
+            factors = [length / total_length for length in lengths]
+        else:
+            factors = [i / (len(path) - 1.0) for i in range(len(path))]
+
+        return {vertex: self.blend([start, end], [1.0 - factor, factor]) for vertex, factor in zip(
+            path[1:-1], factors[1:-1])}
+
+    def average(self, vertices, target, use_distance=False):
+        """
+        Returns the average weights of the given vertices to apply to the target vertex
+        :param vertices: list(int), vertices to average
+        :param target: int, vertex that will receive the average weights
+        :param use_distance: bool, Whether vertices closer to the target have more influence in the average
+        :return: dict(int, list(float))
+        """
+
+        factors = [1.0] * len(vertices)
+        if use_distance:
+            factors = [1.0 / max(self.get_distance(vertex, target), 0.000001) for vertex in vertices]
+
+        return {target: self.blend(vertices, factors)}
+
+    def smooth(self, vertices, use_distance=False, iterations=1):
+        """
+        Returns the weights of the given vertices averaged with the weights of their neighbour vertices
+        :param vertices: list(int), vertices to smooth
+        :param use_distance: bool, Whether closer neighbours have more influence in the average
+        :param iterations: int, number of smooth passes
+        :return: dict(int, list(float))
+        """
+
+        adjacency = self.get_adjacency()
+        vertices = list(set(vertices))
+        neighbours = {vertex: adjacency[vertex] for vertex in vertices}
+        self.read(vertices + [
+            neighbour for vertex_neighbours in neighbours.values() for neighbour in vertex_neighbours])
+        factors = dict()
+        for vertex, vertex_neighbours in neighbours.items():
+            if use_distance:
+                factors[vertex] = [
+                    1.0 / max(self.get_distance(vertex, neighbour), 0.000001) for neighbour in vertex_neighbours]
+            else:
+                factors[vertex] = [1.0] * len(vertex_neighbours)
+
+        current = dict(self._weights)
+        result = dict()
+        for _ in range(iterations):
+            for vertex, vertex_neighbours in neighbours.items():
+                averaged = [0.0] * self._influences_count
+                for neighbour, factor in zip(vertex_neighbours, factors[vertex]):
+                    averaged = [value + weight * factor for value, weight in zip(averaged, current[neighbour])]
+                result[vertex] = self._normalize(averaged)
+            current.update(result)
+
+        return result
+
+    def _get_components(self, vertices):
+        """
+        Internal function that returns a vertex component object with the given vertices
+        :param vertices: list(int)
+        :return: tuple(MObject, MIntArray), component and component vertices in the order Maya stores them
+        """
+
+        component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+        components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+        component_fn.addElements(vertices)
+
+        return components, component_fn.getElements()
+
+    def _normalize(self, weights):
+        """
+        Internal function that returns given weights normalized so they sum one
+        :param weights: list(float)
+        :return: list(float)
+        """
+
+        total = sum(weights)
+        if total < 0.000001:
+            return weights
+
+        return [weight / total for weight in weights]
+
+
+class SkinWeightsTransfer(object):
+    """
+    Transfers the skin weights of a skinned mesh to other meshes by closest point
+    Source skin weights, points and triangles are read once and indexed in a KD-tree, so the same instance can be
+    used to transfer weights to as many target meshes as needed
+    """
+
+    def __init__(self, source_mesh, uv_space=False, barycentric=True, search_count=8):
+        """
+        Constructor
+        :param source_mesh: str, name of a skinned mesh
+        :param uv_space: bool, Whether to search closest points in UV space (map1) rather than in world space
+        :param barycentric: bool, Whether to interpolate weights of the closest triangle or to use the weights of the
+            closest vertex
+        :param search_count: int, number of closest source vertices whose triangles are checked for each target
+            vertex when barycentric is True
+        """
+
+        self._uv_space = uv_space
+        self._barycentric = barycentric
+        self._search_count = search_count
+        self._source_data = get_mesh_skin_data(source_mesh)
+        if not self._source_data:
+            raise exceptions.SkinClusterException(source_mesh)
+
+        mesh_fn = mesh_utils.get_mesh_fn(source_mesh)
+        self._points = self._get_mesh_points(mesh_fn)
+        self._tree = spatial.KDTree(self._points)
+        self._vertex_triangles = [list() for _ in range(mesh_fn.numVertices)]
+        self._triangles = list()
+        if barycentric:
+            _, triangle_vertices = mesh_fn.getTriangles()
+            for i in range(0, len(triangle_vertices), 3):
+                triangle = (triangle_vertices[i], triangle_vertices[i + 1], triangle_vertices[i + 2])
+                for vertex in triangle:
+                    self._vertex_triangles[vertex].append(len(self._triangles))
+                self._triangles.append(triangle)
+
+    @property
+    def influences(self):
+        return self._source_data['influences']
+
+    def get_target_skin_data(self, target_mesh, influences=None, max_influences=None):
+        """
+        Returns the skin data of the given target mesh interpolated from the source mesh skin weights
+        :param target_mesh: str, name of the mesh to get skin data for
+        :param influences: list(str) or None, influences to transfer. If None, all source influences are transferred
+        :param max_influences: int or None, maximum number of influences per vertex
+        :return: dict, skin data (see skinfile.encode_mesh_weights)
+        """
+
+        source_influences = self._source_data['influences']
+        valid_influences = list(range(len(source_influences)))
+        if influences is not None:
+            long_names = set(maya.cmds.ls(influences, long=True))
+            valid_influences = [i for i, influence in enumerate(source_influences) if maya.cmds.ls(
+                influence, long=True)[0] in long_names]
+        influences_map = dict((influence_index, i) for i, influence_index in enumerate(valid_influences))
+
+        source_weights = self._source_data['weights']
+        target_weights = list()
+        for target_point in self._get_mesh_points(mesh_utils.get_mesh_fn(target_mesh)):
+            vertex_weights = dict()
+            for vertex, factor in self._get_closest_vertices(target_point):
+                for influence_index, weight in source_weights[vertex]:
+                    influence_index = influences_map.get(influence_index)
+                    if influence_index is not None:
+                        vertex_weights[influence_index] = vertex_weights.get(influence_index, 0.0) + weight * factor
+            vertex_weights = sorted(vertex_weights.items(), key=lambda item: item[1], reverse=True)
+            if max_influences:
+                vertex_weights = vertex_weights[:max_influences]
+            total = sum([weight for _, weight in vertex_weights])
+            if total > 0.000001:
+                vertex_weights = [(influence_index, weight / total) for influence_index, weight in vertex_weights]
+            target_weights.append(vertex_weights)
+
+        return {
+            'name': target_mesh,
+            'skin_cluster': '',
+            'influences': [source_influences[i] for i in valid_influences],
+            'bind_matrices': [self._source_data['bind_matrices'][i] for i in valid_influences],
+            'weights': target_weights,
+            'blend_weights': None
+        }
+
+    def transfer(self, target_mesh, influences=None, max_influences=None):
+        """
+        Transfers source skin weights to the given target mesh with one setWeights call
+        If the target mesh is not skinned, a new skinCluster is created
+        :param target_mesh: str, name of the mesh to transfer skin weights to
+        :param influences: list(str) or None, influences to transfer. If None, all source influences are transferred
+        :param max_influences: int or None, maximum number of influences per vertex
+        :return: bool
+        """
+
+        return set_mesh_skin_data(
+            target_mesh, self.get_target_skin_data(target_mesh, influences=influences, max_influences=max_influences))
+
+    def _get_mesh_points(self, mesh_fn):
+        """
+        Internal function that returns the points used to search closest vertices of the given mesh
+        :param mesh_fn: MFnMesh
+        :return: list(tuple(float, float, float))
+        """
+
+        if not self._uv_space:
+            return [(point.x, point.y, point.z) for point in mesh_fn.getPoints(maya.api.OpenMaya.MSpace.kWorld)]
+
+        us, vs = mesh_fn.getUVs('map1')
+        _, uv_ids = mesh_fn.getAssignedUVs('map1')
+        _, vertex_ids = mesh_fn.getVertices()
+        points = [(0.0, 0.0, 0.0)] * mesh_fn.numVertices
+        for vertex_id, uv_id in zip(vertex_ids, uv_ids):
+            points[vertex_id] = (us[uv_id], vs[uv_id], 0.0)
+
+        return points
+
+    def _get_closest_vertices(self, point):
+        """
+        Internal function that returns the source vertices closest to the given point and their interpolation factors
+        :param point: tuple(float, float, float)
+        :return: list(tuple(int, float))
+        """
+
+        closest = self._tree.nearest(point, count=self._search_count if self._barycentric else 1)
+        if not closest:
+            return list()
+        if not self._barycentric or not closest[0][0]:
+            return [(closest[0][1], 1.0)]
+
+        found = None
+        checked = set()
+        for _, vertex in closest:
+            for triangle_index in self._vertex_triangles[vertex]:
+                if triangle_index in checked:
+                    continue
+                checked.add(triangle_index)
+                triangle = self._triangles[triangle_index]
+                triangle_point, factors = spatial.closest_point_on_triangle(
+                    point, *[self._points[triangle_vertex] for triangle_vertex in triangle])
+                distance = sum([(a - b) ** 2 for a, b in zip(point, triangle_point)])
+                if found is None or distance < found[0]:
+                    found = (distance, triangle, factors)
+        if not found:
+            return [(closest[0][1], 1.0)]
+
+        return list(zip(found[1], found[2]))
+
+
 def check_skin(skin_cluster):
     """
     Checks if a node is valid skin cluster and raise and exception if the node is not valid
@@ -1012,9 +1381,10 @@ def remove_all_bind_poses_in_scene():
 def average_vertices_weights(selection, use_distance):
     """
     Generates an average weight from all selected vertices to apply to the last selected vertex
+    If only two vertices or edges are selected, weights are interpolated along the path between them
     :param selection: list<Vertex>, list of vertices to average
-    :param use_distance:
-    :return:
+    :param use_distance: bool, Whether to use vertex distances to compute averaging factors
+    :return: bool
     """
 
     total_vertices = len(selection)
@@ -1031,124 +1401,54 @@ def average_vertices_weights(selection, use_distance):
         is_edge_selection = True
 
     skin_cluster_name = find_related_skin_cluster(obj)
-    maya.cmds.setAttr('{0}.envelope'.format(skin_cluster_name), 0)
     succeeded = True
 
-    # TODO: Support for multiple geometry types
-    poly = True
-    added = 0.0
-
     try:
-        maya.cmds.skinCluster(obj, edit=True, normalizeWeights=True)
+        weights_block = SkinWeightsBlock(obj, skin_cluster_name)
         if total_vertices == 2 or is_edge_selection:
             base_list = [selection]
             if is_edge_selection:
                 base_list = mesh_utils.edges_to_smooth(edges_list=selection)
 
-            percentage = 99.0 / len(base_list)
-            for i, vert_list in enumerate(base_list):
-                start = vert_list[0]
-                end = vert_list[-1]
+            new_weights = dict()
+            for vert_list in base_list:
                 order = mesh_utils.find_shortest_vertices_path_between_vertices(vert_list)
-                if order:
-                    order = order[:-1]      # we are not interested in the last vertex
-                    amount = len(order) + 1
-                    total_distance = api_mathlib.distance_between_nodes(order[-1], end)
-                    list_bone_influences = maya.cmds.skinCluster(obj, query=True, inf=True)
-                    weights_start = maya.cmds.skinPercent(skin_cluster_name, start, query=True, v=True)
-                    weights_end = maya.cmds.skinPercent(skin_cluster_name, end, query=True, v=True)
-
-                    lengths = list()
-                    if use_distance:
-                        for j, vertex in enumerate(order):
-                            if j == 0:
-                                length = api_mathlib.distance_between_nodes(start, vertex)
-                            else:
-                                length = api_mathlib.distance_between_nodes(order[j - 1], vertex)
-                            if poly:
-                                total_distance += length
-                            lengths.append(length)
-
-            percentage = float(1.0) / (amount + added)
-            current_length = 0.0
-
-            for i, vertex in enumerate(order):
-                if use_distance:
-                    current_length += lengths[i]
-                    current_percentage = (current_length / total_distance)
-                else:
-                    current_percentage = i * percentage
-                    if poly:
-                        current_percentage = (i + 1) * percentage
-
-                new_weight_list = list()
-                for j, weight in enumerate(weights_start):
-                    value1 = weights_end[j] * current_percentage
-                    value2 = weights_end[j] * (1 - current_percentage)
-                    new_weight_list.append((list_bone_influences[j], value1 + value2))
-
-                maya.cmds.skinPercent(skin_cluster_name, vertex, transformValue=new_weight_list)
-
+                if not order:
+                    continue
+                path = mesh_utils.convert_to_indices([vert_list[0]] + order)
+                new_weights.update(weights_block.interpolate(path, use_distance=use_distance))
         else:
-            last_selected = selection[-1]
-            point_list = [x for x in selection if x != last_selected]
-            mesh_name = last_selected.split('.')[0]
-
-            list_joint_influences = maya.cmds.skinCluster(mesh_name, query=True, weightedInfluence=True)
-            influence_size = len(list_joint_influences)
-
-            temp_vertex_joints = list()
-            temp_vertex_weights = list()
-            for pnt in point_list:
-                for jnt in range(influence_size):
-                    point_weights = maya.cmds.skinPercent(
-                        skin_cluster_name, pnt, transform=list_joint_influences[jnt], query=True, value=True)
-                    if point_weights < 0.000001:
-                        continue
-                    temp_vertex_joints.append(list_joint_influences[jnt])
-                    temp_vertex_weights.append(point_weights)
-
-            total_values = 0.0
-            average_values = list()
-            clean_list = list()
-            for i in temp_vertex_joints:
-                if i not in clean_list:
-                    clean_list.append(i)
-
-            for i in range(len(clean_list)):
-                working_value = 0.0
-                for j in range(len(temp_vertex_joints)):
-                    if not temp_vertex_joints[j] == clean_list[i]:
-                        continue
-                    working_value += temp_vertex_weights[j]
-                num_points = len(point_list)
-                average_values.append(working_value / num_points)
-                total_values += average_values[i]
-
-            summary = 0
-            for value in range(len(average_values)):
-                temp_value = average_values[value] / total_values
-                average_values[value] = temp_value
-                summary += average_values[value]
-
-            cmd = cStringIO.StringIO()
-            cmd.write('maya.cmds.skinPercent("%s","%s", transformValue=[' % (skin_cluster_name, last_selected))
-
-            for count, skin_joint in enumerate(clean_list):
-                cmd.write('("%s", %s)' % (skin_joint, average_values[count]))
-                if not count == len(clean_list) - 1:
-                    cmd.write(', ')
-            cmd.write('])')
-            eval(cmd.getvalue())
+            indices = mesh_utils.convert_to_indices(selection)
+            new_weights = weights_block.average(indices[:-1], indices[-1], use_distance=use_distance)
+
+        weights_block.write(new_weights)
     except Exception:
         LOGGER.warning(str(traceback.format_exc()))
         succeeded = False
-    finally:
-        maya.cmds.setAttr('{0}.envelope'.format(skin_cluster_name), 1)
 
     return succeeded
 
 
+def smooth_vertices_weights(selection, use_distance=False, iterations=1):
+    """
+    Averages the weights of each one of the given vertices with the weights of its neighbour vertices
+    :param selection: list<Vertex>, list of vertices to smooth
+    :param use_distance: bool, Whether closer neighbours have more influence in the average
+    :param iterations: int, number of smooth passes
+    :return: bool
+    """
+
+    if not selection:
+        return False
+
+    obj = selection[0].split('.')[0]
+    weights_block = SkinWeightsBlock(obj)
+    indices = mesh_utils.convert_to_indices(maya.cmds.ls(selection, flatten=True))
+    weights_block.write(weights_block.smooth(indices, use_distance=use_distance, iterations=iterations))
+
+    return True
+
+
 @decorators.undo
 def apply_smooth_bind(geo=None, show_options=False):
     """
@@ -1420,10 +1720,11 @@ def mirror_skin_weights(mesh=None, show_options=False, **kwargs):
     if not transforms:
         return False
 
+    input_left = kwargs.pop('left_side_label', None)
+    input_right = kwargs.pop('right_side_label', None)
     if kwargs.pop('auto_assign_labels', False):
         jnt_utils.auto_assign_labels_to_mesh_influences(
-            transforms, input_left=kwargs.pop('left_side_label', None),
-            input_right=kwargs.pop('right_side_label', None), check_labels=True)
+            transforms, input_left=input_left, input_right=input_right, check_labels=True)
 
     if show_options:
         maya.cmds.optionVar(stringValue=( "mirrorSkinAxis", "YZ"))
@@ -1434,7 +1735,120 @@ def mirror_skin_weights(mesh=None, show_options=False, **kwargs):
         maya.cmds.optionVar(intValue=("mirrorSkinNormalize", 1))
         maya.cmds.MirrorSkinWeightsOptions()
     else:
-        raise NotImplementedError('Mirror Skin Weights with no options not implemented yet!')
+        for transform in transforms:
+            mirror_mesh_skin_weights(
+                transform, input_left=input_left or '*_l_*', input_right=input_right or '*_r_*', **kwargs)
+
+    return True
+
+
+def get_vertex_mirror_map(mesh, axis='x'):
+    """
+    Returns the index of the mirrored vertex of each one of the vertices of the given mesh
+    Mirrored vertices are found by closest point in object space. Map is cached per mesh shape and mirror axis until
+    the scene changes and it is only computed again if the points of the mesh change
+    :param mesh: str, name of a mesh
+    :param axis: str, mirror axis ('x', 'y' or 'z')
+    :return: list(int)
+    """
+
+    mesh_fn = mesh_utils.get_mesh_fn(mesh)
+    axis_index = 'xyz'.index(axis.lower())
+    key = (mesh_fn.fullPathName(), axis_index)
+    points = [(point.x, point.y, point.z) for point in mesh_fn.getPoints(maya.api.OpenMaya.MSpace.kObject)]
+    points_hash = hash(tuple(points))
+    mirror_maps = _VERTEX_MIRROR_MAP_CACHE.get()
+    cached = mirror_maps.get(key)
+    if cached and cached[0] == points_hash:
+        return cached[1]
+
+    tree = spatial.KDTree(points)
+    mirror_map = list()
+    for point in points:
+        mirrored_point = list(point)
+        mirrored_point[axis_index] *= -1
+        mirror_map.append(tree.nearest(mirrored_point)[0][1])
+    mirror_maps[key] = (points_hash, mirror_map)
+
+    return mirror_map
+
+
+@decorators.undo_chunk
+def mirror_mesh_skin_weights(
+        mesh, axis='x', positive_to_negative=True, input_left='*_l_*', input_right='*_r_*', tolerance=0.0001):
+    """
+    Mirrors the skin weights of the given mesh from one side of the mirror axis to the other one
+    Weights are read in bulk, mirrored through a cached vertex mirror map and a left/right influences map and
+    written with one setWeights call
+    :param mesh: str, name of a skinned mesh
+    :param axis: str, mirror axis ('x', 'y' or 'z')
+    :param positive_to_negative: bool, Whether to mirror weights from positive side to negative side or vice versa
+    :param input_left: str, string to identify all influences that are on the left side
+    :param input_right: str, string to identify all influences that are on the right side
+    :param tolerance: float, vertices closer than this value to the mirror plane are not modified
+    :return: bool
+    """
+
+    skin_cluster_name = find_related_skin_cluster(mesh)
+    if not skin_cluster_name:
+        LOGGER.warning('Given mesh "{}" has no skin cluster attached to it!'.format(mesh))
+        return False
+
+    # opposite side influences must be part of the skin cluster before reading weights
+    influences = maya.cmds.skinCluster(skin_cluster_name, query=True, influence=True) or list()
+    influence_names = set(maya.cmds.ls(influences, long=True))
+    scene_joints = list(dict.fromkeys(influences + maya.cmds.ls(type='joint')))
+    joints_map = jnt_utils.get_mirror_joints_map(scene_joints, input_left=input_left, input_right=input_right)
+    for influence in influences:
+        mirror_influence = joints_map.get(influence, influence)
+        if maya.cmds.ls(mirror_influence, long=True)[0] not in influence_names:
+            maya.cmds.skinCluster(skin_cluster_name, edit=True, addInfluence=mirror_influence, weight=0.0)
+
+    skin_fn = maya.api.OpenMayaAnim.MFnSkinCluster(node_utils.get_mobject(skin_cluster_name))
+    influence_paths = skin_fn.influenceObjects()
+    influence_positions = dict(
+        (influence_path.fullPathName(), i) for i, influence_path in enumerate(influence_paths))
+    columns_map = list()
+    for i, influence_path in enumerate(influence_paths):
+        mirror_influence = joints_map.get(influence_path.partialPathName())
+        mirror_names = maya.cmds.ls(mirror_influence, long=True) if mirror_influence else None
+        columns_map.append(influence_positions.get(mirror_names[0], i) if mirror_names else i)
+
+    mirror_map = get_vertex_mirror_map(mesh, axis=axis)
+    mesh_fn = mesh_utils.get_mesh_fn(mesh)
+    axis_index = 'xyz'.index(axis.lower())
+    points = mesh_fn.getPoints(maya.api.OpenMaya.MSpace.kObject)
+    if positive_to_negative:
+        target_vertices = [i for i, point in enumerate(points) if point[axis_index] < -tolerance]
+    else:
+        target_vertices = [i for i, point in enumerate(points) if point[axis_index] > tolerance]
+    if not target_vertices:
+        return False
+
+    component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+    all_components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+    component_fn.setCompleteData(mesh_fn.numVertices)
+    weights, influences_count = skin_fn.getWeights(mesh_fn.dagPath(), all_components)
+    weights = list(weights)
+
+    component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+    components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+    component_fn.addElements(target_vertices)
+    new_weights = list()
+    for vertex in component_fn.getElements():
+        source_start = mirror_map[vertex] * influences_count
+        vertex_weights = [0.0] * influences_count
+        for i in range(influences_count):
+            vertex_weights[columns_map[i]] += weights[source_start + i]
+        new_weights.extend(vertex_weights)
+
+    influences_array = maya.api.OpenMaya.MIntArray(
+        [skin_fn.indexForInfluenceObject(influence_path) for influence_path in influence_paths])
+    runner = command.CommandRunner()
+    runner.run(
+        'tpDcc-dccs-maya-commands-setSkinWeights',
+        skin_cluster=skin_fn, mesh_path=mesh_fn.dagPath(), mesh_components=components,
+        influences_array=influences_array, weights_array=maya.api.OpenMaya.MDoubleArray(new_weights))
 
     return True
 
@@ -1478,7 +1892,8 @@ def copy_skin_weights(
 @decorators.repeat_static_command(__name__, skip_arguments=True)
 def transfer_skinning(source_mesh, target_meshes, in_place=True, component_association=True, uv_space=False):
     """
-    Transfers skinning from one skinned mesh to other meshes using native Maya copySkinWweights command
+    Transfers skinning from one skinned mesh to other meshes
+    Source mesh is indexed once and weights are written with one setWeights call per target mesh
     :param source_mesh: str, mesh to copy skinning information from
     :param target_meshes: list(str), list of messes that will gather weight skin cluster information from source mesh
     :param in_place: bool, If True, will make sure to cleanup the mesh and apply the skinning; Ohterwise it assumes
@@ -1492,9 +1907,12 @@ def transfer_skinning(source_mesh, target_meshes, in_place=True, component_assoc
     if not source_skin_cluster:
         return False
 
-    surface_association = 'closestComponent' if component_association else 'closestPoint'
+    weights_transfer = SkinWeightsTransfer(source_mesh, uv_space=uv_space, barycentric=not component_association)
+    join_influences = maya.cmds.skinCluster(source_skin_cluster, query=True, influence=True)
+    max_influences = maya.cmds.skinCluster(source_skin_cluster, query=True, maximumInfluences=True)
+    remove_all_bind_poses_in_scene()
 
-    for target_mesh in target_meshes:
+    for target_mesh in python.force_list(target_meshes):
         if in_place:
             maya.cmds.delete(target_mesh, ch=True)
         else:
@@ -1503,26 +1921,22 @@ def transfer_skinning(source_mesh, target_meshes, in_place=True, component_assoc
                 continue
             maya.cmds.skinCluster(target_skin_cluster, edit=True, unbind=True)
 
-        join_influences = maya.cmds.skinCluster(source_skin_cluster, query=True, influence=True)
-        max_influences = maya.cmds.skinCluster(source_skin_cluster, query=True, maximumInfluences=True)
-        remove_all_bind_poses_in_scene()
-        new_skin_cluster = maya.cmds.skinCluster(join_influences, target_mesh, maximumInfluences=max_influences)[0]
-        if uv_space:
-            maya.cmds.copySkinWeights(
-                sourceSkin=source_skin_cluster, destinationSkin=new_skin_cluster, noMirror=True,
-                surfaceAssociation=surface_association, uv=['map1', 'map1'],
-                influenceAssociation=['label', 'oneToOne', 'name'], normalize=True)
-        else:
-            maya.cmds.copySkinWeights(
-                sourceSkin=source_skin_cluster, destinationSkin=new_skin_cluster, noMirror=True,
-                surfaceAssociation=surface_association, influenceAssociation=['label', 'oneToOne', 'name'],
-                normalize=True)
+        maya.cmds.skinCluster(join_influences, target_mesh, toSelectedBones=True, maximumInfluences=max_influences)
+        weights_transfer.transfer(target_mesh, max_influences=max_influences)
 
-        return True
+    return True
 
 
 @decorators.undo
-def prune_skin_weights(geo=None, show_options=False):
+def prune_skin_weights(geo=None, show_options=False, threshold=0.01):
+    """
+    Prunes skin weights below the given threshold
+    :param geo: str or list(str) or None, skinned meshes to prune weights of. If None, selected nodes are used
+    :param show_options: bool, Whether to show Maya prune small weights options dialog
+    :param threshold: float, weights below this value are pruned
+    :return: bool
+    """
+
     geo = geo or maya.cmds.ls(sl=True)
     geo = python.force_list(geo)
 
@@ -1531,11 +1945,99 @@ def prune_skin_weights(geo=None, show_options=False):
     else:
         if not geo:
             return False
-        raise NotImplementedError('Prune Weights with no options not implemented yet!')
+        clean_skin_weights(geo, prune_threshold=threshold)
 
     return True
 
 
+@decorators.undo_chunk
+def clean_skin_weights(meshes, prune_threshold=0.001, max_influences=None, remove_unused_influences=False):
+    """
+    Prunes small weights, limits the number of influences per vertex and normalizes the skin weights of the given
+    meshes. Weights of each mesh are processed in memory and written with one setWeights call
+    :param meshes: list(str), skinned meshes to clean weights of
+    :param prune_threshold: float, weights below this value are removed. The biggest weight of a vertex is never
+        removed
+    :param max_influences: int or None, maximum number of influences per vertex. If None, influences are not limited
+    :param remove_unused_influences: bool, Whether to remove influences that have no weights after cleanup
+    :return: dict(str, dict), statistics of each mesh: number of vertices, modified vertices, pruned weights,
+        weights removed by influence limit, maximum influences per vertex before and after cleanup, removed
+        influences and elapsed time
+    """
+
+    all_stats = dict()
+    for mesh in python.force_list(meshes):
+        start = time.time()
+        skin_cluster_name = find_related_skin_cluster(mesh)
+        if not skin_cluster_name:
+            LOGGER.warning('Given mesh "{}" has no skin cluster attached to it!'.format(mesh))
+            continue
+
+        skin_fn = maya.api.OpenMayaAnim.MFnSkinCluster(node_utils.get_mobject(skin_cluster_name))
+        mesh_fn = mesh_utils.get_mesh_fn(mesh)
+        component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+        all_components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+        component_fn.setCompleteData(mesh_fn.numVertices)
+        weights, influences_count = skin_fn.getWeights(mesh_fn.dagPath(), all_components)
+        weights = list(weights)
+
+        stats = {
+            'vertices': mesh_fn.numVertices, 'modified_vertices': 0, 'pruned': 0, 'limited': 0,
+            'max_influences_before': 0, 'max_influences_after': 0, 'removed_influences': list()}
+        used_columns = set()
+        modified_vertices = list()
+        new_weights = list()
+        for vertex in range(mesh_fn.numVertices):
+            row_start = vertex * influences_count
+            row = weights[row_start:row_start + influences_count]
+            pairs = [(weight, column) for column, weight in enumerate(row) if weight > 0.0]
+            stats['max_influences_before'] = max(stats['max_influences_before'], len(pairs))
+            if not pairs:
+                continue
+
+            biggest = max(pairs)
+            kept = [pair for pair in pairs if pair[0] >= prune_threshold] or [biggest]
+            stats['pruned'] += len(pairs) - len(kept)
+            if max_influences and len(kept) > max_influences:
+                stats['limited'] += len(kept) - max_influences
+                kept = heapq.nlargest(max_influences, kept)
+            stats['max_influences_after'] = max(stats['max_influences_after'], len(kept))
+
+            total = sum([weight for weight, _ in kept])
+            new_row = [0.0] * influences_count
+            for weight, column in kept:
+                new_row[column] = weight / total
+                used_columns.add(column)
+            if any(abs(a - b) > 0.0000001 for a, b in zip(row, new_row)):
+                modified_vertices.append(vertex)
+                new_weights.extend(new_row)
+
+        influence_paths = skin_fn.influenceObjects()
+        if modified_vertices:
+            component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+            components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+            component_fn.addElements(modified_vertices)
+            influences_array = maya.api.OpenMaya.MIntArray(
+                [skin_fn.indexForInfluenceObject(influence_path) for influence_path in influence_paths])
+            runner = command.CommandRunner()
+            runner.run(
+                'tpDcc-dccs-maya-commands-setSkinWeights',
+                skin_cluster=skin_fn, mesh_path=mesh_fn.dagPath(), mesh_components=components,
+                influences_array=influences_array, weights_array=maya.api.OpenMaya.MDoubleArray(new_weights))
+        stats['modified_vertices'] = len(modified_vertices)
+
+        if remove_unused_influences:
+            unused = [influence_paths[i].partialPathName() for i in range(influences_count) if i not in used_columns]
+            for influence in unused:
+                maya.cmds.skinCluster(skin_cluster_name, edit=True, removeInfluence=influence)
+            stats['removed_influences'] = unused
+
+        stats['time'] = time.time() - start
+        all_stats[mesh] = stats
+
+    return all_stats
+
+
 @decorators.undo
 def transfer_uvs_to_skinned_geometry(source_mesh=None, target_mesh=None, use_intermediate_shape=False, **kwargs):
     """
@@ -1691,20 +2193,94 @@ def select_influencing_joints(mesh_node=None):
     return True
 
 
-def get_influence_vertices(joint_nodes, mesh_name):
+def get_influence_vertex_weights(mesh_name, influences=None, threshold=0.0):
+    """
+    Returns the vertices of the given mesh skinned to each one of the given influences and their weights
+    Weights of all the influences are read in one pass from the skinCluster weight matrix, so scene selection is
+    not modified
+    :param mesh_name: str, name of the mesh that has the skin cluster attached
+    :param influences: str or list(str) or None, influences to retrieve vertices of. If None, all influences are used
+    :param threshold: float, only vertices with a weight greater than this value are returned
+    :return: dict(str, tuple(MIntArray, MDoubleArray)), vertex indices and vertex weights of each influence
+    """
+
+    skin_cluster_name = find_related_skin_cluster(mesh_name)
+    if not skin_cluster_name:
+        LOGGER.warning('Given mesh "{}" has no skin cluster attached to it!'.format(mesh_name))
+        return dict()
+
+    skin_fn = maya.api.OpenMayaAnim.MFnSkinCluster(node_utils.get_mobject(skin_cluster_name))
+    influence_paths = dict()
+    for influence_path in skin_fn.influenceObjects():
+        influence_paths[influence_path.fullPathName()] = influence_path
+    if influences is None:
+        influence_names = [influence_path.partialPathName() for influence_path in influence_paths.values()]
+    else:
+        influence_names = python.force_list(influences)
+
+    found_influences = list()
+    influences_array = maya.api.OpenMaya.MIntArray()
+    for influence_name in influence_names:
+        long_names = maya.cmds.ls(influence_name, long=True)
+        influence_path = influence_paths.get(long_names[0]) if long_names else None
+        if not influence_path:
+            continue
+        found_influences.append(influence_name)
+        influences_array.append(skin_fn.indexForInfluenceObject(influence_path))
+    if not found_influences:
+        return dict()
+
+    mesh_fn = mesh_utils.get_mesh_fn(mesh_name)
+    component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+    components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+    component_fn.setCompleteData(mesh_fn.numVertices)
+    weights = list(skin_fn.getWeights(mesh_fn.dagPath(), components, influences_array))
+
+    influence_weights = dict()
+    count = len(found_influences)
+    for i, influence_name in enumerate(found_influences):
+        vertices = maya.api.OpenMaya.MIntArray()
+        vertices_weights = maya.api.OpenMaya.MDoubleArray()
+        for vertex, weight in enumerate(weights[i::count]):
+            if weight > threshold:
+                vertices.append(vertex)
+                vertices_weights.append(weight)
+        influence_weights[influence_name] = (vertices, vertices_weights)
+
+    return influence_weights
+
+
+def get_influence_vertex_components(mesh_name, influences=None, threshold=0.0):
+    """
+    Returns the vertices of the given mesh skinned to each one of the given influences as component objects
+    :param mesh_name: str, name of the mesh that has the skin cluster attached
+    :param influences: str or list(str) or None, influences to retrieve vertices of. If None, all influences are used
+    :param threshold: float, only vertices with a weight greater than this value are returned
+    :return: tuple(MDagPath, dict(str, MObject)), mesh path and vertex components of each influence
+    """
+
+    influence_weights = get_influence_vertex_weights(mesh_name, influences=influences, threshold=threshold)
+    if not influence_weights:
+        return None, dict()
+
+    influence_components = dict()
+    for influence_name, (vertices, _) in influence_weights.items():
+        component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+        influence_components[influence_name] = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+        component_fn.addElements(vertices)
+
+    return mesh_utils.get_mesh_fn(mesh_name).dagPath(), influence_components
+
+
+def get_influence_vertices(joint_nodes, mesh_name, threshold=0.0):
     """
     Returns the vertices of the given mesh that are skinned to the given influence of the mesh skin cluster
     :param joint_nodes: str or list(str), name of the joint we want o retrieve influencing vertices of
     :param mesh_name: str, name of the mesh that has the skin cluster attached
+    :param threshold: float, only vertices with a weight greater than this value are returned
     :return: list(str)
     """
 
-    pymel_available = True
-    try:
-        from pymel.core.general import PyNode
-    except ImportError:
-        pymel_available = False
-    
     selected_transforms = dcc.selected_nodes_of_type('transform')
     selected_joints = dcc.selected_nodes_of_type('joint')
     joint_nodes = joint_nodes or selected_joints
@@ -1713,62 +2289,27 @@ def get_influence_vertices(joint_nodes, mesh_name):
         mesh_name = mesh_names[0] if mesh_names else None
     if not joint_nodes or not mesh_name:
         return False
-    joint_nodes = python.force_list(joint_nodes)
-    joint_nodes_short = [dcc.node_short_name(joint_node) for joint_node in joint_nodes]
-
-    skin_cluster_name = find_related_skin_cluster(mesh_name)
-    if not skin_cluster_name:
-        LOGGER.warning('Given mesh "{}" has no skin cluster attached to it!'.format(mesh_name))
-        return False
-
-    selection = list()
-    percentage = 100.0 / len(joint_nodes)
-    progress_value = 0.0
-
-    for i, joint in enumerate(joint_nodes):
-        if pymel_available:
-            joints_attached = maya.cmds.skinCluster(skin_cluster_name, query=True, inf=True)
-            if joint_nodes_short[i] not in joints_attached:
-                continue
-            skin_node = PyNode(skin_cluster_name)
-            vertices_list, values = skin_node.getPointsAffectedByInfluence(joint)
-            found_vertices = vertices_list.getSelectionStrings()
-            if len(found_vertices) == 0:
-                continue
-            selected_vertices = mesh_utils.convert_to_vertices(found_vertices)
-        else:
-            maya.cmds.select(clear=True)
-            maya.cmds.skinCluster(mesh_name, edit=True, normalizeWeights=True)
-            maya.cmds.select(joint, deselect=True)
-            mesh_utils.fix_mesh_components_selection_visualization(mesh_name)
-            maya.cmds.select(clear=True)
-            maya.cmds.skinCluster(skin_cluster_name, edit=True, selectInfluenceVerts=True)
-            selected_vertices = maya.cmds.ls(sl=True, flatten=True)
-
-        if not selected_vertices:
-            continue
-
-        for selected_vertex in selected_vertices:
-            if '.' not in selected_vertex:
-                continue
-            selection.append(selected_vertex)
 
-        progress_value += (percentage * i)
+    influence_weights = get_influence_vertex_weights(
+        mesh_name, influences=python.force_list(joint_nodes), threshold=threshold)
+    vertices = set()
+    for influence_vertices, _ in influence_weights.values():
+        vertices.update(influence_vertices)
 
-    mesh_utils.fix_mesh_components_selection_visualization(mesh_name)
-
-    return selection
+    return ['{}.vtx[{}]'.format(mesh_name, vertex) for vertex in sorted(vertices)]
 
 
 @decorators.undo
-def select_influence_vertices(joint_nodes=None, mesh_name=None):
+def select_influence_vertices(joint_nodes=None, mesh_name=None, threshold=0.0):
     """
     Selects the vertices of the given mesh that are skinned to the given influence of the mesh skin cluster
     :param joint_nodes: str or list(str), name of the joint we want o retrieve influencing vertices of
     :param mesh_name: str, name of the mesh that has the skin cluster attached
+    :param threshold: float, only vertices with a weight greater than this value are selected
     """
 
-    selected_influence_vertices = get_influence_vertices(joint_nodes=joint_nodes, mesh_name=mesh_name)
+    selected_influence_vertices = get_influence_vertices(
+        joint_nodes=joint_nodes, mesh_name=mesh_name, threshold=threshold)
     if not selected_influence_vertices:
         return False
 
@@ -2139,6 +2680,165 @@ def get_skin_weights(skin_deformer, vertices_ids=None):
     return weights
 
 
+def get_mesh_skin_data(mesh_name):
+    """
+    Returns the skin data of the given mesh in the format used by skin weights files
+    :param mesh_name: str, name of a skinned mesh
+    :return: dict or None, skin data (see skinfile.encode_mesh_weights)
+    """
+
+    skin_cluster_name = find_related_skin_cluster(mesh_name)
+    if not skin_cluster_name:
+        LOGGER.warning('Given mesh "{}" has no skin cluster attached to it!'.format(mesh_name))
+        return None
+
+    skin_fn = maya.api.OpenMayaAnim.MFnSkinCluster(node_utils.get_mobject(skin_cluster_name))
+    bind_pre_matrix_plug = skin_fn.findPlug('bindPreMatrix', False)
+    influences = list()
+    bind_matrices = list()
+    for influence_path in skin_fn.influenceObjects():
+        influences.append(influence_path.partialPathName())
+        matrix_plug = bind_pre_matrix_plug.elementByLogicalIndex(skin_fn.indexForInfluenceObject(influence_path))
+        bind_matrix = maya.api.OpenMaya.MFnMatrixData(matrix_plug.asMObject()).matrix().inverse()
+        bind_matrices.append(list(bind_matrix))
+
+    mesh_fn = mesh_utils.get_mesh_fn(mesh_name)
+    component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+    components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+    component_fn.setCompleteData(mesh_fn.numVertices)
+    weights, influences_count = skin_fn.getWeights(mesh_fn.dagPath(), components)
+    weights = list(weights)
+
+    sparse_weights = list()
+    for i in range(mesh_fn.numVertices):
+        vertex_weights = weights[i * influences_count:(i + 1) * influences_count]
+        sparse_weights.append([(j, weight) for j, weight in enumerate(vertex_weights) if weight > 0.0])
+
+    blend_weights = get_skin_blend_weights(skin_cluster_name)
+
+    return {
+        'name': mesh_name,
+        'skin_cluster': skin_cluster_name,
+        'influences': influences,
+        'bind_matrices': bind_matrices,
+        'weights': sparse_weights,
+        'blend_weights': blend_weights if any(blend_weights) else None
+    }
+
+
+def set_mesh_skin_data(mesh_name, skin_data):
+    """
+    Applies the given skin data to the given mesh. If the mesh is not skinned, a new skinCluster is created
+    :param mesh_name: str, name of the mesh to apply skin data to
+    :param skin_data: dict, skin data (see skinfile.encode_mesh_weights)
+    :return: bool
+    """
+
+    mesh_fn = mesh_utils.get_mesh_fn(mesh_name)
+    if mesh_fn.numVertices != len(skin_data['weights']):
+        LOGGER.warning('Mesh "{}" vertex count ({}) does not match stored skin data vertex count ({})!'.format(
+            mesh_name, mesh_fn.numVertices, len(skin_data['weights'])))
+        return False
+
+    influences = [influence for influence in skin_data['influences'] if maya.cmds.objExists(influence)]
+    missing_influences = [influence for influence in skin_data['influences'] if influence not in influences]
+    if missing_influences:
+        LOGGER.warning('Skin data influences not found in scene: {}. Their weights will be normalized out!'.format(
+            missing_influences))
+    if not influences:
+        return False
+
+    skin_cluster_name = find_related_skin_cluster(mesh_name)
+    if not skin_cluster_name:
+        skin_cluster_name = maya.cmds.skinCluster(influences, mesh_name, toSelectedBones=True)[0]
+    else:
+        current_influences = maya.cmds.ls(
+            maya.cmds.skinCluster(skin_cluster_name, query=True, influence=True) or list(), long=True)
+        for influence in influences:
+            if maya.cmds.ls(influence, long=True)[0] not in current_influences:
+                maya.cmds.skinCluster(skin_cluster_name, edit=True, addInfluence=influence, weight=0.0)
+
+    skin_fn = maya.api.OpenMayaAnim.MFnSkinCluster(node_utils.get_mobject(skin_cluster_name))
+    influence_paths = skin_fn.influenceObjects()
+    influence_positions = dict(
+        (influence_path.fullPathName(), i) for i, influence_path in enumerate(influence_paths))
+    influences_map = dict()
+    for i, influence in enumerate(skin_data['influences']):
+        if influence in influences:
+            influences_map[i] = influence_positions.get(maya.cmds.ls(influence, long=True)[0])
+
+    influences_count = len(influence_paths)
+    influences_array = maya.api.OpenMaya.MIntArray(
+        [skin_fn.indexForInfluenceObject(influence_path) for influence_path in influence_paths])
+    weights = [0.0] * (mesh_fn.numVertices * influences_count)
+    for vertex, vertex_weights in enumerate(skin_data['weights']):
+        vertex_weights = [
+            (influences_map[i], weight) for i, weight in vertex_weights if influences_map.get(i) is not None]
+        total = sum([weight for _, weight in vertex_weights])
+        if total < 0.000001:
+            continue
+        for position, weight in vertex_weights:
+            weights[vertex * influences_count + position] = weight / total
+
+    component_fn = maya.api.OpenMaya.MFnSingleIndexedComponent()
+    components = component_fn.create(maya.api.OpenMaya.MFn.kMeshVertComponent)
+    component_fn.setCompleteData(mesh_fn.numVertices)
+    runner = command.CommandRunner()
+    runner.run(
+        'tpDcc-dccs-maya-commands-setSkinWeights',
+        skin_cluster=skin_fn, mesh_path=mesh_fn.dagPath(), mesh_components=components,
+        influences_array=influences_array, weights_array=maya.api.OpenMaya.MDoubleArray(weights))
+
+    if skin_data.get('blend_weights'):
+        set_skin_blend_weights(skin_cluster_name, skin_data['blend_weights'])
+
+    return True
+
+
+def export_skin_weights(file_path, meshes=None, precision=skinfile.DEFAULT_PRECISION, threads=None):
+    """
+    Exports the skin weights of the given meshes into a skin weights file
+    Skin data is read from Maya in the main thread and encoded in worker threads
+    :param file_path: str, path of the skin weights file
+    :param meshes: list(str) or None, meshes to export skin weights of. If None, selected meshes are used
+    :param precision: int, number of decimals weights are stored with
+    :param threads: int or None, number of worker threads used to encode the skin data
+    :return: list(str), exported meshes
+    """
+
+    meshes = python.force_list(meshes or dcc.selected_nodes_of_type(node_type='transform'))
+    meshes_data = [mesh_data for mesh_data in [get_mesh_skin_data(mesh) for mesh in meshes] if mesh_data]
+    if not meshes_data:
+        return list()
+
+    skinfile.write_skin_weights_file(file_path, meshes_data, precision=precision, threads=threads)
+
+    return [mesh_data['name'] for mesh_data in meshes_data]
+
+
+@decorators.undo_chunk
+def import_skin_weights(file_path, meshes=None, threads=None):
+    """
+    Imports the skin weights stored in the given skin weights file
+    Skin data is decoded in worker threads and applied to the meshes in the main thread
+    :param file_path: str, path of the skin weights file
+    :param meshes: list(str) or None, meshes to import skin weights of. If None, all stored meshes are imported
+    :param threads: int or None, number of worker threads used to decode the skin data
+    :return: list(str), imported meshes
+    """
+
+    imported = list()
+    meshes = python.force_list(meshes) if meshes else None
+    for mesh_data in skinfile.read_skin_weights_file(file_path, meshes=meshes, threads=threads):
+        if not maya.cmds.objExists(mesh_data['name']):
+            LOGGER.warning('Mesh "{}" does not exist in current scene!'.format(mesh_data['name']))
+            continue
+        if set_mesh_skin_data(mesh_data['name'], mesh_data):
+            imported.append(mesh_data['name'])
+
+    return imported
+
+
 def get_skin_envelope(geo_obj):
     """
     Returns envelope value of the skinCluster in the given geometry object
@@ -2352,30 +3052,17 @@ def get_skin_blend_weights(skin_deformer):
     """
 
     indices = attribute.get_indices('{}.weightList'.format(skin_deformer))
-    blend_weights = attribute.get_indices('{}.blendWeights'.format(skin_deformer))
+    blend_weights_plug = api_plugs.as_mplug('{}.blendWeights'.format(skin_deformer))
     blend_weights_dict = dict()
-
-    if blend_weights:
-        for blend_weight in blend_weights:
-            blend_weights_dict[blend_weight] = maya.cmds.getAttr(
-                '{}.blendWeights[{}]'.format(skin_deformer, blend_weight))
+    for blend_weight in blend_weights_plug.getExistingArrayAttributeIndices():
+        blend_weights_dict[blend_weight] = blend_weights_plug.elementByLogicalIndex(blend_weight).asDouble()
 
     values = list()
     for i in range(len(indices)):
-        if i in blend_weights_dict:
-            value = blend_weights_dict[i]
-            if type(value) < 0.000001:
-                value = 0.0
-            if isinstance(value, float):
-                value = 0.0
-            if value != value:
-                value = 0.0
-
-            values.append(value)
-            continue
-        else:
-            values.append(0.0)
-            continue
+        value = blend_weights_dict.get(i, 0.0)
+        if value != value or value < 0.000001:
+            value = 0.0
+        values.append(value)
 
     return values
 
@@ -2388,19 +3075,15 @@ def set_skin_blend_weights(skin_deformer, weights):
     """
 
     indices = attribute.get_indices('{}.weightList'.format(skin_deformer))
+    blend_weights_plug = api_plugs.as_mplug('{}.blendWeights'.format(skin_deformer))
 
-    new_weights = list()
-    for weight in weights:
+    mod = maya.api.OpenMaya.MDGModifier()
+    for i in range(min(len(indices), len(weights))):
+        weight = weights[i]
         if weight != weight:
             weight = 0.0
-        new_weights.append(weight)
-
-    for i in range(len(indices)):
-        if maya.cmds.objExists('{}.blendWeights[{}]'.format(skin_deformer, i)):
-            try:
-                maya.cmds.setAttr('{}.blendWeights[{}]'.format(skin_deformer, i), weights[i])
-            except Exception:
-                pass
+        mod.newPlugValueDouble(blend_weights_plug.elementByLogicalIndex(i), weight)
+    api_modifier.apply_modifier(mod)
 
 
 def set_skin_weights_to_zero(skin_deformer):
@@ -2409,18 +3092,18 @@ def set_skin_weights_to_zero(skin_deformer):
     :param skin_deformer: str, name of a skinCluster deformer
     """
 
-    weights = maya.cmds.ls('{}.weightList[*]'.format(skin_deformer))
-    for weight in weights:
-        weight_attrs = maya.cmds.listAttr('{}.weights'.format(weight), multi=True)
-        if not weight_attrs:
-            continue
-        for weight_attr in weight_attrs:
-            attr = '{}.{}'.format(skin_deformer, weight_attr)
-            maya.cmds.setAttr(attr, 0)
+    weight_list_plug = api_plugs.as_mplug('{}.weightList'.format(skin_deformer))
+    mod = maya.api.OpenMaya.MDGModifier()
+    for vertex_index in weight_list_plug.getExistingArrayAttributeIndices():
+        weights_plug = weight_list_plug.elementByLogicalIndex(vertex_index).child(0)
+        for influence_index in weights_plug.getExistingArrayAttributeIndices():
+            mod.newPlugValueDouble(weights_plug.elementByLogicalIndex(influence_index), 0.0)
+    api_modifier.apply_modifier(mod)
 
 
 @decorators.undo_chunk
-def skin_mesh_from_mesh(source_mesh, target_mesh, exclude_joints=None, include_joints=None, uv_space=False):
+def skin_mesh_from_mesh(
+        source_mesh, target_mesh, exclude_joints=None, include_joints=None, uv_space=False, weights_transfer=None):
     """
     Skins a mesh based on the skinning of another mesh
     Source mesh must be skinned and the target mesh will be skinned with the joints in the source mesh
@@ -2430,6 +3113,8 @@ def skin_mesh_from_mesh(source_mesh, target_mesh, exclude_joints=None, include_j
     :param exclude_joints: list<str>, exclude the named joint from the skinCluster
     :param include_joints: list<str>, include the named joints from the skinCluster
     :param uv_space: bool, Whether to copy the skin weights in UV space rather than point space
+    :param weights_transfer: SkinWeightsTransfer or None, transfer of the source mesh. Can be given to skin many
+        meshes from the same source mesh without reading source mesh skin data each time
     """
 
     LOGGER.debug('Skinning {} using weights from {}'.format(target_mesh, source_mesh))
@@ -2443,7 +3128,6 @@ def skin_mesh_from_mesh(source_mesh, target_mesh, exclude_joints=None, include_j
     if target_skin:
         LOGGER.warning('{} already has a skinCluster. Deleting existing one ...'.format(target_mesh))
         maya.cmds.delete(target_skin)
-        target_skin = None
 
     influences = get_non_zero_influences(skin)
 
@@ -2459,33 +3143,11 @@ def skin_mesh_from_mesh(source_mesh, target_mesh, exclude_joints=None, include_j
         influences = found
 
     # TODO: skinCluster should be renamed using NameIt lib
-    if target_skin:
-        if uv_space:
-            maya.cmds.copySkinWeights(
-                sourceSkin=skin,
-                destinationSkin=target_skin,
-                noMirror=True,
-                surfaceAssociation='closestPoint',
-                influenceAssociation=['name'],
-                uvSpace=['map1', 'map1'],
-                normalize=True
-            )
-        else:
-            maya.cmds.copySkinWeights(
-                sourceSkin=skin,
-                destinationSkin=target_skin,
-                noMirror=True,
-                surfaceAssociation='closestPoint',
-                influenceAssociation=['name'],
-                normalize=True
-            )
-        skinned = maya.cmds.skinCluster(target_skin, query=True, weightedInfluence=True)
-        unskinned = set(influences) ^ set(skinned)
-        for jnt in unskinned:
-            maya.cmds.skinCluster(target_skin, edit=True, removeInfluence=jnt)
-    else:
-        skin_name = name_utils.get_basename(target_mesh)
-        target_skin = maya.cmds.skinCluster(
-            influences, target_mesh, tsb=True, n=name_utils.find_unique_name('skin_{}'.format(skin_name)))[0]
+    skin_name = name_utils.get_basename(target_mesh)
+    target_skin = maya.cmds.skinCluster(
+        influences, target_mesh, tsb=True, n=name_utils.find_unique_name('skin_{}'.format(skin_name)))[0]
+
+    weights_transfer = weights_transfer or SkinWeightsTransfer(source_mesh, uv_space=uv_space)
+    weights_transfer.transfer(target_mesh, influences=influences)
 
     return target_skin
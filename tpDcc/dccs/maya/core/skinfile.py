@@ -0,0 +1,184 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the codec of the skin weights file format
+Skin weights files can be dumped as JSON to compare them:
+    python -m tpDcc.dccs.maya.core.skinfile weights.skw > weights.json
+
+Files use the binary container of binaryfile module:
+    - JSON header: format version and, for each mesh, its influence table (names and bind matrices), vertex count,
+    weights precision and the position of its weights chunk in the file
+    - one chunk per mesh with its sparse weights (number of weights of each vertex, influence indices and quantized
+    weights) and its blend weights
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import json
+import array
+from multiprocessing.pool import ThreadPool
+
+from tpDcc.dccs.maya.core import binaryfile
+
+MAGIC = b'TPSKINW\x00'
+VERSION = 1
+DEFAULT_PRECISION = 4
+
+
+def encode_mesh_weights(mesh_data, precision=DEFAULT_PRECISION):
+    """
+    Encodes the skin weights of a mesh into a compressed chunk
+    :param mesh_data: dict, mesh skin data with the following keys:
+        name (str), skin_cluster (str), influences (list(str)), bind_matrices (list(list(float))),
+        weights (list(list(tuple(int, float))), sparse (influence index, weight) pairs of each vertex) and
+        blend_weights (list(float) or None)
+    :param precision: int, number of decimals weights are quantized to
+    :return: tuple(dict, bytes), mesh header entry and compressed chunk
+    """
+
+    scale = 10 ** precision
+    counts = array.array('H')
+    indices = array.array('H')
+    values = array.array(_get_weights_typecode(precision))
+    for vertex_weights in mesh_data['weights']:
+        count = 0
+        for influence_index, weight in vertex_weights:
+            value = int(round(weight * scale))
+            if value <= 0:
+                continue
+            indices.append(influence_index)
+            values.append(value)
+            count += 1
+        counts.append(count)
+
+    blend_weights = mesh_data.get('blend_weights')
+    blend_values = array.array('f', blend_weights or list())
+
+    chunk = binaryfile.compress_arrays([counts, indices, values, blend_values])
+
+    entry = {
+        'name': mesh_data['name'],
+        'skin_cluster': mesh_data.get('skin_cluster', ''),
+        'vertex_count': len(counts),
+        'weights_count': len(indices),
+        'precision': precision,
+        'has_blend_weights': bool(blend_weights),
+        'influences': [{'name': name, 'bind_matrix': list(matrix) if matrix else None} for name, matrix in zip(
+            mesh_data['influences'], mesh_data.get('bind_matrices') or [None] * len(mesh_data['influences']))]
+    }
+
+    return entry, chunk
+
+
+def decode_mesh_weights(entry, chunk):
+    """
+    Decodes the skin weights of a mesh from its header entry and its compressed chunk
+    :param entry: dict, mesh header entry
+    :param chunk: bytes, compressed chunk
+    :return: dict, mesh skin data (see encode_mesh_weights)
+    """
+
+    vertex_count = entry['vertex_count']
+    weights_count = entry['weights_count']
+    precision = entry['precision']
+    counts, indices, values, blend_values = binaryfile.decompress_arrays(chunk, [
+        ('H', vertex_count), ('H', weights_count), (_get_weights_typecode(precision), weights_count),
+        ('f', vertex_count if entry['has_blend_weights'] else 0)])
+
+    scale = float(10 ** precision)
+    weights = list()
+    index = 0
+    for count in counts:
+        weights.append([(indices[i], values[i] / scale) for i in range(index, index + count)])
+        index += count
+
+    return {
+        'name': entry['name'],
+        'skin_cluster': entry.get('skin_cluster', ''),
+        'influences': [influence['name'] for influence in entry['influences']],
+        'bind_matrices': [influence['bind_matrix'] for influence in entry['influences']],
+        'weights': weights,
+        'blend_weights': list(blend_values) if entry['has_blend_weights'] else None
+    }
+
+
+def write_skin_weights_file(file_path, meshes_data, precision=DEFAULT_PRECISION, threads=None):
+    """
+    Writes the skin weights of the given meshes into a skin weights file
+    :param file_path: str, path of the file to write
+    :param meshes_data: list(dict), skin data of each mesh (see encode_mesh_weights)
+    :param precision: int, number of decimals weights are quantized to
+    :param threads: int or None, number of worker threads used to encode the meshes. If None, one per CPU is used
+    :return: dict, written file header
+    """
+
+    encoded = _map(lambda mesh_data: encode_mesh_weights(mesh_data, precision=precision), meshes_data, threads)
+    entries = [entry for entry, _ in encoded]
+    header = {'version': VERSION, 'meshes': entries}
+
+    return binaryfile.write_file(file_path, MAGIC, header, entries, [chunk for _, chunk in encoded])
+
+
+def read_skin_weights_header(file_path):
+    """
+    Returns the header of the given skin weights file without decoding any mesh weights
+    :param file_path: str
+    :return: dict
+    """
+
+    return binaryfile.read_file_header(file_path, MAGIC, VERSION, 'skin weights')
+
+
+def read_skin_weights_file(file_path, meshes=None, threads=None):
+    """
+    Reads the skin weights stored in the given skin weights file
+    :param file_path: str, path of the file to read
+    :param meshes: list(str) or None, names of the meshes to read. If None, all meshes are read
+    :param threads: int or None, number of worker threads used to decode the meshes. If None, one per CPU is used
+    :return: list(dict), skin data of each mesh (see encode_mesh_weights)
+    """
+
+    to_decode = binaryfile.read_file(file_path, MAGIC, VERSION, 'skin weights', 'meshes', names=meshes)[1]
+
+    return _map(lambda item: decode_mesh_weights(*item), to_decode, threads)
+
+
+def _map(fn, items, threads=None):
+    """
+    Internal function that applies the given function to all items using worker threads
+    zlib releases the GIL while compressing so codec work of different meshes runs in parallel
+    :param fn: callable
+    :param items: list
+    :param threads: int or None
+    :return: list
+    """
+
+    items = list(items)
+    if len(items) < 2 or threads == 1:
+        return [fn(item) for item in items]
+
+    pool = ThreadPool(min(threads, len(items)) if threads else None)
+    try:
+        return pool.map(fn, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _get_weights_typecode(precision):
+    """
+    Internal function that returns the array type used to store quantized weights of the given precision
+    :param precision: int
+    :return: str
+    """
+
+    return 'H' if 10 ** precision <= 0xFFFF else 'I'
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print('Usage: python -m tpDcc.dccs.maya.core.skinfile <skin weights file>')
+        sys.exit(1)
+    print(json.dumps(read_skin_weights_file(sys.argv[1]), indent=2, sort_keys=True))
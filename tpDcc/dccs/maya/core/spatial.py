@@ -0,0 +1,201 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains spatial data structures to speed up closest point queries
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import math
+import heapq
+
+
+class KDTree(object):
+    """
+    Static 3D KD-tree that allows k-nearest and radius queries over a list of points
+    Tree is built once and stores the indices of the points, so query results can be mapped back to the objects
+    the points were read from
+    """
+
+    def __init__(self, points):
+        """
+        Constructor
+        :param points: list(tuple(float, float, float)), points to index
+        """
+
+        self._points = [(float(pnt[0]), float(pnt[1]), float(pnt[2])) for pnt in points]
+        self._root = self._build(list(range(len(self._points))), 0)
+
+    def __len__(self):
+        return len(self._points)
+
+    @property
+    def points(self):
+        """
+        Returns indexed points
+        :return: list(tuple(float, float, float))
+        """
+
+        return self._points
+
+    def nearest(self, point, count=1):
+        """
+        Returns the closest indexed points to the given point
+        :param point: tuple(float, float, float), point to search from
+        :param count: int, maximum number of points to return
+        :return: list(tuple(float, int)), list of (distance, point index) sorted by distance
+        """
+
+        if self._root is None or count < 1:
+            return list()
+
+        pnt = (float(point[0]), float(point[1]), float(point[2]))
+        points = self._points
+        found = list()              # max heap of (-squared distance, -index)
+        stack = [(self._root, 0.0)]
+        while stack:
+            tree_node, bound = stack.pop()
+            if tree_node is None or (len(found) == count and bound >= -found[0][0]):
+                continue
+            index, axis, left, right = tree_node
+            other = points[index]
+            dx = pnt[0] - other[0]
+            dy = pnt[1] - other[1]
+            dz = pnt[2] - other[2]
+            dst = dx * dx + dy * dy + dz * dz
+            if len(found) < count:
+                heapq.heappush(found, (-dst, -index))
+            elif dst < -found[0][0]:
+                heapq.heapreplace(found, (-dst, -index))
+
+            # near side is visited first, far side is only visited if it can contain closer points
+            diff = pnt[axis] - other[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, diff * diff))
+            stack.append((near, 0.0))
+
+        return sorted([(math.sqrt(-dst), -index) for dst, index in found])
+
+    def within_radius(self, point, radius):
+        """
+        Returns all indexed points that are inside the sphere defined by the given point and radius
+        :param point: tuple(float, float, float), center of the sphere
+        :param radius: float, radius of the sphere
+        :return: list(tuple(float, int)), list of (distance, point index) sorted by distance
+        """
+
+        if self._root is None:
+            return list()
+
+        pnt = (float(point[0]), float(point[1]), float(point[2]))
+        points = self._points
+        radius_squared = radius * radius
+        found = list()
+        stack = [self._root]
+        while stack:
+            tree_node = stack.pop()
+            if tree_node is None:
+                continue
+            index, axis, left, right = tree_node
+            other = points[index]
+            dx = pnt[0] - other[0]
+            dy = pnt[1] - other[1]
+            dz = pnt[2] - other[2]
+            dst = dx * dx + dy * dy + dz * dz
+            if dst <= radius_squared:
+                found.append((math.sqrt(dst), index))
+
+            diff = pnt[axis] - other[axis]
+            if diff - radius <= 0:
+                stack.append(left)
+            if diff + radius >= 0:
+                stack.append(right)
+
+        return sorted(found)
+
+    def _build(self, indices, depth):
+        """
+        Internal function that recursively builds the tree nodes. Recursion depth is log2 of the number of points
+        :param indices: list(int)
+        :param depth: int
+        :return: tuple(int, int, tuple, tuple) or None
+        """
+
+        if not indices:
+            return None
+
+        axis = depth % 3
+        points = self._points
+        indices.sort(key=lambda i: points[i][axis])
+        median = len(indices) // 2
+
+        return (
+            indices[median], axis,
+            self._build(indices[:median], depth + 1),
+            self._build(indices[median + 1:], depth + 1))
+
+
+def closest_point_on_triangle(point, a, b, c):
+    """
+    Returns the closest point of the given triangle to the given point
+    :param point: tuple(float, float, float), point to search from
+    :param a: tuple(float, float, float), first vertex of the triangle
+    :param b: tuple(float, float, float), second vertex of the triangle
+    :param c: tuple(float, float, float), third vertex of the triangle
+    :return: tuple(tuple(float, float, float), tuple(float, float, float)), closest point and its barycentric
+        coordinates relative to the triangle vertices
+    """
+
+    ab = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+    ac = (c[0] - a[0], c[1] - a[1], c[2] - a[2])
+    ap = (point[0] - a[0], point[1] - a[1], point[2] - a[2])
+    d1 = _dot(ab, ap)
+    d2 = _dot(ac, ap)
+    if d1 <= 0.0 and d2 <= 0.0:
+        return tuple(a), (1.0, 0.0, 0.0)
+
+    bp = (point[0] - b[0], point[1] - b[1], point[2] - b[2])
+    d3 = _dot(ab, bp)
+    d4 = _dot(ac, bp)
+    if d3 >= 0.0 and d4 <= d3:
+        return tuple(b), (0.0, 1.0, 0.0)
+
+    vc = d1 * d4 - d3 * d2
+    if vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+        v = d1 / (d1 - d3)
+        return _lerp(a, ab, v), (1.0 - v, v, 0.0)
+
+    cp = (point[0] - c[0], point[1] - c[1], point[2] - c[2])
+    d5 = _dot(ab, cp)
+    d6 = _dot(ac, cp)
+    if d6 >= 0.0 and d5 <= d6:
+        return tuple(c), (0.0, 0.0, 1.0)
+
+    vb = d5 * d2 - d1 * d6
+    if vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+        w = d2 / (d2 - d6)
+        return _lerp(a, ac, w), (1.0 - w, 0.0, w)
+
+    va = d3 * d6 - d5 * d4
+    if va <= 0.0 and (d4 - d3) >= 0.0 and (d5 - d6) >= 0.0:
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        return _lerp(b, (c[0] - b[0], c[1] - b[1], c[2] - b[2]), w), (0.0, 1.0 - w, w)
+
+    total = va + vb + vc
+    if not total:
+        # degenerated triangle
+        return tuple(a), (1.0, 0.0, 0.0)
+    v = vb / total
+    w = vc / total
+
+    return (a[0] + ab[0] * v + ac[0] * w, a[1] + ab[1] * v + ac[1] * w, a[2] + ab[2] * v + ac[2] * w), (
+        1.0 - v - w, v, w)
+
+
+def _dot(v1, v2):
+    return v1[0] * v2[0] + v1[1] * v2[1] + v1[2] * v2[2]
+
+
+def _lerp(origin, direction, factor):
+    return origin[0] + direction[0] * factor, origin[1] + direction[1] * factor, origin[2] + direction[2] * factor
@@ -14,7 +14,8 @@ import maya.cmds
 import maya.api.OpenMaya
 
 from tpDcc.libs.python import name, mathlib, python
-from tpDcc.dccs.maya.core import exceptions, attribute, node, component, name as name_utils
+from tpDcc.dccs.maya.api import plugs as api_plugs, modifier as api_modifier
+from tpDcc.dccs.maya.core import exceptions, callback, attribute, node, component, spatial, name as name_utils
 
 LOGGER = logging.getLogger('tpDcc-dccs-maya')
 
@@ -359,8 +360,13 @@ class BoundingBox(mathlib.BoundingBox, object):
 class DuplicateHierarchy(object):
     """
     Duplicate the hierarchy of a transform
+    Source hierarchy is read once and all duplicates (with their final names, attribute values and parenting) are
+    created with a single MDagModifier, so deep hierarchies do not hit the recursion limit
     """
 
+    # attributes to copy cached by node type, shared by all instances
+    _COPY_ATTRIBUTES = dict()
+
     def __init__(self, transform_name):
         """
         Constructor
@@ -413,25 +419,63 @@ class DuplicateHierarchy(object):
         self._replace_old = old
         self._replace_new = new
 
-    def _get_children(self, xform):
+    def _get_children(self, dag_path):
         """
         Internal function used to return all children of the given transforms
         Without taking into account constraint nodes
-        :param xform: str
-        :return: list<str>
+        :param dag_path: MDagPath
+        :return: list<MDagPath>
         """
 
-        children = maya.cmds.listRelatives(xform, children=True, type='transform')
         found = list()
-        if children:
-            for child in children:
-                if maya.cmds.nodeType(child).find('Constraint') > - 1:
-                    continue
-                found.append(child)
+        for i in range(dag_path.childCount()):
+            child = dag_path.child(i)
+            if not child.hasFn(maya.api.OpenMaya.MFn.kTransform):
+                continue
+            child_path = maya.api.OpenMaya.MDagPath(dag_path)
+            child_path.push(child)
+            type_name = maya.api.OpenMaya.MFnDependencyNode(child).typeName
+            if type_name.find('Constraint') > -1:
+                continue
+            if self._only_these_transform and child_path.partialPathName() not in self._only_these_transform:
+                continue
+            if self._only_joints and not type_name == 'joint':
+                continue
+            found.append(child_path)
 
         return found
 
-    def _duplicate(self, xform):
+    def _get_hierarchy(self, xform):
+        """
+        Internal function that returns the transforms to duplicate in depth-first order
+        :param xform: str
+        :return: list(tuple(MDagPath, int)), list of paths with the index of their parent in the list (-1 for top)
+        """
+
+        stop_obj = node.get_mobject(self._stop_at_transform) if self._stop_at_transform else None
+
+        hierarchy = list()
+        stack = [(node.get_mdag_path(xform), -1)]
+        while stack:
+            dag_path, parent_index = stack.pop()
+            if stop_obj is not None and dag_path.node() == stop_obj:
+                # hierarchy duplication is stopped completely once the stop transform is found
+                self._stop = True
+                break
+            hierarchy.append((dag_path, parent_index))
+            index = len(hierarchy) - 1
+            stack.extend([(child_path, index) for child_path in reversed(self._get_children(dag_path))])
+
+        return hierarchy
+
+    def _get_duplicate_name(self, xform, reserved_names):
+        """
+        Internal function that returns the unique name the duplicate of the given transform will use
+        :param xform: str
+        :param reserved_names: set(str), names already used by other duplicates not created yet
+        :return: str
+        """
+
         new_name = xform
         if self._replace_old and self._replace_new:
             for old_name, replace_name in zip(self._replace_old, self._replace_new):
@@ -440,45 +484,244 @@ class DuplicateHierarchy(object):
                     break
                 else:
                     new_name = '{}_{}'.format(xform, replace_name)
-            new_name = name_utils.get_basename(new_name)
+        new_name = name_utils.get_basename(new_name)
 
-        duplicate = maya.cmds.duplicate(xform, po=True)[0]
-        attribute.remove_user_defined_attributes(duplicate)
-        duplicate = maya.cmds.rename(duplicate, name_utils.find_unique_name(new_name))
-        self._duplicates.append(duplicate)
+        if new_name in reserved_names or maya.cmds.objExists(new_name):
+            unique = name_utils.FindUniqueName(new_name, reserved_names=reserved_names)
+            unique.get_last_number(True)
+            new_name = unique.get()
+        reserved_names.add(new_name)
 
-        return duplicate
+        return new_name
 
-    def _duplicate_hierarchy(self, xform):
-        if xform == self._stop_at_transform:
-            self._stop = True
-        if self._stop:
-            return
+    def _get_copy_attributes(self, mobj):
+        """
+        Internal function that returns the static attributes whose values are copied into duplicates
+        :param mobj: MObject
+        :return: list(MObject)
+        """
 
-        top_duplicate = self._duplicate(xform)
-        children = self._get_children(xform)
-        if children:
-            duplicates = list()
-            for child in children:
-                if self._only_these_transform and child not in self._only_these_transform:
-                    continue
-                if self._only_joints:
-                    if not maya.cmds.nodeType(child) == 'joint':
-                        continue
-                duplicate = self._duplicate_hierarchy(child)
-                if not duplicate:
+        node_fn = maya.api.OpenMaya.MFnDependencyNode(mobj)
+        type_name = node_fn.typeName
+        if type_name in self._COPY_ATTRIBUTES:
+            return self._COPY_ATTRIBUTES[type_name]
+
+        copy_attributes = list()
+        for i in range(node_fn.attributeCount()):
+            attr = node_fn.attribute(i)
+            attr_fn = maya.api.OpenMaya.MFnAttribute(attr)
+            if attr_fn.dynamic or not attr_fn.writable or not attr_fn.storable or attr_fn.array:
+                continue
+            if attr.hasFn(maya.api.OpenMaya.MFn.kCompoundAttribute) or attr.hasFn(
+                    maya.api.OpenMaya.MFn.kMessageAttribute):
+                continue
+            parent = attr_fn.parent
+            in_array = False
+            while not parent.isNull():
+                parent_fn = maya.api.OpenMaya.MFnAttribute(parent)
+                if parent_fn.array:
+                    in_array = True
                     break
-                duplicates.append(duplicate)
+                parent = parent_fn.parent
+            if in_array:
+                continue
+            if maya.api.OpenMaya.MPlug(mobj, attr).isCompound:
+                continue
+            copy_attributes.append(attr)
+        self._COPY_ATTRIBUTES[type_name] = copy_attributes
+
+        return copy_attributes
+
+    def _duplicate(self, dag_path, new_name, parent, mod):
+        """
+        Internal function that queues the duplicate of the given transform into the given modifier
+        Duplicates do not have user defined attributes and locked attributes are unlocked and keyable, as with
+        attribute.remove_user_defined_attributes
+        :param dag_path: MDagPath, transform to duplicate
+        :param new_name: str, name of the duplicate
+        :param parent: MObject, parent of the duplicate
+        :param mod: MDagModifier
+        :return: tuple(MObject, list(tuple(MObject, bool, bool))), duplicate and its attribute flags to update
+        """
+
+        mobj = dag_path.node()
+        type_name = maya.api.OpenMaya.MFnDependencyNode(mobj).typeName
+        duplicate = mod.createNode(type_name, parent)
+        mod.renameNode(duplicate, new_name)
+
+        flags = list()
+        for attr in self._get_copy_attributes(mobj):
+            source_plug = maya.api.OpenMaya.MPlug(mobj, attr)
+            if not source_plug.isDefaultValue():
+                try:
+                    api_plugs.copy_plug_value(
+                        source_plug, maya.api.OpenMaya.MPlug(duplicate, attr), mod=mod, apply=False)
+                except (ValueError, RuntimeError):
+                    LOGGER.debug('Impossible to copy value of "{}"'.format(source_plug.name()))
+            attr_fn = maya.api.OpenMaya.MFnAttribute(attr)
+            keyable = True if source_plug.isLocked else source_plug.isKeyable
+            channel_box = True if source_plug.isLocked else source_plug.isChannelBox
+            if keyable != attr_fn.keyable or channel_box != attr_fn.channelBox:
+                flags.append((attr, keyable, channel_box))
+
+        return duplicate, flags
+
+    def _duplicate_hierarchy(self, xform):
+        hierarchy = self._get_hierarchy(xform)
+        if not hierarchy:
+            return None
+
+        mod = maya.api.OpenMaya.MDagModifier()
+        reserved_names = set()
+        duplicates = list()
+        flags = list()
+        top_parent = maya.api.OpenMaya.MObject.kNullObj
+        for dag_path, parent_index in hierarchy:
+            node_name = xform if parent_index < 0 else dag_path.partialPathName()
+            new_name = self._get_duplicate_name(node_name, reserved_names)
+            if parent_index < 0:
+                # top duplicate is created below the same parent as the original transform
+                parent_path = maya.api.OpenMaya.MDagPath(dag_path)
+                parent_path.pop()
+                parent = parent_path.node() if parent_path.length() else maya.api.OpenMaya.MObject.kNullObj
+                top_parent = parent
+            else:
+                parent = duplicates[parent_index]
+            duplicate, duplicate_flags = self._duplicate(dag_path, new_name, parent, mod)
+            duplicates.append(duplicate)
+            flags.append(duplicate_flags)
+
+        # inverse scale connections between joints are rewired in the same modifier
+        for i, (dag_path, parent_index) in enumerate(hierarchy):
+            if not dag_path.hasFn(maya.api.OpenMaya.MFn.kJoint):
+                continue
+            if parent_index < 0:
+                # top duplicate is a sibling of the original joint, so it is connected to their parent joint
+                if not top_parent.isNull() and top_parent.hasFn(maya.api.OpenMaya.MFn.kJoint):
+                    mod.connect(
+                        maya.api.OpenMaya.MFnDependencyNode(top_parent).findPlug('scale', False),
+                        maya.api.OpenMaya.MFnDependencyNode(duplicates[i]).findPlug('inverseScale', False))
+                continue
+            source_parent = hierarchy[parent_index][0]
+            if not source_parent.hasFn(maya.api.OpenMaya.MFn.kJoint):
+                continue
+            inverse_scale = maya.api.OpenMaya.MFnDependencyNode(dag_path.node()).findPlug('inverseScale', False)
+            source = inverse_scale.source()
+            if source.isNull or source.node() != source_parent.node():
+                continue
+            mod.connect(
+                maya.api.OpenMaya.MFnDependencyNode(duplicates[parent_index]).findPlug('scale', False),
+                maya.api.OpenMaya.MFnDependencyNode(duplicates[i]).findPlug('inverseScale', False))
 
-                if maya.cmds.nodeType(top_duplicate) == 'joint' and maya.cmds.nodeType(duplicate) == 'joint':
-                    if maya.cmds.isConnected('{}.scale'.format(xform), '{}.inverseScale'.format(duplicate)):
-                        maya.cmds.disconnectAttr('{}.scale'.format(xform), '{}.inverseScale'.format(duplicate))
-                        maya.cmds.connectAttr('{}.scale'.format(top_duplicate), '{}.inverseScale'.format(duplicate))
+        if len(duplicates) >= attribute.GraphBuilder.SUSPEND_CACHES_NODES:
+            with callback.suspended_scene_caches():
+                api_modifier.apply_modifier(mod)
+        else:
+            api_modifier.apply_modifier(mod)
+
+        for duplicate, duplicate_flags in zip(duplicates, flags):
+            for attr, keyable, channel_box in duplicate_flags:
+                plug = maya.api.OpenMaya.MPlug(duplicate, attr)
+                plug.isKeyable = keyable
+                plug.isChannelBox = channel_box
+
+        self._duplicates.extend([maya.api.OpenMaya.MFnDependencyNode(duplicate).name() for duplicate in duplicates])
+
+        return self._duplicates[0]
+
+
+class TransformSpatialIndex(object):
+    """
+    Spatial index of the world positions of a list of transforms
+    Positions are read once (in bulk, using the same positions as get_distance) and can be queried later without
+    querying the scene again
+    """
+
+    def __init__(self, transforms):
+        """
+        Constructor
+        :param transforms: list(str), transforms to index
+        """
 
-            if duplicates:
-                maya.cmds.parent(duplicates, top_duplicate)
+        self._transforms = list(python.force_list(transforms))
+        self._indices = dict((xform, i) for i, xform in enumerate(self._transforms))
+        self._tree = spatial.KDTree(get_distance_positions(self._transforms))
 
-        return top_duplicate
+    def __len__(self):
+        return len(self._transforms)
+
+    def __contains__(self, transform):
+        return transform in self._indices
+
+    @property
+    def transforms(self):
+        """
+        Returns indexed transforms
+        :return: list(str)
+        """
+
+        return self._transforms
+
+    def get_position(self, transform):
+        """
+        Returns the cached world position of the given indexed transform
+        :param transform: str
+        :return: tuple(float, float, float)
+        """
+
+        return self._tree.points[self._indices[transform]]
+
+    def get_distances(self, source, transforms=None):
+        """
+        Returns the distances between the given source and the indexed transforms
+        :param source: str or tuple(float, float, float), transform or world position to measure distance from
+        :param transforms: list(str) or None, indexed transforms to return distances of. If None, all indexed ones.
+        :return: list(float), distances in the same order as the given transforms
+        """
+
+        source_position = self._get_source_position(source)
+        transforms = self._transforms if transforms is None else transforms
+
+        return [mathlib.get_distance_between_vectors(
+            source_position, self.get_position(xform)) for xform in transforms]
+
+    def nearest(self, source, count=1):
+        """
+        Returns the closest indexed transforms to the given source
+        :param source: str or tuple(float, float, float), transform or world position to search from
+        :param count: int, maximum number of transforms to return
+        :return: list(tuple(float, str)), list of (distance, transform) sorted by distance
+        """
+
+        found = self._tree.nearest(self._get_source_position(source), count=count)
+
+        return [(dst, self._transforms[index]) for dst, index in found]
+
+    def within_radius(self, source, radius):
+        """
+        Returns all indexed transforms within the given radius from the given source
+        :param source: str or tuple(float, float, float), transform or world position to search from
+        :param radius: float
+        :return: list(tuple(float, str)), list of (distance, transform) sorted by distance
+        """
+
+        found = self._tree.within_radius(self._get_source_position(source), radius)
+
+        return [(dst, self._transforms[index]) for dst, index in found]
+
+    def _get_source_position(self, source):
+        """
+        Internal function that returns the position of the given source
+        :param source: str or tuple(float, float, float)
+        :return: tuple(float, float, float)
+        """
+
+        if not python.is_string(source):
+            return source
+        if source in self._indices:
+            return self.get_position(source)
+
+        return maya.cmds.xform(source, q=True, rp=True, ws=True)
 
 
 def check_transform(transform_name):
@@ -975,6 +1218,38 @@ def get_distance(source_transform, target_transform):
     return mathlib.get_distance_between_vectors(v1, v2)
 
 
+def get_distance_positions(transforms):
+    """
+    Returns the world positions used by get_distance to measure distances to the given transforms in one pass
+    World rotate pivot is used for transforms and world translation for mesh nodes
+    :param transforms: list(str), name of transform nodes
+    :return: list(tuple(float, float, float))
+    """
+
+    transforms = python.force_list(transforms)
+    if not transforms:
+        return list()
+
+    # selection lists merge repeated items, so each transform is only added once
+    unique_transforms = list(dict.fromkeys(transforms))
+    selection_list = maya.api.OpenMaya.MSelectionList()
+    for xform in unique_transforms:
+        selection_list.add(xform)
+    dag_paths = dict((xform, selection_list.getDagPath(i)) for i, xform in enumerate(unique_transforms))
+
+    positions = list()
+    for xform in transforms:
+        dag_path = dag_paths[xform]
+        if dag_path.apiType() == maya.api.OpenMaya.MFn.kMesh:
+            matrix = dag_path.inclusiveMatrix()
+            positions.append((matrix.getElement(3, 0), matrix.getElement(3, 1), matrix.getElement(3, 2)))
+        else:
+            pivot = maya.api.OpenMaya.MFnTransform(dag_path).rotatePivot(maya.api.OpenMaya.MSpace.kWorld)
+            positions.append((pivot.x, pivot.y, pivot.z))
+
+    return positions
+
+
 def create_group_in_plane(transform1, transform2, transform3):
     """
     Creates a group that is located in the triangle plane defined by 3 transforms
@@ -1448,15 +1723,8 @@ def get_upstream_nodes(n):
     :return: list(str)
     """
 
-    upstream_nodes = list()
-    upstream_nodes.append(n)
-    incoming_nodes = maya.cmds.listConnections(n, source=True, destination=False)
-    if incoming_nodes:
-        for n in incoming_nodes:
-            upstream_nodes.extend(get_upstream_nodes(n))
-        return upstream_nodes
-    else:
-        return upstream_nodes
+    return list(node.iterate_hierarchy_nodes(
+        n, direction=maya.api.OpenMaya.MItDependencyGraph.kUpstream, as_names=True))
 
 
 def delete_all_incoming_nodes(node_name):
@@ -1465,19 +1733,26 @@ def delete_all_incoming_nodes(node_name):
     :param node_name: str
     """
 
-    upstream_nodes = list()
-    upstream_nodes_clean = list()
-    connections = maya.cmds.listConnections(node_name, source=True, destination=False)
-    if connections:
-        for n in connections:
-            upstream_nodes.extend(get_upstream_nodes(n))
-
-        for n in upstream_nodes:
-            if n not in upstream_nodes_clean:
-                upstream_nodes_clean.append(n)
+    upstream_nodes = list(node.iterate_hierarchy_nodes(
+        node_name, direction=maya.api.OpenMaya.MItDependencyGraph.kUpstream, include_root=False))
+    if not upstream_nodes:
+        return
 
-        for n in upstream_nodes_clean:
-            maya.cmds.delete(n)
+    # children of deleted DAG nodes are deleted with them, so they cannot be deleted again
+    hashes = set([handle.hashCode() for handle in upstream_nodes])
+    mod = maya.api.OpenMaya.MDagModifier()
+    for handle in upstream_nodes:
+        mobj = handle.object()
+        if mobj.hasFn(maya.api.OpenMaya.MFn.kDagNode):
+            dag_path = maya.api.OpenMaya.MDagPath.getAPathTo(mobj)
+            has_deleted_parent = False
+            while dag_path.length() > 1 and not has_deleted_parent:
+                dag_path.pop()
+                has_deleted_parent = maya.api.OpenMaya.MObjectHandle(dag_path.node()).hashCode() in hashes
+            if has_deleted_parent:
+                continue
+        mod.deleteNode(mobj)
+    api_modifier.apply_modifier(mod)
 
 
 def create_buffer_group(node_name, buffer_name=None, suffix='buffer', use_duplicate=False, copy_scale=False):
@@ -1666,14 +1941,23 @@ def get_axis_letter_aimed_at_child(transform):
     return get_vector_axis_letter(vector)
 
 
-def get_closest_transform(source_xform, targets):
+def get_closest_transform(source_xform, targets, spatial_index=None):
     """
     Given the list of target transforms, find the closest to the source transform
     :param source_xform: str, name of the transform to test distance to
-    :param targets: list<str>, list of targets to test distance against
+    :param targets: list<str>, list of targets to test distance against. If None, all spatial index transforms are used
+    :param spatial_index: TransformSpatialIndex or None, prebuilt index of the targets. If given, targets positions
+        are not queried again
     :return: str, name of the target in targets that is closest to source transform
     """
 
+    if spatial_index is not None:
+        if targets is None:
+            closest = spatial_index.nearest(source_xform, count=1)
+            return closest[0][1] if closest else None
+        distances = spatial_index.get_distances(source_xform, targets)
+        return targets[distances.index(min(distances))] if distances else None
+
     least_distant = 1000000.0
     closest_target = None
 
@@ -1780,7 +2064,7 @@ def get_bottom_center(transform):
     return bounding_box.get_ymin_center()
 
 
-def get_ordered_distance_and_transform(source_transform, transform_list):
+def get_ordered_distance_and_transform(source_transform, transform_list, spatial_index=None):
     """
     Returns:
         - List of distance based on how far each transform in transform_list is from source_transform
@@ -1788,14 +2072,19 @@ def get_ordered_distance_and_transform(source_transform, transform_list):
         - List with the original distance order has fed in from transform_list
     :param source_transform: str, name of a maya transform node
     :param transform_list: list(str), list of maya transform nodes distances from source_transform will be calculated of
+    :param spatial_index: TransformSpatialIndex or None, prebuilt index containing the transforms of transform_list
     :return: list(str)
     """
 
     distance_list = list()
     distance_dict = dict()
 
-    for xform in transform_list:
-        distance = get_distance(source_transform, xform)
+    if spatial_index is not None:
+        distances = spatial_index.get_distances(source_transform, transform_list)
+    else:
+        distances = [get_distance(source_transform, xform) for xform in transform_list]
+
+    for xform, distance in zip(transform_list, distances):
         distance_list.append(distance)
         if distance in distance_dict:
             distance_dict[distance].append(xform)
@@ -1808,15 +2097,17 @@ def get_ordered_distance_and_transform(source_transform, transform_list):
     return distance_list, distance_dict, original_distance_order
 
 
-def get_transform_list_from_distance(source_transform, transform_list):
+def get_transform_list_from_distance(source_transform, transform_list, spatial_index=None):
     """
     Returns a list of distances that corresponds to the transform_list
     :param source_transform: str, name of a maya transform node
     :param transform_list: list(str), list of maya transform nodes distances from source_transform will be calculated of
+    :param spatial_index: TransformSpatialIndex or None, prebuilt index containing the transforms of transform_list
     :return: list(str)
     """
 
-    distance_list, distance_dict, original = get_ordered_distance_and_transform(source_transform, transform_list)
+    distance_list, distance_dict, original = get_ordered_distance_and_transform(
+        source_transform, transform_list, spatial_index=spatial_index)
     found = list()
     for dst in distance_list:
         found.append(distance_dict[dst][0])